@@ -0,0 +1,54 @@
+"""Compare the build time and peak memory of the ways to build a trie from a txt file.
+
+Every method runs in a fresh process, so that its peak resident set size
+is measured independently. The 'list' method is the former from_txt, which
+read every word of the file into a list before inserting them.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_bulk_build [number of lines]
+"""
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_fuzzy_engines import random_words
+from py_trie.trie import Trie
+
+
+def build(method: str, path: str, queue) -> None:
+    start = time.perf_counter()
+    if method == 'list':
+        words = []
+        with open(path) as f:
+            for line in f:
+                words.extend(line.strip().split())
+        trie = Trie.from_list(words)
+    else:
+        trie = Trie.from_txt(path, sorted_input=(method == 'sorted'))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(trie)))
+
+
+def main(num_lines: int = 10000000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'words.txt')
+        with open(path, 'w') as f:
+            f.write('\n'.join(sorted(random_words(num_lines))))
+
+        print(f'{num_lines} lines')
+        for method in ('list', 'stream', 'sorted'):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=build, args=(method, path, queue))
+            process.start()
+            elapsed, rss, size = queue.get()
+            process.join()
+            print(f'{method:6}: build={elapsed:.2f}s peak_rss={rss / 1024:.1f}MiB words={size}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
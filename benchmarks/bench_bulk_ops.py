@@ -0,0 +1,59 @@
+"""Compare the throughput of the batched find, insert and delete with loops
+over the single-word methods.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_bulk_ops [num_words] [num_tokens]
+"""
+import random
+import sys
+import time
+
+from py_trie.trie import Trie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 200000, num_tokens: int = 100000) -> None:
+    words = random_words(num_words)
+    rng = random.Random(1)
+
+    # The tokens of a text follow Zipf's law over a vocabulary, half of
+    # which is in the dictionary
+    vocabulary = rng.sample(words, num_tokens // 4) + random_words(num_tokens // 4, seed=2)
+    rng.shuffle(vocabulary)
+    ranks = range(1, len(vocabulary) + 1)
+    tokens = rng.choices(vocabulary, weights=[1 / rank for rank in ranks], k=num_tokens)
+    print(f'{num_words} words, {num_tokens} tokens, {len(set(tokens))} distinct')
+
+    for compressed in (False, True):
+        timings = {}
+        for name in ('find', 'insert', 'delete'):
+            loop_trie = Trie.from_list(words, compressed=compressed)
+            batch_trie = Trie.from_list(words, compressed=compressed)
+            method = getattr(loop_trie, name)
+
+            start = time.perf_counter()
+            loop = [method(token) for token in tokens]
+            loop_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = getattr(batch_trie, name + '_many')(tokens)
+            batch_time = time.perf_counter() - start
+
+            # 'insert' does not report whether the word is new
+            assert batch == loop or name == 'insert'
+            assert len(batch_trie) == len(loop_trie)
+
+            timings[name] = (loop_time, batch_time)
+
+        print(f'compressed={compressed}')
+        for name, (loop_time, batch_time) in timings.items():
+            print(
+                f'  {name:6} loop={num_tokens / loop_time:.0f} ops/s '
+                f'batch={num_tokens / batch_time:.0f} ops/s '
+                f'speedup={loop_time / batch_time:.2f}x'
+            )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,52 @@
+"""Compare the memory of the plain and the compressed (radix) trie layouts.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_compressed_memory [number of keys]
+"""
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+from py_trie.trie import Trie
+
+
+def random_urls(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    hosts = [
+        'www.' + ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))) + '.com'
+        for _ in range(max(1, n // 1000))
+    ]
+    sections = ['products', 'category', 'search', 'item', 'sku', 'static/img']
+    return [
+        'https://' + rng.choice(hosts) + '/' + rng.choice(sections) + '/'
+        + ''.join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(6, 16)))
+        for _ in range(n)
+    ]
+
+
+def measure(words: list, compressed: bool) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    trie = Trie.from_list(words, compressed=compressed)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return trie, elapsed, memory
+
+
+def main(num_keys: int = 1000000) -> None:
+    words = random_urls(num_keys)
+    print(f'{num_keys} keys, {sum(map(len, words)) / num_keys:.1f} characters per key')
+    for compressed in (False, True):
+        trie, elapsed, memory = measure(words, compressed)
+        print(
+            f'compressed={compressed!s:5} build={elapsed:.2f}s '
+            f'memory={memory / 2 ** 20:.1f}MiB bytes/key={memory / num_keys:.0f}'
+        )
+        del trie
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""Compare the memory and lookup latency of a mutable trie and its frozen copy.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_frozen [number of keys]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_compressed_memory import random_urls
+from benchmarks.bench_fuzzy_engines import random_words
+from py_trie.fuzzy_trie import FuzzyTrie
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, memory
+
+
+def main(num_keys: int = 200000) -> None:
+    for name, words in (('words', random_words(num_keys)), ('urls', random_urls(num_keys))):
+        trie, trie_memory = traced(lambda: FuzzyTrie.from_list(words))
+        frozen, frozen_memory = traced(trie.freeze)
+        queries = random.Random(1).sample(words, 1000)
+
+        timings = []
+        for t in (trie, frozen):
+            start = time.perf_counter()
+            for _ in range(10):
+                for w in queries:
+                    t.find(w)
+            timings.append((time.perf_counter() - start) / 10000 * 1e6)
+
+        print(
+            f'{name}: {num_keys} keys, {frozen.num_nodes} frozen nodes\n'
+            f'  trie   memory={trie_memory / 2 ** 20:.1f}MiB find={timings[0]:.2f}us\n'
+            f'  frozen memory={frozen_memory / 2 ** 20:.1f}MiB find={timings[1]:.2f}us '
+            f'({trie_memory / frozen_memory:.1f}x smaller)'
+        )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
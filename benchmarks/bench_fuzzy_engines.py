@@ -0,0 +1,49 @@
+"""Compare the query latency of the fuzzy search engines.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_fuzzy_engines
+"""
+import random
+import string
+import time
+
+from py_trie.fuzzy_trie import FuzzyTrie
+
+
+def random_words(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 14)))
+        for _ in range(n)
+    ]
+
+
+def main(num_words: int = 100000, num_queries: int = 50) -> None:
+    words = random_words(num_words)
+    trie = FuzzyTrie.from_list(words)
+    rng = random.Random(1)
+    targets = [w for w in rng.sample(words, num_queries)]
+
+    print(f'{num_words} words, {num_queries} queries')
+    for case_insensitive in (False, True):
+        for threshold in (1, 2):
+            timings = {}
+            for engine in ('row', 'bitparallel'):
+                start = time.perf_counter()
+                for target in targets:
+                    trie.fuzzy_search(
+                        target, threshold,
+                        case_insensitive=case_insensitive,
+                        engine=engine
+                    )
+                timings[engine] = (time.perf_counter() - start) / num_queries
+            print(
+                f'threshold={threshold} case_insensitive={case_insensitive!s:5} '
+                f"row={timings['row'] * 1000:.2f}ms "
+                f"bitparallel={timings['bitparallel'] * 1000:.2f}ms "
+                f"speedup={timings['row'] / timings['bitparallel']:.2f}x"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Compare the throughput of a batched fuzzy search and a loop over fuzzy_search.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_fuzzy_many [num_words] [num_queries]
+"""
+import random
+import sys
+import time
+
+from py_trie.fuzzy_trie import FuzzyTrie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 100000, num_queries: int = 1000) -> None:
+    words = random_words(num_words)
+    trie = FuzzyTrie.from_list(words)
+    rng = random.Random(1)
+
+    # Records of a dedup job, i.e. words of the trie with a typo
+    targets = []
+    for word in rng.sample(words, num_queries):
+        i = rng.randrange(len(word))
+        targets.append(word[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + word[i + 1:])
+
+    print(f'{num_words} words, {num_queries} queries')
+    for threshold in (1, 2):
+        for engine in ('row', 'bitparallel'):
+            start = time.perf_counter()
+            loop = {target: trie.fuzzy_search(target, threshold, engine=engine) for target in targets}
+            loop_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = trie.fuzzy_search_many(targets, threshold, engine=engine)
+            batch_time = time.perf_counter() - start
+            assert batch == loop
+
+            print(
+                f'threshold={threshold} engine={engine:11} '
+                f'loop={num_queries / loop_time:.0f} q/s '
+                f'batch={num_queries / batch_time:.0f} q/s'
+            )
+
+        start = time.perf_counter()
+        grouped = trie.fuzzy_search_many(targets, threshold, grouped=True)
+        grouped_time = time.perf_counter() - start
+        assert grouped == loop
+        print(f'threshold={threshold} grouped={num_queries / grouped_time:.0f} q/s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
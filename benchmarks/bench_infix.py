@@ -0,0 +1,66 @@
+"""Compare the query latency of the infix index and a scan of the words.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_infix [num_words] [num_queries]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from py_trie.trie import Trie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 100000, num_queries: int = 50) -> None:
+    words = random_words(num_words)
+    trie = Trie.from_list(words)
+    rng = random.Random(1)
+
+    # Fragments of 3 to 5 characters from the middle of the words
+    fragments = []
+    for word in rng.sample(words, num_queries):
+        start = rng.randrange(len(word) - 2)
+        fragments.append(word[start:start + rng.randint(3, 5)])
+
+    tracemalloc.start()
+    index = trie.build_infix_index()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f'{num_words} words, {num_queries} queries, '
+        f'build={index.build_time:.2f}s entries={index.num_entries} '
+        f'memory={memory / 2 ** 20:.1f}MB'
+    )
+
+    for threshold in (0, 1):
+        timings = {}
+        results = {}
+        for name in ('scan', 'index'):
+            if name == 'index':
+                trie.build_infix_index()
+            else:
+                trie.drop_infix_index()
+
+            # Collect the garbage of the build outside of the timed queries
+            gc.collect()
+            start = time.perf_counter()
+            results[name] = [
+                trie.contains_search(fragment, threshold=threshold) for fragment in fragments
+            ]
+            timings[name] = (time.perf_counter() - start) / num_queries
+
+        assert results['scan'] == results['index']
+        matches = sum(map(len, results['index'])) / num_queries
+        print(
+            f'threshold={threshold} matches={matches:.1f} '
+            f"scan={timings['scan'] * 1000:.3f}ms "
+            f"index={timings['index'] * 1000:.3f}ms "
+            f"speedup={timings['scan'] / timings['index']:.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
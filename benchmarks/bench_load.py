@@ -0,0 +1,43 @@
+"""Compare the startup time of building a trie from a txt file and loading a saved trie.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_load [number of keys]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_fuzzy_engines import random_words
+from py_trie.fuzzy_trie import FuzzyTrie
+
+
+def main(num_keys: int = 500000) -> None:
+    words = random_words(num_keys)
+    with tempfile.TemporaryDirectory() as directory:
+        txt_path = os.path.join(directory, 'words.txt')
+        trie_path = os.path.join(directory, 'words.trie')
+        with open(txt_path, 'w') as f:
+            f.write('\n'.join(words))
+
+        start = time.perf_counter()
+        trie = FuzzyTrie.from_txt(txt_path)
+        build = time.perf_counter() - start
+        trie.save(trie_path)
+        del trie
+
+        timings = {}
+        for mmap in (True, False):
+            for verify in (True, False):
+                start = time.perf_counter()
+                FuzzyTrie.load(trie_path, mmap=mmap, verify=verify)
+                timings[mmap, verify] = time.perf_counter() - start
+
+        print(f'{num_keys} keys, {os.path.getsize(trie_path) / 2 ** 20:.1f}MiB file')
+        print(f'from_txt: {build:.3f}s')
+        for (mmap, verify), elapsed in timings.items():
+            print(f'load mmap={mmap!s:5} verify={verify!s:5}: {elapsed * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""Compare merging two tries node by node with inserting the words of one
+trie into the other.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_merge [num_words] [overlap]
+"""
+import gc
+import sys
+import time
+
+from py_trie.trie import Trie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 200000, overlap: float = 0.2) -> None:
+    words = random_words(num_words)
+
+    # Two shards sharing a fraction of the words
+    middle = num_words // 2
+    shared = int(middle * overlap)
+    left, right = words[:middle + shared], words[middle - shared:]
+    print(f'{len(left)} + {len(right)} words, {2 * shared} shared')
+
+    for options in ({}, {'compressed': True}, {'copy_on_write': True}):
+        shard = Trie.from_list(right, **options)
+        timings = {}
+        for name in ('insert', 'merge', 'union', 'intersection', 'difference'):
+            trie = Trie.from_list(left, **options)
+
+            # Collect the garbage of the build outside of the timed section
+            gc.collect()
+            start = time.perf_counter()
+            if name == 'insert':
+                for word in shard.iter_complete('', order='none'):
+                    trie.insert(word)
+                size = len(trie)
+            elif name == 'merge':
+                trie.merge(shard)
+                size = len(trie)
+            else:
+                size = len(getattr(trie, name)(shard))
+            timings[name] = (time.perf_counter() - start, size)
+
+        assert timings['insert'][1] == timings['merge'][1] == timings['union'][1]
+        print(', '.join(f'{key}={value}' for key, value in options.items()) or 'plain')
+        for name, (elapsed, size) in timings.items():
+            print(f'  {name:12} {elapsed * 1000:8.1f}ms words={size}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.2)
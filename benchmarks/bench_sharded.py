@@ -0,0 +1,52 @@
+"""Measure the scaling of the build time and the fuzzy search latency of the
+ShardedFuzzyTrie with 1, 2, 4 and 8 worker processes.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_sharded [num_words] [num_queries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from py_trie.sharded import ShardedFuzzyTrie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 200000, num_queries: int = 20) -> None:
+    words = random_words(num_words)
+    targets = random.Random(1).sample(words, num_queries)
+    print(f'{num_words} words, {num_queries} queries, {os.cpu_count()} CPUs')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'words.txt')
+        with open(path, 'w') as f:
+            f.write('\n'.join(words))
+
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            trie = ShardedFuzzyTrie.from_txt(path, workers=workers)
+            build_time = time.perf_counter() - start
+
+            with trie:
+                # Start the workers before timing the queries
+                trie.fuzzy_search(targets[0], 0)
+                start = time.perf_counter()
+                for target in targets:
+                    trie.fuzzy_search(target, 2, engine='bitparallel')
+                query_time = (time.perf_counter() - start) / num_queries
+
+            if baseline is None:
+                baseline = (build_time, query_time)
+            print(
+                f'workers={workers} build={build_time:.2f}s '
+                f'({baseline[0] / build_time:.2f}x) '
+                f'query={query_time * 1000:.1f}ms ({baseline[1] / query_time:.2f}x)'
+            )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""Compare the query latency of the symmetric-delete index and the trie traversal.
+
+To run the benchmark, execute the following command from the project's root directory:
+    python -m benchmarks.bench_symdelete [num_words]
+"""
+import random
+import sys
+import time
+
+from py_trie.fuzzy_trie import FuzzyTrie
+
+from .bench_fuzzy_engines import random_words
+
+
+def main(num_words: int = 100000, num_queries: int = 200) -> None:
+    words = random_words(num_words)
+    trie = FuzzyTrie.from_list(words)
+    rng = random.Random(1)
+    targets = rng.sample(words, num_queries)
+
+    index = trie.build_index(max_distance=2)
+    print(
+        f'{num_words} words, {num_queries} queries, '
+        f'build={index.build_time:.2f}s entries={index.num_entries} '
+        f'memory={index.memory_usage() / 2 ** 20:.1f}MB'
+    )
+
+    for threshold in (0, 1, 2):
+        timings = {}
+        results = {}
+        for name in ('row', 'bitparallel', 'symdelete'):
+            if name == 'symdelete':
+                trie.build_index(max_distance=2)
+                engine = 'bitparallel'
+            else:
+                trie.drop_index()
+                engine = name
+            start = time.perf_counter()
+            results[name] = [
+                trie.fuzzy_search(target, threshold, engine=engine) for target in targets
+            ]
+            timings[name] = (time.perf_counter() - start) / num_queries
+
+        assert results['row'] == results['bitparallel'] == results['symdelete']
+        print(
+            f'threshold={threshold} '
+            f"row={timings['row'] * 1000:.3f}ms "
+            f"bitparallel={timings['bitparallel'] * 1000:.3f}ms "
+            f"symdelete={timings['symdelete'] * 1000:.3f}ms "
+            f"speedup={timings['bitparallel'] / timings['symdelete']:.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
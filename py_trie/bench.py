@@ -0,0 +1,349 @@
+"""Benchmark the build time, memory and query latency of the fuzzy trie.
+
+To run the suite offline, execute the following command:
+    python -m py_trie.bench [--sizes 10000 100000 1000000] [--output results.json]
+                            [--baseline baseline.json] [--max-regression 0.25]
+
+Run 'python -m py_trie.bench --help' for the options of the corpora.
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import random
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from .fuzzy_trie import FuzzyTrie
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FORMAT_VERSION = 1
+LENGTH_DISTRIBUTIONS = ('uniform', 'normal')
+THRESHOLDS = (0, 1, 2, 3)
+
+
+def make_corpus(
+    num_keys: int,
+    alphabet: str = string.ascii_lowercase,
+    min_length: int = 3,
+    max_length: int = 14,
+    distribution: str = 'uniform',
+    seed: int = 0
+) -> List[str]:
+    """Generate random keys of the characters of the alphabet.
+
+    Args:
+        num_keys (int):
+            The number of keys, which may repeat.
+        alphabet (str):
+            The characters of the keys. (Default=ascii_lowercase)
+        min_length (int):
+            The minimum length of the keys. (Default=3)
+        max_length (int):
+            The maximum length of the keys. (Default=14)
+        distribution (str):
+            The distribution of the lengths, either 'uniform' between the
+            bounds or 'normal' around their middle. (Default='uniform')
+        seed (int):
+            The seed of the random generator. (Default=0)
+
+    Returns:
+        List[str]: The same keys for the same arguments.
+
+    Raises:
+        ValueError: Invalid alphabet, lengths or distribution.
+    """
+    if not alphabet:
+        raise ValueError("The input parameter 'alphabet' must not be empty")
+    if not 1 <= min_length <= max_length:
+        raise ValueError(
+            "The input parameters must satisfy '1 <= min_length <= max_length'"
+        )
+    if distribution not in LENGTH_DISTRIBUTIONS:
+        raise ValueError(
+            f"The input parameter 'distribution' must be one of {LENGTH_DISTRIBUTIONS}"
+        )
+
+    rng = random.Random(seed)
+    if distribution == 'uniform':
+        def length() -> int:
+            return rng.randint(min_length, max_length)
+    else:
+        mu = (min_length + max_length) / 2
+        sigma = max((max_length - min_length) / 4, 0.5)
+
+        def length() -> int:
+            return min(max(round(rng.gauss(mu, sigma)), min_length), max_length)
+
+    return [''.join(rng.choices(alphabet, k=length())) for _ in range(num_keys)]
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Return the 50th, 90th and 99th percentiles of the samples by nearest rank."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        f'p{q}': ordered[min(n - 1, max(0, -(-q * n // 100) - 1))]
+        for q in (50, 90, 99)
+    }
+
+
+def _latencies(func, args_list: Sequence[tuple], unit: float) -> Dict[str, float]:
+    """Call the function with every tuple of arguments and return the
+    percentiles of the latencies in the unit of seconds."""
+    timer = time.perf_counter
+    samples = []
+    for args in args_list:
+        start = timer()
+        func(*args)
+        samples.append((timer() - start) / unit)
+    return percentiles(samples)
+
+
+def _peak_rss() -> Optional[int]:
+    """Return the peak resident set size of the process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The size is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _typo(word: str, alphabet: str, rng: random.Random) -> str:
+    """Return the word with one random character substituted."""
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice(alphabet) + word[i + 1:]
+
+
+def measure(
+    num_keys: int,
+    alphabet: str = string.ascii_lowercase,
+    min_length: int = 3,
+    max_length: int = 14,
+    distribution: str = 'uniform',
+    num_queries: int = 1000,
+    num_fuzzy_queries: int = 20,
+    engine: str = 'row',
+    compressed: bool = False,
+    seed: int = 0
+) -> Dict:
+    """Build a trie of a random corpus and measure it in the current process.
+
+    The peak RSS covers the whole process, so 'run_suite' measures every
+    corpus in a fresh process. The bytes per key are the growth of the peak
+    RSS during the build divided by the number of distinct keys.
+
+    Returns:
+        Dict: The build time in seconds, the memory in bytes, and the
+        percentiles of the latencies of 'find' and 'complete' in
+        microseconds and of 'fuzzy_search' in milliseconds.
+    """
+    words = make_corpus(num_keys, alphabet, min_length, max_length, distribution, seed)
+    rng = random.Random(seed + 1)
+
+    gc.collect()
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    trie = FuzzyTrie.from_list(words, compressed=compressed)
+    build_time = time.perf_counter() - start
+    peak_rss = _peak_rss()
+
+    # Half of the lookups miss, and the completions are typeahead queries
+    # of the first characters of the keys
+    hits = rng.sample(words, min(num_queries, len(words)))
+    misses = make_corpus(
+        len(hits), alphabet, min_length, max_length, distribution, seed + 2
+    )
+    lookups = [(w,) for pair in zip(hits, misses) for w in pair][:num_queries]
+    prefixes = [(w[:rng.randint(1, 3)], 10) for w in hits]
+    targets = [
+        _typo(w, alphabet, rng)
+        for w in rng.sample(words, min(num_fuzzy_queries, len(words)))
+    ]
+
+    fuzzy = {}
+    for case_insensitive in (False, True):
+        for threshold in THRESHOLDS:
+            name = f'threshold_{threshold}' + ('_case_insensitive' if case_insensitive else '')
+            fuzzy[name] = _latencies(
+                trie.fuzzy_search,
+                [(t, threshold, None, False, case_insensitive, engine) for t in targets],
+                1e-3
+            )
+
+    return {
+        'num_keys': len(trie),
+        'build_s': build_time,
+        'peak_rss_bytes': peak_rss,
+        'bytes_per_key': (
+            (peak_rss - rss_before) / len(trie) if peak_rss is not None and len(trie) else None
+        ),
+        'find_us': _latencies(trie.find, lookups, 1e-6),
+        'complete_us': _latencies(trie.complete, prefixes, 1e-6),
+        'fuzzy_search_ms': fuzzy,
+    }
+
+
+def run_suite(sizes: Sequence[int] = (10000, 100000, 1000000), **options) -> Dict:
+    """Measure a corpus of every size in a fresh process.
+
+    Args:
+        sizes (Sequence[int]):
+            The numbers of keys of the corpora. (Default=(10000, 100000, 1000000))
+        **options:
+            The keyword arguments of 'measure'.
+
+    Returns:
+        Dict: The environment, the options and the results of every size,
+        ready to be saved as JSON.
+    """
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            results[str(size)] = pool.submit(measure, size, **options).result()
+
+    return {
+        'version': FORMAT_VERSION,
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'options': options,
+        'results': results,
+    }
+
+
+def flatten(results: Dict) -> Dict[str, float]:
+    """Return the numeric metrics of the results keyed by their paths,
+    e.g. '100000/fuzzy_search_ms/threshold_1/p50'."""
+    metrics = {}
+    stack = [('', results['results'])]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend((f'{path}{key}/', v) for key, v in value.items())
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[path[:-1]] = value
+    return metrics
+
+
+def compare(results: Dict, baseline: Dict, max_regression: float = 0.25) -> List[str]:
+    """Compare the results against a baseline of the same options.
+
+    Every metric is a cost, so a metric regresses when it exceeds its
+    baseline by more than the fraction 'max_regression'. The metrics missing
+    from either side, e.g. of a size which was not run, are skipped.
+
+    Returns:
+        List[str]: A description of every regressed metric.
+
+    Raises:
+        ValueError: The results and the baseline have different formats.
+    """
+    if results.get('version') != baseline.get('version'):
+        raise ValueError('The results and the baseline have different format versions')
+
+    current = flatten(results)
+    regressions = []
+    for path, old in sorted(flatten(baseline).items()):
+        new = current.get(path)
+        if new is None or path.endswith('num_keys'):
+            continue
+        if new > old * (1 + max_regression):
+            change = f'+{(new / old - 1) * 100:.0f}%' if old else 'from 0'
+            regressions.append(f'{path}: {old:.4g} -> {new:.4g} ({change})')
+    return regressions
+
+
+def _summary(size: str, result: Dict) -> str:
+    """Return a line of the main metrics of a corpus."""
+    rss = result['peak_rss_bytes']
+    per_key = result['bytes_per_key']
+    fuzzy = result['fuzzy_search_ms']
+    return (
+        f"{size} keys: build={result['build_s']:.2f}s "
+        + (f'peak_rss={rss / 2 ** 20:.1f}MiB bytes/key={per_key:.0f} ' if rss else '')
+        + f"find p50={result['find_us']['p50']:.2f}us "
+        + f"complete p50={result['complete_us']['p50']:.1f}us "
+        + 'fuzzy p50=' + '/'.join(
+            f"{fuzzy[f'threshold_{t}']['p50']:.2f}" for t in THRESHOLDS
+        ) + 'ms'
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite from the command line and return the exit status,
+    which is 1 if a metric regressed against the baseline."""
+    parser = argparse.ArgumentParser(
+        prog='python -m py_trie.bench', description=__doc__.splitlines()[0]
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--alphabet', default=string.ascii_lowercase)
+    parser.add_argument('--min-length', type=int, default=3)
+    parser.add_argument('--max-length', type=int, default=14)
+    parser.add_argument('--distribution', choices=LENGTH_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--queries', type=int, default=1000,
+                        help='the number of find and complete queries')
+    parser.add_argument('--fuzzy-queries', type=int, default=20,
+                        help='the number of fuzzy_search queries of every threshold')
+    parser.add_argument('--engine', choices=('row', 'bitparallel'), default='row')
+    parser.add_argument('--compressed', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='the JSON file of the results')
+    parser.add_argument('--baseline', help='the JSON file of the results to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='the tolerated fraction of a slowdown (default: 0.25)')
+    args = parser.parse_args(argv)
+    if min(args.sizes + [args.queries, args.fuzzy_queries]) < 1:
+        parser.error('the sizes and the numbers of queries must be positive integers')
+
+    # Validate the corpus options before starting the processes
+    make_corpus(0, args.alphabet, args.min_length, args.max_length, args.distribution)
+
+    results = run_suite(
+        args.sizes,
+        alphabet=args.alphabet,
+        min_length=args.min_length,
+        max_length=args.max_length,
+        distribution=args.distribution,
+        num_queries=args.queries,
+        num_fuzzy_queries=args.fuzzy_queries,
+        engine=args.engine,
+        compressed=args.compressed,
+        seed=args.seed
+    )
+    for size, result in results['results'].items():
+        print(_summary(size, result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('options') != results['options']:
+            print('warning: the baseline was run with different options')
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f'regression: {regression}')
+        if regressions:
+            return 1
+        print(f'no regression above {args.max_regression:.0%} of the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
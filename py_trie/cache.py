@@ -0,0 +1,221 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+
+class QueryCache:
+    """A bounded least-recently-used cache of query results of a trie.
+
+    Every entry remembers the generation of the trie when it was stored, i.e.
+    the number of insertions and deletions made to the trie so far. By default
+    an entry of an older generation is stale, so a mutation invalidates the
+    whole cache in O(1) without touching the entries.
+
+    With 'scoped' set, the trie instead reports every inserted or deleted word
+    to the cache, which only drops the entries whose results may contain the
+    word: the completions of the prefixes of the word, and the fuzzy searches
+    of targets whose length differs from the word by at most the threshold.
+
+    Attributes:
+        max_size (int):
+            The maximum number of entries.
+        ttl (float):
+            The number of seconds after which an entry expires, or None
+            if the entries never expire. (Default=None)
+        scoped (bool):
+            Whether a mutation only invalidates the entries it affects.
+            (Default=False)
+        hits (int):
+            The number of lookups answered by the cache.
+        misses (int):
+            The number of lookups not answered by the cache.
+        evictions (int):
+            The number of entries dropped for exceeding 'max_size' or 'ttl'.
+        invalidations (int):
+            The number of entries dropped because the trie was modified.
+
+    Methods:
+        get:
+            Return the cached result of a query or None.
+        put:
+            Store the result of a query.
+        invalidate:
+            Drop the entries whose results may be changed by a word.
+        clear:
+            Drop all the entries.
+
+    To instantiate:
+        >>> cache = trie.enable_cache(max_size=4096, ttl=60)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        scoped: bool = False
+    ) -> None:
+        """Construct an empty cache and its counters."""
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("The input parameter 'max_size' must be a positive integer")
+
+        if ttl is not None and (not isinstance(ttl, (int, float)) or ttl <= 0):
+            raise ValueError("The input parameter 'ttl' must be a positive number")
+
+        if not isinstance(scoped, bool):
+            raise TypeError("The input parameter 'scoped' must be a boolean.")
+
+        self._max_size: int = max_size
+        self._ttl: Optional[float] = ttl
+        self._scoped: bool = scoped
+
+        # Map a key to (result, generation, expiry time, scope)
+        self._entries: OrderedDict = OrderedDict()
+
+        # Index the keys by the prefix of a completion and by the length of
+        # the target of a fuzzy search for the scoped invalidation
+        self._prefixes: Dict[str, Set[Hashable]] = {}
+        self._lengths: Dict[int, Set[Hashable]] = {}
+        self._max_threshold: int = 0
+
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._invalidations: int = 0
+
+    def __len__(self) -> int:
+        """Enable the use of 'len' operator for retrieving the number of entries."""
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        """Declare 'max_size' as a read-only attribute."""
+        return self._max_size
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Declare 'ttl' as a read-only attribute."""
+        return self._ttl
+
+    @property
+    def scoped(self) -> bool:
+        """Declare 'scoped' as a read-only attribute."""
+        return self._scoped
+
+    @property
+    def hits(self) -> int:
+        """Declare 'hits' as a read-only attribute."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Declare 'misses' as a read-only attribute."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Declare 'evictions' as a read-only attribute."""
+        return self._evictions
+
+    @property
+    def invalidations(self) -> int:
+        """Declare 'invalidations' as a read-only attribute."""
+        return self._invalidations
+
+    def get(self, key: Hashable, generation: int) -> Optional[List[str]]:
+        """Return a copy of the cached result of the query, or None if the
+        result is missing, expired or of an older generation of the trie."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        result, stored_generation, expiry, _ = entry
+        if expiry is not None and monotonic() >= expiry:
+            self._remove(key)
+            self._evictions += 1
+            self._misses += 1
+            return None
+
+        if not self._scoped and stored_generation != generation:
+            self._remove(key)
+            self._invalidations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return list(result)
+
+    def put(
+        self,
+        key: Hashable,
+        result: List[str],
+        generation: int,
+        scope: Tuple
+    ) -> None:
+        """Store the result of the query.
+
+        The scope is ('prefix', prefix) for a completion, or
+        ('fuzzy', len(target), threshold) for a fuzzy search.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        expiry = None if self._ttl is None else monotonic() + self._ttl
+        self._entries[key] = (tuple(result), generation, expiry, scope)
+
+        if self._scoped:
+            if scope[0] == 'prefix':
+                self._prefixes.setdefault(scope[1], set()).add(key)
+            else:
+                self._lengths.setdefault(scope[1], set()).add(key)
+                self._max_threshold = max(self._max_threshold, scope[2])
+
+        # Evict the least recently used entry
+        if len(self._entries) > self._max_size:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, word: str) -> None:
+        """Drop the entries whose results may be changed by inserting or
+        deleting the word."""
+        # The completions of every prefix of the word, looking up the cached
+        # prefixes instead if there are fewer of them than prefixes of a long word
+        if len(self._prefixes) <= len(word):
+            prefixes = [prefix for prefix in self._prefixes if word.startswith(prefix)]
+        else:
+            prefixes = [word[:i] for i in range(len(word) + 1)]
+        for prefix in prefixes:
+            for key in list(self._prefixes.get(prefix, ())):
+                self._remove(key)
+                self._invalidations += 1
+
+        # The fuzzy searches whose distance to the word may be within the
+        # threshold, as the distance is at least the difference in length
+        for length in list(self._lengths):
+            diff = abs(length - len(word))
+            if diff > self._max_threshold:
+                continue
+            for key in list(self._lengths[length]):
+                if diff <= self._entries[key][3][2]:
+                    self._remove(key)
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all the entries while keeping the counters."""
+        self._entries.clear()
+        self._prefixes.clear()
+        self._lengths.clear()
+        self._max_threshold = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove the entry of the key and its index."""
+        scope = self._entries.pop(key)[3]
+        if not self._scoped:
+            return
+
+        index = self._prefixes if scope[0] == 'prefix' else self._lengths
+        keys = index[scope[1]]
+        keys.discard(key)
+        if not keys:
+            del index[scope[1]]
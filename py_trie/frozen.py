@@ -0,0 +1,612 @@
+from __future__ import annotations
+import mmap as mmap_module
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .fuzzy_trie import FuzzyTrie
+from .trie import Trie
+
+# The binary layout of a saved trie is a fixed-size little-endian header
+# followed by the offsets array of uint32, the chars array of the codes of
+# the characters, the targets array of uint32, the alphabet of the codes in
+# UTF-32 and the terminal flags of one byte per node. The checksum is the
+# CRC-32 of everything after the header. The files of version 1 have no
+# alphabet, i.e. their chars are the code points of uint32.
+MAGIC = b'PYTRIE\x00\x00'
+VERSION = 2
+HEADER = struct.Struct('<8sHHIQQQII')
+FLAG_LOWER_CASE = 1
+FLAG_BYTES_KEYS = 2
+
+
+def _code_type(alphabet_size: int) -> str:
+    """Return the typecode of the narrowest array holding the codes of an
+    alphabet, where an alphabet of size 0 stands for the code points."""
+    if not alphabet_size:
+        return 'I'
+    return 'B' if alphabet_size <= 1 << 8 else 'H'
+
+
+class FrozenTrie(Trie):
+    """An immutable prefix tree stored in flat arrays.
+
+    The nodes of the trie are minimized into a directed acyclic word graph
+    (DAWG), in which words sharing a suffix also share the nodes of the suffix.
+    Every node is an integer indexing the following arrays:
+
+        terminal (bytearray):
+            1 if the node is the end of a word else 0.
+        offsets (array):
+            The edges of the node i are stored at the indices
+            offsets[i] to offsets[i + 1] - 1 of the edge arrays.
+        chars (array):
+            The code of the character of every edge, i.e. its index in the
+            sorted alphabet of the trie, in ascending order among the edges
+            of a node. The codes of an alphabet of up to 256 characters take
+            one byte, up to 65536 characters two bytes, and the code points
+            of a larger alphabet four bytes.
+        targets (array):
+            The node reached by every edge.
+
+    The arrays are either in memory or memory-mapped from a file written by
+    'save', in which case the lookups run straight off the mapped pages.
+
+    Attributes:
+        root (int):
+            The index of the root node.
+        size (int):
+            The total number of words in the Trie.
+        lower_case (bool):
+            Whether all the input words are converted to lower-case.
+        num_nodes (int):
+            The total number of nodes after the minimization.
+        alphabet (str | bytes):
+            The sorted characters coded by the chars array, or None if the
+            chars array holds the code points.
+
+    Methods:
+        find:
+            Return True if the word is in the Trie else False.
+        find_many:
+            Search a batch of words in one pass over the Trie.
+        complete:
+            Complete a word based on the input of the user and
+            return the list of words ordered by their length.
+        count_prefix:
+            Return the number of words starting with a prefix.
+        rank:
+            Return the number of words lexicographically smaller than a word.
+        select:
+            Return the word at an index of the sorted words.
+        freeze:
+            Return the FrozenTrie itself.
+        snapshot:
+            Return the FrozenTrie itself.
+        save:
+            Write the FrozenTrie into a binary file.
+
+    Class Methods:
+        load:
+            Load a FrozenTrie object from a binary file.
+        from_trie:
+            Create a FrozenTrie object from a Trie.
+        from_list:
+            Create a FrozenTrie object from a python list.
+        from_iterable:
+            Create a FrozenTrie object from an iterable of words.
+        from_txt:
+            Create a FrozenTrie object from a txt file.
+
+    Notes:
+        The edges of a node are ordered by character, so words of the same
+        length are completed in lexicographic order rather than in the order
+        of insertion of the mutable trie. Likewise, the depth-first order of
+        the fuzzy search is the lexicographic order, which decides the order
+        of the words and the words kept by 'num_return' among words of equal
+        distance. The results are those of a mutable trie built from the
+        words in sorted order.
+
+    To instantiate:
+        >>> frozen_trie = Trie.from_list([...]).freeze()
+    """
+
+    # The class of the mutable trie used to build the frozen trie
+    _mutable_class = Trie
+
+    def __init__(
+        self,
+        terminal: Union[bytearray, memoryview],
+        offsets: Union[array, memoryview],
+        chars: Union[array, memoryview],
+        targets: Union[array, memoryview],
+        root: int,
+        size: int,
+        lower_case: bool = False,
+        counts: Optional[array] = None,
+        alphabet: Optional[str] = None,
+        bytes_keys: bool = False
+    ) -> None:
+        """Construct the trie from the arrays of the nodes and edges."""
+        self._terminal = terminal
+        self._offsets = offsets
+        self._chars = chars
+        self._targets = targets
+        self._root: int = root
+        self._size: int = size
+        self._lower_case: bool = lower_case
+        self._compressed: bool = False
+        self._generation: int = 0
+        self._cache = None
+        self._index = None
+        self._infix_index = None
+        self._journal = None
+        self._stats_enabled: bool = False
+        self._stats_hook = None
+        self._last_stats = None
+        self._copy_on_write: bool = False
+        self._write_lock = None
+        self._bytes_keys: bool = bytes_keys
+
+        # Map the codes of the edges to their characters and back
+        self._letters: Optional[str] = alphabet
+        if alphabet is None:
+            self._alphabet: Optional[frozenset] = None
+            self._char_of = chr
+            self._code_of = ord
+        else:
+            self._alphabet = frozenset(alphabet)
+            self._char_of = alphabet.__getitem__
+            self._code_of = {char: code for code, char in enumerate(alphabet)}.get
+
+        # The number of words below every node, counted on first use
+        # if the trie is loaded from a file
+        self._counts: Optional[array] = counts
+
+        # Look up the terminal flag without attribute access
+        self._is_word = terminal.__getitem__
+
+    @property
+    def num_nodes(self) -> int:
+        """Declare 'num_nodes' as a read-only attribute."""
+        return len(self._terminal)
+
+    @property
+    def alphabet(self) -> Optional[Union[str, bytes]]:
+        """Declare 'alphabet' as a read-only attribute."""
+        return None if self._letters is None else self._word(self._letters)
+
+    @classmethod
+    def from_trie(cls, trie: Trie) -> FrozenTrie:
+        """Create a FrozenTrie object from a Trie.
+
+        Args:
+            trie (Trie): The trie to be frozen.
+
+        Returns:
+            FrozenTrie: A FrozenTrie object storing the words of the trie.
+
+        Raises:
+            TypeError: The input parameter 'trie' is not a Trie.
+
+        To instantiate:
+            >>> frozen_trie = FrozenTrie.from_trie(trie)
+        """
+        if not isinstance(trie, Trie):
+            raise TypeError("The input parameter 'trie' must be a Trie.")
+
+        if isinstance(trie, FrozenTrie):
+            return cls(
+                trie._terminal, trie._offsets, trie._chars, trie._targets,
+                trie._root, trie._size, trie._lower_case, trie._counts,
+                trie._letters, trie._bytes_keys
+            )
+
+        # Every distinct (terminal, edges) signature is registered once,
+        # so that equivalent subtrees are merged into the same node
+        registry: Dict[Tuple[bool, tuple], int] = {}
+        signatures: List[Tuple[bool, tuple]] = []
+        counts: List[int] = []
+
+        def register(terminal: bool, edges: tuple) -> int:
+            signature = (terminal, edges)
+            index = registry.get(signature)
+            if index is None:
+                index = registry[signature] = len(signatures)
+                signatures.append(signature)
+                # Count the words below the node, whose children are
+                # always registered before the node itself
+                counts.append(terminal + sum(counts[t] for _, t in edges))
+            return index
+
+        # Read the root once, as a writer of a copy-on-write trie may
+        # publish a new root during the traversal
+        root_node = trie.root
+
+        # Register the nodes in post-order with an explicit stack
+        ids: Dict[int, int] = {}
+        stack = [(root_node, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for _, child in trie._edges(node))
+                continue
+
+            edges = []
+            for label, child in trie._edges(node):
+                # Expand a label of a compressed trie into a chain of nodes
+                target = ids.pop(id(child))
+                for char in reversed(label[1:]):
+                    target = register(False, ((ord(char), target),))
+                edges.append((ord(label[0]), target))
+            ids[id(node)] = register(trie._is_word(node), tuple(sorted(edges)))
+
+        root = ids[id(root_node)]
+
+        # Code the characters by their index in the declared alphabet, or
+        # else in the characters of the edges, which keeps their order
+        if trie._alphabet is not None:
+            alphabet = ''.join(sorted(trie._alphabet))
+        else:
+            alphabet = ''.join(sorted({
+                chr(char) for _, edges in signatures for char, _ in edges
+            }))
+        if not alphabet or len(alphabet) > 1 << 16:
+            alphabet = None
+            code_of = None
+        else:
+            code_of = {ord(char): code for code, char in enumerate(alphabet)}
+
+        # Lay out the nodes and their edges into flat arrays
+        terminal = bytearray(len(signatures))
+        offsets = array('I', [0])
+        chars = array(_code_type(len(alphabet or '')))
+        targets = array('I')
+        for i, (is_word, edges) in enumerate(signatures):
+            terminal[i] = is_word
+            for char, target in edges:
+                chars.append(char if code_of is None else code_of[char])
+                targets.append(target)
+            offsets.append(len(chars))
+
+        return cls(
+            terminal, offsets, chars, targets, root, counts[root], trie.lower_case,
+            array('Q', counts), alphabet, trie._bytes_keys
+        )
+
+    @classmethod
+    def from_iterable(cls, words: Iterable[str], *args, **kwargs) -> FrozenTrie:
+        """Create a FrozenTrie object from an iterable of words.
+
+        Args:
+            words (Iterable[str]): An iterable of words to be inserted.
+            *args, **kwargs: Arguments passed to 'from_iterable' of the mutable trie.
+
+        Returns:
+            FrozenTrie: A FrozenTrie object with inserted words from the iterable.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+            ValueError: The words are not sorted although 'sorted_input' is set.
+
+        To instantiate:
+            >>> frozen_trie = FrozenTrie.from_iterable(...)
+        """
+        return cls.from_trie(cls._mutable_class.from_iterable(words, *args, **kwargs))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, verify: bool = True) -> FrozenTrie:
+        """Load a FrozenTrie object from a binary file written by 'save'.
+
+        Args:
+            path (str):
+                The path of the binary file.
+            mmap (bool):
+                Whether the file is memory-mapped instead of read into memory.
+                Processes mapping the same file share its pages. (Default=True)
+            verify (bool):
+                Whether the checksum of the file is verified, which reads
+                the whole file once. (Default=True)
+
+        Returns:
+            FrozenTrie: A FrozenTrie object backed by the content of the file.
+
+        Raises:
+            TypeError: The input parameter 'path' is not a string.
+            FileNotFoundError: The file with the input path does not exist.
+            ValueError: The file is not a valid trie file of a supported version.
+
+        To instantiate:
+            >>> frozen_trie = FrozenTrie.load(path)
+        """
+        if not isinstance(path, str):
+            raise TypeError("The input parameter 'path' must be a string.")
+
+        try:
+            with open(path, 'rb') as f:
+                if mmap:
+                    buffer = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+                else:
+                    buffer = f.read()
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(
+                f"The file with the path '{path}' is not found."
+            ) from exc
+        except ValueError as exc:
+            # An empty file cannot be mapped
+            raise ValueError(f"The file '{path}' is not a valid trie file.") from exc
+
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError(f"The file '{path}' is not a valid trie file.")
+
+        (
+            magic, version, flags, root, size, num_nodes, num_edges, checksum,
+            alphabet_size
+        ) = HEADER.unpack_from(view)
+
+        if magic != MAGIC:
+            raise ValueError(f"The file '{path}' is not a valid trie file.")
+        if version not in (1, VERSION):
+            raise ValueError(
+                f"The version {version} of the file '{path}' is not supported."
+            )
+
+        # The header of version 1 ends with zero padding instead of the
+        # size of the alphabet
+        code_type = _code_type(alphabet_size)
+        code_size = struct.calcsize('<' + code_type)
+
+        # Slice the arrays out of the buffer without copying
+        bounds = [HEADER.size]
+        for length in (
+            4 * (num_nodes + 1), code_size * num_edges, 4 * num_edges,
+            4 * alphabet_size, num_nodes
+        ):
+            bounds.append(bounds[-1] + length)
+
+        if len(view) != bounds[-1]:
+            raise ValueError(f"The file '{path}' is truncated or corrupted.")
+        if verify and zlib.crc32(view[HEADER.size:]) != checksum:
+            raise ValueError(f"The checksum of the file '{path}' does not match.")
+
+        offsets, chars, targets = (
+            cls._uint_view(view[bounds[i]:bounds[i + 1]], typecode)
+            for i, typecode in enumerate(('I', code_type, 'I'))
+        )
+        try:
+            alphabet = str(view[bounds[3]:bounds[4]], 'utf-32-le') if alphabet_size else None
+        except UnicodeDecodeError as exc:
+            raise ValueError(f"The file '{path}' is truncated or corrupted.") from exc
+        terminal = view[bounds[4]:bounds[5]]
+
+        return cls(
+            terminal, offsets, chars, targets, root, size,
+            bool(flags & FLAG_LOWER_CASE), None, alphabet, bool(flags & FLAG_BYTES_KEYS)
+        )
+
+    @staticmethod
+    def _uint_view(view: memoryview, typecode: str = 'I') -> Union[array, memoryview]:
+        """Return the little-endian unsigned integers of the typecode in the
+        buffer, without copying them on little-endian machines."""
+        size = struct.calcsize('<' + typecode)
+        values = array(typecode)
+        if sys.byteorder == 'little' and values.itemsize == size:
+            return view.cast(typecode)
+
+        if values.itemsize != size:
+            values = array('L')
+        values.frombytes(view)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def save(self, path: str) -> None:
+        """Write the trie into a binary file which can be loaded with 'load'.
+
+        Args:
+            path (str): The path of the binary file.
+
+        Raises:
+            TypeError: The input parameter 'path' is not a string.
+
+        Example:
+            >>> frozen_trie.save('words.trie')
+            >>> frozen_trie = FrozenTrie.load('words.trie')
+        """
+        if not isinstance(path, str):
+            raise TypeError("The input parameter 'path' must be a string.")
+
+        alphabet = self._letters or ''
+        payload = []
+        for typecode, values in zip(
+            ('I', _code_type(len(alphabet)), 'I'), (self._offsets, self._chars, self._targets)
+        ):
+            if sys.byteorder != 'little':
+                values = array(typecode, values)
+                values.byteswap()
+            payload.append(values)
+        payload.append(alphabet.encode('utf-32-le'))
+        payload.append(self._terminal)
+
+        checksum = 0
+        for part in payload:
+            checksum = zlib.crc32(part, checksum)
+
+        flags = (
+            (FLAG_LOWER_CASE if self._lower_case else 0) |
+            (FLAG_BYTES_KEYS if self._bytes_keys else 0)
+        )
+        header = HEADER.pack(
+            MAGIC, VERSION, flags, self._root, self._size, len(self._terminal),
+            len(self._chars), checksum, len(alphabet)
+        )
+
+        with open(path, 'wb') as f:
+            f.write(header)
+            for part in payload:
+                f.write(part)
+
+    def freeze(self) -> FrozenTrie:
+        """Return the FrozenTrie itself."""
+        return self
+
+    def snapshot(self) -> FrozenTrie:
+        """Return the FrozenTrie itself, which never changes."""
+        return self
+
+    def insert(self, word: str, weight: Optional[float] = None) -> bool:
+        """Raise a TypeError as a FrozenTrie cannot be modified."""
+        raise TypeError("A FrozenTrie object does not support insertion.")
+
+    def delete(self, word: str) -> bool:
+        """Raise a TypeError as a FrozenTrie cannot be modified."""
+        raise TypeError("A FrozenTrie object does not support deletion.")
+
+    def insert_many(self, words: Iterable[str]) -> List[bool]:
+        """Raise a TypeError as a FrozenTrie cannot be modified."""
+        raise TypeError("A FrozenTrie object does not support insertion.")
+
+    def delete_many(self, words: Iterable[str]) -> List[bool]:
+        """Raise a TypeError as a FrozenTrie cannot be modified."""
+        raise TypeError("A FrozenTrie object does not support deletion.")
+
+    def merge(self, other: Trie) -> int:
+        """Raise a TypeError as a FrozenTrie cannot be modified."""
+        raise TypeError("A FrozenTrie object does not support insertion.")
+
+    def union(self, other: Trie) -> Trie:
+        """Raise a TypeError as the nodes of a FrozenTrie cannot be combined."""
+        raise TypeError("A FrozenTrie object does not support set operations.")
+
+    def intersection(self, other: Trie) -> Trie:
+        """Raise a TypeError as the nodes of a FrozenTrie cannot be combined."""
+        raise TypeError("A FrozenTrie object does not support set operations.")
+
+    def difference(self, other: Trie) -> Trie:
+        """Raise a TypeError as the nodes of a FrozenTrie cannot be combined."""
+        raise TypeError("A FrozenTrie object does not support set operations.")
+
+    def enable_journal(
+        self,
+        snapshot: str,
+        journal: str,
+        sync_every: int = 128,
+        sync_interval: Optional[float] = 1.0
+    ) -> None:
+        """Raise a TypeError as a FrozenTrie is never modified."""
+        raise TypeError("A FrozenTrie object does not support the journal.")
+
+    def top_k_complete(self, prefix: str, k: int) -> List[str]:
+        """Raise a TypeError as the weights are not stored in a FrozenTrie,
+        since the minimized nodes are shared by different words."""
+        raise TypeError("A FrozenTrie object does not support weighted completion.")
+
+    def find(self, word: str) -> bool:
+        """Search whether the word is stored in the trie.
+
+        Args:
+            word (str): A word to be searched for in the trie.
+
+        Returns:
+            bool: True if the word is found else false.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty input of 'word'.
+
+        Example:
+            >>> frozen_trie = Trie.from_list([...]).freeze()
+            >>> is_found = frozen_trie.find('...')
+        """
+        word = self._key(word)
+        node, _ = self._locate(word)
+        return node is not None and bool(self._terminal[node])
+
+    def memory_usage(self) -> int:
+        """Return the number of bytes of the arrays of the nodes and edges,
+        which are shared with the page cache if the trie is memory-mapped."""
+        arrays = [self._terminal, self._offsets, self._chars, self._targets]
+        if self._counts is not None:
+            arrays.append(self._counts)
+        return sum(memoryview(a).nbytes for a in arrays)
+
+    def _count(self, node: int) -> int:
+        """Return the number of words below the node."""
+        if self._counts is None:
+            # The children are always numbered before their parents
+            offsets = self._offsets
+            targets = self._targets
+            counts = array('Q', bytes(8 * len(self._terminal)))
+            for i, is_word in enumerate(self._terminal):
+                counts[i] = is_word + sum(
+                    counts[t] for t in targets[offsets[i]:offsets[i + 1]]
+                )
+            self._counts = counts
+        return self._counts[node]
+
+    def _edges(self, node: int) -> List[Tuple[str, int]]:
+        """Return the (character, child) pairs of the children of the node."""
+        lo = self._offsets[node]
+        hi = self._offsets[node + 1]
+        return list(zip(map(self._char_of, self._chars[lo:hi]), self._targets[lo:hi]))
+
+    def _locate(self, word: str) -> Tuple[int, str]:
+        """Return the node reached by following the word from the root and ''.
+        Return (None, '') if no word in the trie starts with the word."""
+        offsets = self._offsets
+        chars = self._chars
+        targets = self._targets
+        code_of = self._code_of
+        node = self._root
+
+        for char in word:
+            # A character outside the alphabet has no code
+            code = code_of(char)
+            if code is None:
+                return None, ''
+            lo = offsets[node]
+            hi = offsets[node + 1]
+
+            # Compare the only edge directly, otherwise binary search
+            # the character among the edges of the node
+            if hi - lo != 1:
+                lo = bisect_left(chars, code, lo, hi)
+                if lo == hi:
+                    return None, ''
+            if chars[lo] != code:
+                return None, ''
+            node = targets[lo]
+
+        return node, ''
+
+
+class FrozenFuzzyTrie(FrozenTrie, FuzzyTrie):
+    """An immutable prefix tree stored in flat arrays with approximate string
+    matching function.
+
+    Methods:
+        find:
+            Return True if the word is in the Trie else False.
+        complete:
+            Complete a word based on the input of the user and
+            return the list of words ordered by their length.
+        fuzzy_search:
+            Search a list of words within a Levenshtein distance
+            to the target string in the trie.
+        fuzzy_top_k:
+            Search the k words with the smallest Levenshtein distance
+            to the target string in the trie.
+
+    Notes:
+        The fuzzy searches visit the words in lexicographic order, see the
+        Notes of FrozenTrie.
+
+    To instantiate:
+        >>> frozen_trie = FuzzyTrie.from_list([...]).freeze()
+    """
+
+    _mutable_class = FuzzyTrie
@@ -1,7 +1,21 @@
-from typing import Optional, List
+from __future__ import annotations
+import heapq
+import time
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Generator, Iterable, Iterator, Optional, List, Tuple,
+    Union
+)
 
+from .levenshtein import make_matcher
 from .node import TrieNode
-from .trie import Trie
+from .session import FuzzySession
+from .stats import CountingMatcher, SearchStats
+from .symdelete import SymDeleteIndex
+from .trie import BYTES_TYPES, Trie
+
+if TYPE_CHECKING:
+    from .frozen import FrozenFuzzyTrie
 
 
 class FuzzyTrie(Trie):
@@ -15,6 +29,23 @@ class FuzzyTrie(Trie):
         lower_case (bool): 
             Whether all the input words will be converted to lower-case. 
             (Default=False)
+        compressed (bool):
+            Whether chains of single-child nodes are collapsed into one
+            RadixNode with a string label. (Default=False)
+        index (SymDeleteIndex):
+            The symmetric-delete index answering the fuzzy searches within
+            its 'max_distance', or None. Pass index='symdelete' and
+            max_distance to build it along with the trie. (Default=None)
+        copy_on_write (bool):
+            Whether the writers copy the nodes they modify, so that the
+            readers never need a lock. (Default=False)
+        alphabet (str | bytes):
+            The characters allowed in the inserted words, or None if any
+            character is allowed. A bytes alphabet makes a bytes trie, whose
+            words and targets are bytes-like objects. (Default=None)
+        last_stats (SearchStats):
+            The statistics of the last fuzzy search while the statistics
+            are enabled, or None.
             
     Methods:
         insert: 
@@ -23,27 +54,227 @@ class FuzzyTrie(Trie):
             Return True if the word is in the Trie else False.
         delete:
             Delete a word in the Trie and return True if successful.
+        find_many:
+            Search a batch of words in one pass over the Trie.
+        insert_many:
+            Insert a batch of words in one pass over the Trie.
+        delete_many:
+            Delete a batch of words in one pass over the Trie.
+        merge:
+            Insert the words of another trie, attaching its unshared subtrees whole.
+        union:
+            Return a new FuzzyTrie of the words of either trie.
+        intersection:
+            Return a new FuzzyTrie of the words of both tries.
+        difference:
+            Return a new FuzzyTrie of the words missing from another trie.
         complete: 
             Complete a word based on the input of the user and
             return the list of words ordered by their length.
         fizzy_search: 
             Search a list of words within a Levenshtein distance
             to the target string in the trie.
+        afuzzy_search:
+            Search the words within a Levenshtein distance without blocking
+            the event loop, within an optional time or node budget.
+        fuzzy_top_k:
+            Search the k words with the smallest Levenshtein distance
+            to the target string in the trie.
+        fuzzy_search_many:
+            Search the words within a Levenshtein distance to each of
+            many targets in one traversal of the trie.
+        fuzzy_session:
+            Start an incremental fuzzy search of a target typed
+            one character at a time.
+        build_index:
+            Build a symmetric-delete index of the words for the fuzzy search.
+        drop_index:
+            Drop the symmetric-delete index.
+        snapshot:
+            Return an isolated copy of a copy-on-write FuzzyTrie in O(1).
+        enable_cache:
+            Cache the results of the queries in a bounded LRU.
+        disable_cache:
+            Stop caching the results of the queries.
+        enable_stats:
+            Collect the statistics of every fuzzy search.
+        disable_stats:
+            Stop collecting the statistics of the fuzzy searches.
+        structure_stats:
+            Describe the number of nodes, the fan-out and the depths of the FuzzyTrie.
+        enable_journal:
+            Snapshot the words and record the later modifications in a journal.
+        disable_journal:
+            Sync and close the journal.
+        compact:
+            Fold the journal into a fresh snapshot in the background.
+        freeze:
+            Return an immutable array-backed copy of the FuzzyTrie.
+        save:
+            Write the FuzzyTrie into a binary file.
         
     Class Methods: 
+        load:
+            Load a read-only FuzzyTrie from a binary file.
         from_list: 
             Create a FuzzyTrie object from a python list.
+        from_iterable:
+            Create a FuzzyTrie object from an iterable of words.
         from_txt: 
             Create a FuzzyTrie object from a txt file.
+        recover:
+            Rebuild a FuzzyTrie object from its snapshot and the tail of its journal.
 
     To instantiate:
         >>> case_sensitive_trie = FuzzyTrie()
         >>> case_insensitive_trie = FuzzyTrie(lower_case=True)
+        >>> compressed_trie = FuzzyTrie(compressed=True)
+        >>> indexed_trie = FuzzyTrie(index='symdelete', max_distance=2)
+        >>> concurrent_trie = FuzzyTrie(copy_on_write=True)
+        >>> bytes_trie = FuzzyTrie(alphabet=bytes(range(256)))
     """
     
-    def __init__(self, lower_case: bool = False) -> None:
+    def __init__(
+        self,
+        lower_case: bool = False,
+        compressed: bool = False,
+        index: Optional[str] = None,
+        max_distance: int = 2,
+        copy_on_write: bool = False,
+        alphabet: Optional[Union[str, bytes]] = None
+    ) -> None:
         """Inherit the attributes and methods from the base Trie."""
-        super().__init__(lower_case)
+        super().__init__(lower_case, compressed, copy_on_write, alphabet)
+
+        if index not in (None, 'symdelete'):
+            raise ValueError("The input parameter 'index' must be None or 'symdelete'")
+
+        if index is not None and copy_on_write:
+            raise TypeError("A copy-on-write trie does not support the symmetric-delete index.")
+
+        self._index: Optional[SymDeleteIndex] = (
+            None if index is None else SymDeleteIndex(max_distance)
+        )
+
+        # The searches only wrap their matcher to count the rows while
+        # the statistics are enabled
+        self._stats_enabled: bool = False
+        self._stats_hook: Optional[Callable[[SearchStats], None]] = None
+        self._last_stats: Optional[SearchStats] = None
+
+    @property
+    def index(self) -> Optional[SymDeleteIndex]:
+        """Declare 'index' as a read-only attribute."""
+        return self._index
+
+    @property
+    def last_stats(self) -> Optional[SearchStats]:
+        """Declare 'last_stats' as a read-only attribute."""
+        return self._last_stats
+
+    def enable_stats(self, hook: Optional[Callable[[SearchStats], None]] = None) -> None:
+        """Collect the statistics of every 'fuzzy_search', i.e. the nodes
+        visited, the rows computed, the branches pruned by the threshold and
+        the maximum depth, e.g. to tell whether a slow search is caused by
+        its threshold, its target or the shape of the trie.
+
+        The statistics of the last search are kept in 'last_stats' and passed
+        to the hook, e.g. to export them to a metrics system. A search costs
+        more while the statistics are enabled, and nothing more otherwise.
+
+        Args:
+            hook (Callable[[SearchStats], None]): The function called with the
+                statistics after every search, or None. (Default=None)
+
+        Raises:
+            TypeError: Invalid data type of input parameter 'hook'.
+
+        Example:
+            >>> trie = FuzzyTrie.from_list([...])
+            >>> trie.enable_stats(hook=lambda stats: metrics.record(stats.as_dict()))
+            >>> trie.fuzzy_search('hello', 2)
+            >>> trie.last_stats.nodes_visited, trie.last_stats.branches_pruned
+        """
+        if hook is not None and not callable(hook):
+            raise TypeError("The input parameter 'hook' must be callable.")
+
+        self._stats_enabled = True
+        self._stats_hook = hook
+
+    def disable_stats(self) -> None:
+        """Stop collecting the statistics and drop the hook."""
+        self._stats_enabled = False
+        self._stats_hook = None
+        self._last_stats = None
+
+    def build_index(self, max_distance: int = 2) -> SymDeleteIndex:
+        """Build a symmetric-delete index of the words in the trie.
+
+        While the index exists, it is updated by 'insert' and 'delete', and
+        'fuzzy_search' looks up the candidates within thresholds up to
+        'max_distance' in the index instead of traversing the trie. The
+        candidates are verified with the exact distance and returned in
+        depth-first order, so the results are the same as without the index,
+        including the words kept by 'num_return' among words of equal distance.
+
+        Args:
+            max_distance (int): The maximum threshold served by the index.
+                (Default=2)
+
+        Returns:
+            SymDeleteIndex: The new index reporting its build time and memory.
+
+        Raises:
+            TypeError: The trie is a copy-on-write trie.
+            ValueError: Invalid data type and range of input parameter
+                'max_distance'.
+
+        Example:
+            >>> trie = FuzzyTrie.load('words.trie')
+            >>> index = trie.build_index(max_distance=1)
+            >>> index.build_time, index.memory_usage()
+        """
+        # The index is modified in place, so the readers of a copy-on-write
+        # trie could see it in the middle of an update
+        if self._copy_on_write:
+            raise TypeError("A copy-on-write trie does not support the symmetric-delete index.")
+
+        index = SymDeleteIndex(max_distance)
+        index.extend(self.iter_complete('', order='none'))
+        self._index = index
+        return index
+
+    def drop_index(self) -> None:
+        """Drop the symmetric-delete index and search the trie instead."""
+        self._index = None
+
+    def freeze(self) -> FrozenFuzzyTrie:
+        """Create an immutable copy of the trie stored in flat arrays.
+
+        Returns:
+            FrozenFuzzyTrie: A read-only trie with the same words.
+
+        Example:
+            >>> trie = FuzzyTrie.from_list([...])
+            >>> frozen_trie = trie.freeze()
+        """
+        from .frozen import FrozenFuzzyTrie
+        return FrozenFuzzyTrie.from_trie(self)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, verify: bool = True) -> FrozenFuzzyTrie:
+        """Load a read-only trie from a binary file written by 'save'.
+
+        See 'Trie.load' for the arguments.
+
+        Returns:
+            FrozenFuzzyTrie: A read-only trie backed by the content of the file.
+
+        To instantiate:
+            >>> trie = FuzzyTrie.load('words.trie')
+        """
+        from .frozen import FrozenFuzzyTrie
+        return FrozenFuzzyTrie.load(path, mmap, verify)
 
     def fuzzy_search(
         self,
@@ -51,7 +282,8 @@ class FuzzyTrie(Trie):
         threshold: int,
         num_return: Optional[int] = None,
         sort_by_distance: bool = False,
-        case_insensitive: bool = False
+        case_insensitive: bool = False,
+        engine: str = 'row'
     ) -> List[str]:
         """An approximate string matching method that return a list of word 
         within a Levenshtein distance threshold.
@@ -68,6 +300,11 @@ class FuzzyTrie(Trie):
             case_insensitive (bool):
                 Whether difference in case counts toward the LD difference. 
                 (Default=False)
+            engine (str):
+                The engine computing the distances, either 'row' for the
+                row-by-row dynamic programming or 'bitparallel' for the
+                bit-vector algorithm of Myers. Both return the same words.
+                (Default='row')
 
         Returns:
             List[str]:  
@@ -79,12 +316,22 @@ class FuzzyTrie(Trie):
                 Invalid data type of input parameter 'word'.
             ValueError: 
                 Invalid data type and range of input parameters 'threshold'
-                or 'num_return'.
+                or 'num_return', or unknown 'engine'.
 
         Notes:
             Additional time complexity is introduced if 'sort_by_distance' 
             is set to True.
 
+            If both 'num_return' and 'sort_by_distance' are set, the trie is
+            searched best-first and the 'num_return' nearest words are returned,
+            see 'fuzzy_top_k'. The words of equal distance are taken in
+            depth-first order, as without 'num_return'.
+
+            The depth-first order follows the order in which the edges were
+            inserted, while a FrozenFuzzyTrie orders them by character, so the
+            results of its frozen copy, including the words kept by
+            'num_return', are those of a FuzzyTrie of the words in sorted order.
+
         Example:
             >>> trie = FuzzyTrie()
             >>> results = trie.fuzzy_search(
@@ -93,10 +340,138 @@ class FuzzyTrie(Trie):
             >>>     num_return=5
             >>>     sort_by_distance=True
             >>>     case_insensitive=True
+            >>>     engine='bitparallel'
+            >>> )
+        """
+        matcher = self._fuzzy_matcher(
+            target, threshold, num_return, sort_by_distance, case_insensitive, engine
+        )
+
+        stats = None
+        if self._stats_enabled:
+            stats = SearchStats(self._word(matcher.target), threshold)
+            matcher = CountingMatcher(matcher, stats)
+            start = time.perf_counter()
+
+        cache = self._cache
+        if cache is None:
+            res = self._fuzzy_search(matcher, num_return, sort_by_distance, stats)
+        else:
+            key = self._fuzzy_key(matcher, num_return, sort_by_distance)
+            res = cache.get(key, self._generation)
+            if res is None:
+                res = self._fuzzy_search(matcher, num_return, sort_by_distance, stats)
+                cache.put(
+                    key, res, self._generation, ('fuzzy', len(matcher.target), threshold)
+                )
+            elif stats is not None:
+                stats.strategy = 'cache'
+
+        if stats is not None:
+            stats.elapsed = time.perf_counter() - start
+            stats.num_results = len(res)
+            self._last_stats = stats
+            if self._stats_hook is not None:
+                self._stats_hook(stats)
+        return res
+
+    async def afuzzy_search(
+        self,
+        target: str,
+        threshold: int,
+        num_return: Optional[int] = None,
+        sort_by_distance: bool = False,
+        case_insensitive: bool = False,
+        engine: str = 'row',
+        deadline: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        chunk_size: int = 1000
+    ) -> Tuple[List[str], bool]:
+        """Search the words within the threshold like 'fuzzy_search' while giving
+        control back to the event loop every 'chunk_size' visited nodes.
+
+        The search honors the cancellation of its task whenever it gives
+        control back, and stops early once it has run for 'deadline' seconds
+        or visited 'max_nodes' nodes, returning the words found so far. If
+        both 'num_return' and 'sort_by_distance' are set, the trie is searched
+        best-first, so the words found so far are the nearest words.
+
+        Args:
+            target, threshold, num_return, sort_by_distance, case_insensitive, engine:
+                See 'fuzzy_search'.
+            deadline (int | float): The number of seconds after which the search
+                stops, checked every 'chunk_size' nodes. (Default=None)
+            max_nodes (int): The maximum number of visited nodes. (Default=None)
+            chunk_size (int): The number of nodes visited between giving
+                control back to the event loop. (Default=1000)
+
+        Returns:
+            Tuple[List[str], bool]: The words found and whether the search was
+                stopped by the deadline or the node budget before finishing.
+
+        Raises:
+            TypeError: Invalid data type of input parameter 'target'.
+            ValueError: Invalid 'threshold', 'num_return', 'engine', 'deadline',
+                'max_nodes' or 'chunk_size'.
+            RuntimeError: The trie was modified while the search gave control
+                back, unless it is a copy-on-write trie.
+
+        Notes:
+            A search answered by the symmetric-delete index does not traverse
+            the trie, so it runs at once and is never truncated.
+
+        Example:
+            >>> trie = FuzzyTrie()
+            >>> results, truncated = await trie.afuzzy_search(
+            >>>     'hello', 3, num_return=10, sort_by_distance=True, deadline=0.05
             >>> )
         """
-        if not isinstance(target, str):
-            raise TypeError("The input parameter 'target' must be a string.")
+        matcher = self._fuzzy_matcher(
+            target, threshold, num_return, sort_by_distance, case_insensitive, engine
+        )
+        self._check_budget(deadline, max_nodes, chunk_size)
+
+        cache = self._cache
+        if cache is not None:
+            key = self._fuzzy_key(matcher, num_return, sort_by_distance)
+            res = cache.get(key, self._generation)
+            if res is not None:
+                return res, False
+
+        generation = self._generation
+        index = self._index
+        if index is not None and threshold <= index.max_distance:
+            res = self._fuzzy_search(matcher, num_return, sort_by_distance)
+            truncated = False
+        else:
+            # The words found by the best-first search are final
+            if sort_by_distance and num_return is not None:
+                steps = self._iter_best_first(matcher, checkpoints=True)
+            else:
+                steps = self._iter_fuzzy(matcher, checkpoints=True)
+            pairs, truncated = await self._run_chunked(
+                steps, 0, num_return, deadline, max_nodes, chunk_size
+            )
+            if sort_by_distance:
+                pairs.sort(key=itemgetter(1))
+            res = self._words([word for word, _ in pairs])
+
+        # Only cache the complete results
+        if cache is not None and not truncated:
+            cache.put(key, res, generation, ('fuzzy', len(matcher.target), threshold))
+        return res, truncated
+
+    def _fuzzy_matcher(
+        self,
+        target: str,
+        threshold: int,
+        num_return: Optional[int],
+        sort_by_distance: bool,
+        case_insensitive: bool,
+        engine: str
+    ):
+        """Validate the arguments of 'fuzzy_search' and return the matcher of the target."""
+        target = self._key(target, 'target', empty=True, lower=False)
         
         if not isinstance(sort_by_distance, bool):
             raise TypeError("The input parameter 'sort_by_distance' must be a boolean.")
@@ -115,77 +490,682 @@ class FuzzyTrie(Trie):
         if not isinstance(case_insensitive, bool):
             raise TypeError("The input parameter 'case_insensitive' must be a boolean.")
         
-        cols = len(target) + 1
-        res = []
-        
-        def dfs(
-            node: TrieNode, 
-            curr_str: str,
-            prev_row: List[int]
-        ) -> None:
-            # Get the latest added character from the string
-            letter = curr_str[-1]
-
-            # Get the new row using the edit distance algorithm
-            curr_row = edit_dist(letter, prev_row)
-
-            # If the last value of the row is less than the threshold
-            # and it is a word stored in the trie, push the word to the result.
-            if curr_row[-1] <= threshold and node.end_of_word:
-                word = (curr_str, curr_row[-1]) if sort_by_distance else curr_str
-                res.append(word)
-            
-            # Stop the recursion once the number of element in result 
-            # meet the num_return parameter 
-            if (isinstance(num_return, int) and
-                len(res) == num_return):
-                return 
-
-            # If the minimum value of the row has not exceeded the threshold, 
-            # it is possible that adding additional characters 
-            # to the end of the word will still be valid
-            if min(curr_row) <= threshold:
-                for child in node.children:
-                    dfs(node.children[child], curr_str + child, curr_row)
-
-        def edit_dist(
-            letter: str,
-            prev_row: List[int]
-        ) -> int:
-            # Create the first value of the new row
-            curr_row = [prev_row[0] + 1]
-
-            for col in range(1, cols):
-                # Add the value of the top left grid to curr_row 
-                # if the combination and target share the same letter 
-                if ((case_insensitive and target[col - 1].lower() == letter.lower()) or 
-                    (not case_insensitive and target[col - 1] == letter)
-                ):
-                    curr_row.append(prev_row[col - 1])
-                    continue
+        return make_matcher(target, threshold, case_insensitive, engine)
 
-                # Otherwise calculate each cost of the 3 grids at the 3 directions
-                # according to the edit distance algorithm
-                replace_cost = prev_row[col - 1] + 1
-                insert_cost = curr_row[col - 1] + 1
-                delete_cost = prev_row[col] + 1
+    @staticmethod
+    def _fuzzy_key(matcher, num_return: Optional[int], sort_by_distance: bool) -> tuple:
+        """Return the cache key of a fuzzy search. Both engines return the
+        same words, so they share the results."""
+        target = matcher.target
+        return (
+            'fuzzy_search', target.lower() if matcher.case_insensitive else target,
+            matcher.threshold, num_return, sort_by_distance, matcher.case_insensitive
+        )
 
-                # Append the minimum cost to the curr_row
-                curr_row.append(min(replace_cost, insert_cost, delete_cost))
+    def _fuzzy_search(
+        self,
+        matcher,
+        num_return: Optional[int],
+        sort_by_distance: bool,
+        stats: Optional[SearchStats] = None
+    ) -> List[str]:
+        """Search the words within the threshold of the matcher, counting the
+        visited nodes into the statistics if given."""
+        index = self._index
+        if index is not None and matcher.threshold <= index.max_distance:
+            if stats is not None:
+                stats.strategy = 'index'
+            return self._words(
+                self._select(self._index_search(matcher), num_return, sort_by_distance)
+            )
 
-            return curr_row
-    
-        node = self.root
-        # Create the first row of the 2d matrix
-        first_row = range(len(target) + 1)
+        # Return the nearest words rather than the first words found
+        if sort_by_distance and num_return is not None:
+            return self._words(
+                [word for word, _ in self._best_first(matcher, num_return, stats)[0]]
+            )
+
+        if stats is None:
+            pairs = self._iter_fuzzy(matcher)
+        else:
+            pairs = stats.visits(self._iter_fuzzy(matcher, checkpoints=True))
+        res = []
+
+        for word, distance in pairs:
+            res.append((word, distance) if sort_by_distance else word)
 
-        # Start the recursion from every child of the trie root
-        for child in node.children:
-            dfs(node.children[child], child, first_row)
+            # Stop the search once the number of element in result
+            # meet the num_return parameter
+            if num_return is not None and len(res) == num_return:
+                break
 
         # Sort the words by their Levenshtein distances
         # if sort_by_distance is set to True
         if sort_by_distance:
             res = [tup[0] for tup in sorted(res, key=lambda x: x[1])]
 
-        return res
\ No newline at end of file
+        return self._words(res)
+
+    def fuzzy_top_k(
+        self,
+        target: str,
+        k: int,
+        threshold: Optional[int] = None,
+        case_insensitive: bool = False,
+        engine: str = 'row'
+    ) -> List[str]:
+        """Search the k words with the smallest Levenshtein distances to the target.
+
+        The trie is searched best-first on the minimum value of the rows, so
+        the search stops as soon as no unexplored branch can contain a word
+        nearer than the k-th word found.
+
+        Args:
+            target (str):
+                The target word.
+            k (int):
+                The maximum number of return words.
+            threshold (int):
+                The maximum Levenshtein distance difference. If None, the
+                threshold starts at 1 and is doubled until k words are found
+                or the whole trie is searched. (Default=None)
+            case_insensitive (bool):
+                Whether difference in case counts toward the LD difference.
+                (Default=False)
+            engine (str):
+                The engine computing the distances, either 'row' or
+                'bitparallel'. (Default='row')
+
+        Returns:
+            List[str]:
+                A list of at most k words in ascending order of LD difference.
+
+        Raises:
+            TypeError:
+                Invalid data type of input parameters 'target' or
+                'case_insensitive'.
+            ValueError:
+                Invalid data type and range of input parameters 'k' or
+                'threshold', or unknown 'engine'.
+
+        Example:
+            >>> trie = FuzzyTrie()
+            >>> results = trie.fuzzy_top_k('hello', 5)
+        """
+        target = self._key(target, 'target', empty=True, lower=False)
+
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("The input parameter 'k' must be a positive integer")
+
+        if (threshold is not None and
+            (not isinstance(threshold, int) or threshold < 0)):
+            raise ValueError(
+                "The input parameter 'threshold' must be a non-negative integer"
+            )
+
+        if not isinstance(case_insensitive, bool):
+            raise TypeError("The input parameter 'case_insensitive' must be a boolean.")
+
+        if threshold is not None:
+            matcher = make_matcher(target, threshold, case_insensitive, engine)
+            return self._words([word for word, _ in self._best_first(matcher, k)[0]])
+
+        # Iterative deepening on the threshold
+        threshold = 1
+        while True:
+            matcher = make_matcher(target, threshold, case_insensitive, engine)
+            res, pruned = self._best_first(matcher, k)
+
+            # Stop if enough words are found or no branch was cut by the threshold
+            if len(res) == k or not pruned:
+                return self._words([word for word, _ in res])
+
+            threshold *= 2
+
+    def fuzzy_search_many(
+        self,
+        targets: Iterable[str],
+        threshold: int,
+        num_return: Optional[int] = None,
+        sort_by_distance: bool = False,
+        case_insensitive: bool = False,
+        engine: str = 'row',
+        grouped: bool = False
+    ) -> Dict[str, List[str]]:
+        """Search the words within the threshold of every target in a single
+        traversal of the trie.
+
+        Every node of the trie is visited once for the whole batch, carrying
+        the rows of the targets still within the threshold, and a target is
+        dropped from a subtree once its row exceeds the threshold. With
+        'grouped' set, the targets are stored in a trie themselves, so that
+        the columns of a prefix shared by many targets are computed once.
+
+        Args:
+            targets (Iterable[str]):
+                The target words.
+            threshold (int):
+                The maximum Levenshtein distance difference.
+            num_return (int):
+                The maximum number of return words per target. (Default=None)
+            sort_by_distance (bool):
+                Return the words in ascending order of LD difference, where
+                the words of equal distance stay in depth-first order.
+                (Default=False)
+            case_insensitive (bool):
+                Whether difference in case counts toward the LD difference.
+                (Default=False)
+            engine (str):
+                The engine computing the rows of the targets, either 'row' or
+                'bitparallel'. The grouped traversal computes the distances
+                itself and ignores the engine. (Default='row')
+            grouped (bool):
+                Whether the targets share the columns of their common
+                prefixes. (Default=False)
+
+        Returns:
+            Dict[str, List[str]]:
+                A mapping from every distinct target to the list of words
+                'fuzzy_search' returns for it.
+
+        Raises:
+            TypeError:
+                Invalid data type of input parameters 'targets',
+                'sort_by_distance', 'case_insensitive' or 'grouped'.
+            ValueError:
+                Invalid data type and range of input parameters 'threshold'
+                or 'num_return', or unknown 'engine'.
+
+        Example:
+            >>> trie = FuzzyTrie()
+            >>> results = trie.fuzzy_search_many(['helo', 'wrld'], 1, grouped=True)
+            >>> results['helo']
+        """
+        if isinstance(targets, (str, *BYTES_TYPES)):
+            raise TypeError("The input parameter 'targets' must be an iterable of strings.")
+
+        targets = list(dict.fromkeys(
+            self._key(target, 'target', empty=True, lower=False) for target in targets
+        ))
+
+        if not isinstance(sort_by_distance, bool):
+            raise TypeError("The input parameter 'sort_by_distance' must be a boolean.")
+
+        if not isinstance(threshold, int) or threshold < 0:
+            raise ValueError(
+                "The input parameter 'threshold' must be a non-negative integer"
+            )
+
+        if num_return is not None and (not isinstance(num_return, int) or num_return < 1):
+            raise ValueError(
+                "The input parameter 'num_return' must be a positive integer"
+            )
+
+        if not isinstance(case_insensitive, bool):
+            raise TypeError("The input parameter 'case_insensitive' must be a boolean.")
+
+        if not isinstance(grouped, bool):
+            raise TypeError("The input parameter 'grouped' must be a boolean.")
+
+        # Targets equal up to case share their results
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for target in targets:
+            key = tuple(c.lower() for c in target) if case_insensitive else tuple(target)
+            groups.setdefault(key, []).append(target)
+        keys = list(groups)
+
+        # A depth-first search stops collecting the words of a target
+        # after num_return words unless they are sorted afterwards
+        limit = None if sort_by_distance else num_return
+
+        index = self._index
+        if index is not None and threshold <= index.max_distance:
+            matches = [
+                self._index_search(
+                    make_matcher(groups[key][0], threshold, case_insensitive, engine)
+                )
+                for key in keys
+            ]
+        elif grouped:
+            matches = self._search_grouped(keys, threshold, case_insensitive, limit)
+        else:
+            matchers = [
+                make_matcher(groups[key][0], threshold, case_insensitive, engine)
+                for key in keys
+            ]
+            matches = self._search_rows(matchers, limit)
+
+        # The words of equal distance are kept in depth-first order, as
+        # 'fuzzy_search' keeps them
+        res = {}
+        for key, pairs in zip(keys, matches):
+            words = self._select(pairs, num_return, sort_by_distance)
+            for target in groups[key]:
+                res[self._word(target)] = list(self._words(words))
+        return res
+
+    def _search_rows(
+        self,
+        matchers: list,
+        limit: Optional[int]
+    ) -> List[List[Tuple[str, int]]]:
+        """Return the (word, distance) pairs of every matcher in depth-first
+        order, carrying the rows of the live matchers at every node."""
+        edges = self._edges
+        is_word = self._is_word
+        res = [[] for _ in matchers]
+        remaining = len(matchers)
+        if not remaining:
+            return res
+
+        first_rows = [(i, matcher.initial()) for i, matcher in enumerate(matchers)]
+        buffer = []
+        stack = [
+            (child, 0, label, first_rows)
+            for label, child in reversed(edges(self._root))
+        ]
+
+        while stack and remaining:
+            node, depth, label, rows = stack.pop()
+
+            # Advance the row of every target along the edge and drop
+            # the targets which cannot reach a word below the node
+            alive_rows = []
+            for i, row in rows:
+                matcher = matchers[i]
+                if limit is not None and len(res[i]) == limit:
+                    continue
+                for char in label:
+                    row = matcher.step(row, char)
+                    if not matcher.alive(row):
+                        break
+                else:
+                    alive_rows.append((i, row))
+
+            if not alive_rows:
+                continue
+
+            del buffer[depth:]
+            buffer.append(label)
+
+            if is_word(node):
+                curr_str = ''.join(buffer)
+                for i, row in alive_rows:
+                    dist = matchers[i].distance(row)
+                    if dist <= matchers[i].threshold:
+                        res[i].append((curr_str, dist))
+                        if limit is not None and len(res[i]) == limit:
+                            remaining -= 1
+
+            depth += 1
+            for label, child in reversed(edges(node)):
+                stack.append((child, depth, label, alive_rows))
+
+        return res
+
+    def _search_grouped(
+        self,
+        keys: List[Tuple[str, ...]],
+        threshold: int,
+        case_insensitive: bool,
+        limit: Optional[int]
+    ) -> List[List[Tuple[str, int]]]:
+        """Return the (word, distance) pairs of every target in depth-first
+        order, sharing the columns of the prefixes of the targets.
+
+        The targets are inserted into a trie of targets, whose nodes are the
+        columns of the edit distance matrix. The row of a node of the trie only
+        keeps the columns within the threshold, since a larger value never
+        leads to a value within the threshold again.
+        """
+        # Build the trie of the targets with the children of every node
+        # and the index of the target ending at the node
+        t_children: List[Dict[str, int]] = [{}]
+        t_target: List[Optional[int]] = [None]
+        for i, key in enumerate(keys):
+            q = 0
+            for char in key:
+                child = t_children[q].get(char)
+                if child is None:
+                    child = t_children[q][char] = len(t_children)
+                    t_children.append({})
+                    t_target.append(None)
+                q = child
+            t_target[q] = i
+
+        def propagate(row: Dict[int, int]) -> Dict[int, int]:
+            # Insert the characters of the targets in ascending order of distance
+            buckets = [[] for _ in range(threshold)]
+            for q, value in row.items():
+                if value < threshold:
+                    buckets[value].append(q)
+            for value, columns in enumerate(buckets):
+                for q in columns:
+                    if row[q] != value:
+                        continue
+                    for child in t_children[q].values():
+                        if value + 1 < row.get(child, threshold + 1):
+                            row[child] = value + 1
+                            if value + 1 < threshold:
+                                buckets[value + 1].append(child)
+            return row
+
+        def step(row: Dict[int, int], char: str) -> Dict[int, int]:
+            if case_insensitive:
+                char = char.lower()
+            new_row = {}
+            for q, value in row.items():
+                # Delete the character of the word
+                if value < threshold and value + 1 < new_row.get(q, threshold + 1):
+                    new_row[q] = value + 1
+                # Match or substitute the character of a target
+                for t_char, child in t_children[q].items():
+                    cost = value + (t_char != char)
+                    if cost < new_row.get(child, threshold + 1):
+                        new_row[child] = cost
+            return propagate(new_row)
+
+        edges = self._edges
+        is_word = self._is_word
+        res = [[] for _ in keys]
+        remaining = len(keys)
+        if not remaining:
+            return res
+
+        first_row = propagate({0: 0})
+        buffer = []
+        stack = [
+            (child, 0, label, first_row)
+            for label, child in reversed(edges(self._root))
+        ]
+
+        while stack and remaining:
+            node, depth, label, row = stack.pop()
+            for char in label:
+                row = step(row, char)
+                if not row:
+                    break
+            else:
+                del buffer[depth:]
+                buffer.append(label)
+
+                if is_word(node):
+                    curr_str = ''.join(buffer)
+                    for q, value in row.items():
+                        i = t_target[q]
+                        if i is None or (limit is not None and len(res[i]) == limit):
+                            continue
+                        res[i].append((curr_str, value))
+                        if limit is not None and len(res[i]) == limit:
+                            remaining -= 1
+
+                depth += 1
+                for label, child in reversed(edges(node)):
+                    stack.append((child, depth, label, row))
+
+        return res
+
+    def fuzzy_session(
+        self,
+        threshold: int,
+        case_insensitive: bool = False
+    ) -> FuzzySession:
+        """Start an incremental fuzzy search of a target typed one character
+        at a time, e.g. in a search box.
+
+        The session keeps the positions of the trie within the threshold of the
+        target between keystrokes, so appending a character only extends them
+        by one column of the edit distance matrix instead of searching the trie
+        from the root again. The session follows the modifications of the trie.
+
+        Args:
+            threshold (int):
+                The maximum Levenshtein distance difference.
+            case_insensitive (bool):
+                Whether difference in case counts toward the LD difference.
+                (Default=False)
+
+        Returns:
+            FuzzySession: A session with an empty target.
+
+        Raises:
+            TypeError: Invalid data type of input parameter 'case_insensitive'.
+            ValueError: Invalid data type and range of input parameter 'threshold'.
+
+        Example:
+            >>> trie = FuzzyTrie()
+            >>> session = trie.fuzzy_session(threshold=1)
+            >>> session.append('h')
+            >>> session.append('e')
+            >>> suggestions = session.results(num_return=5)
+            >>> session.backspace()
+        """
+        return FuzzySession(self, threshold, case_insensitive)
+
+    def _best_first(
+        self,
+        matcher,
+        k: int,
+        stats: Optional[SearchStats] = None
+    ) -> Tuple[List[Tuple[str, int]], bool]:
+        """Return the k nearest (word, distance) pairs within the threshold of the
+        matcher in ascending order of distance, and whether any branch was pruned
+        by the threshold if fewer than k words are found."""
+        res = []
+        if stats is None:
+            search = self._iter_best_first(matcher)
+        else:
+            stats.strategy = 'best_first'
+            search = stats.visits(self._iter_best_first(matcher, checkpoints=True))
+        while len(res) < k:
+            try:
+                res.append(next(search))
+            except StopIteration as stop:
+                return res, stop.value
+        return res, True
+
+    def _iter_best_first(
+        self,
+        matcher,
+        checkpoints: bool = False
+    ) -> Generator[Optional[Tuple[str, int]], None, bool]:
+        """Yield the (word, distance) pairs within the threshold of the matcher
+        in ascending order of distance, and return whether any branch was pruned
+        by the threshold. With 'checkpoints' set, None is yielded before
+        visiting every node."""
+        threshold = matcher.threshold
+        step = matcher.step
+        alive = matcher.alive
+        row_min = matcher.row_min
+        edges = self._edges
+        is_word = self._is_word
+        pruned = False
+
+        # A heap entry is either a node keyed by the minimum value of its row,
+        # which bounds the distance of every word below the node, or a word
+        # keyed by its distance. Entries of equal keys are ordered by their
+        # paths of edge indices, as in '_dfs_key', so the words of equal
+        # distance come in depth-first order, each before the nodes below it.
+        first_row = matcher.initial()
+        heap = [(row_min(first_row), (), 1, self._root, '', first_row)]
+
+        while heap:
+            key, path, is_node, node, curr_str, curr_row = heapq.heappop(heap)
+
+            # No unexplored branch can beat a word at the top of the heap
+            if not is_node:
+                yield curr_str, key
+                continue
+
+            if checkpoints:
+                yield None
+
+            if is_word(node):
+                dist = matcher.distance(curr_row)
+                if dist <= threshold:
+                    heapq.heappush(heap, (dist, path, 0, None, curr_str, None))
+                else:
+                    # A greater threshold would accept the word
+                    pruned = True
+
+            for i, (label, child) in enumerate(edges(node)):
+                # Advance the row along every character on the edge
+                child_row = curr_row
+                for char in label:
+                    child_row = step(child_row, char)
+                    if not alive(child_row):
+                        pruned = True
+                        break
+                else:
+                    heapq.heappush(heap, (
+                        row_min(child_row), path + (i,), 1,
+                        child, curr_str + label, child_row
+                    ))
+
+        return pruned
+
+    def _index_search(self, matcher) -> List[Tuple[str, int]]:
+        """Return the (word, distance) pairs within the threshold of the matcher
+        in depth-first order, verifying the candidates of the index."""
+        threshold = matcher.threshold
+        step = matcher.step
+        alive = matcher.alive
+        res = []
+
+        for word in self._index.candidates(matcher.target, threshold):
+            row = matcher.initial()
+            for char in word:
+                row = step(row, char)
+                if not alive(row):
+                    break
+            else:
+                dist = matcher.distance(row)
+                if dist <= threshold:
+                    res.append((word, dist))
+
+        res.sort(key=lambda pair: self._dfs_key(pair[0]))
+        return res
+
+    @staticmethod
+    def _select(
+        pairs: List[Tuple[str, int]],
+        num_return: Optional[int],
+        sort_by_distance: bool
+    ) -> List[str]:
+        """Return the first 'num_return' words of the (word, distance) pairs
+        in depth-first order, sorted by distance if 'sort_by_distance' is set.
+
+        The sort is stable, so the words of equal distance stay in depth-first
+        order, which is also the order of the best-first search. Every search
+        thus keeps the same words of equal distance.
+        """
+        if sort_by_distance:
+            pairs = sorted(pairs, key=itemgetter(1))
+        return [word for word, _ in pairs[:num_return]]
+
+    def _dfs_key(self, word: str) -> Tuple[int, ...]:
+        """Return the indices of the edges on the path of a stored word, which
+        order the words as the depth-first traversal visits them."""
+        key = []
+        node = self._root
+        j = 0
+        while j < len(word):
+            for i, (label, child) in enumerate(self._edges(node)):
+                if word.startswith(label, j):
+                    break
+            key.append(i)
+            node = child
+            j += len(label)
+        return tuple(key)
+
+    def _modified(self, word: str, inserted: bool) -> None:
+        """Update the index after the word is inserted or deleted."""
+        super()._modified(word, inserted)
+        if self._index is not None:
+            if inserted:
+                self._index.add(word)
+            else:
+                self._index.remove(word)
+
+    def _extend_sorted(self, words: Iterable[str]) -> None:
+        """Insert words in ascending order into an empty plain trie and index them."""
+        super()._extend_sorted(words)
+        if self._index is not None:
+            self._index.extend(self.iter_complete('', order='none'))
+
+    def _tracks_words(self) -> bool:
+        """Return True if the words inserted in bulk have to be passed one by
+        one to '_modified' or the journal."""
+        return self._index is not None or super()._tracks_words()
+
+    def _empty(self) -> FuzzyTrie:
+        """Return an empty trie of the class and the options of the trie."""
+        return type(self)(
+            lower_case=self._lower_case,
+            compressed=self._compressed,
+            index=None if self._index is None else 'symdelete',
+            max_distance=2 if self._index is None else self._index.max_distance,
+            copy_on_write=self._copy_on_write,
+            alphabet=self.alphabet
+        )
+
+    def _with_root(self, root: TrieNode) -> FuzzyTrie:
+        """Return a trie of the class and the options of the trie holding the
+        words below the root, and index them."""
+        trie = super()._with_root(root)
+        if trie._index is not None:
+            trie._index.extend(trie.iter_complete('', order='none'))
+        return trie
+
+    def _iter_fuzzy(
+        self,
+        matcher,
+        checkpoints: bool = False
+    ) -> Iterator[Optional[Tuple[str, int]]]:
+        """Yield the (word, distance) pairs within the threshold of the matcher
+        in depth-first order. With 'checkpoints' set, None is yielded before
+        visiting every node."""
+        threshold = matcher.threshold
+        step = matcher.step
+        distance = matcher.distance
+        alive = matcher.alive
+        edges = self._edges
+        is_word = self._is_word
+
+        # Every stack entry holds a node, its depth, the label of its edge
+        # and the row of its parent, so that the rows are only computed
+        # once the node is visited. The labels on the path of the visited
+        # node are kept in a shared buffer.
+        first_row = matcher.initial()
+        buffer = []
+        stack = [
+            (child, 0, label, first_row)
+            for label, child in reversed(edges(self._root))
+        ]
+
+        while stack:
+            node, depth, label, curr_row = stack.pop()
+            if checkpoints:
+                yield None
+
+            # Get the new row for every character on the edge using the
+            # edit distance algorithm. If the minimum value of the row has
+            # exceeded the threshold, no word below the node can be valid.
+            for char in label:
+                curr_row = step(curr_row, char)
+                if not alive(curr_row):
+                    break
+            else:
+                del buffer[depth:]
+                buffer.append(label)
+
+                # If the last value of the row is less than the threshold
+                # and it is a word stored in the trie, yield the word.
+                if is_word(node):
+                    dist = distance(curr_row)
+                    if dist <= threshold:
+                        yield ''.join(buffer), dist
+
+                depth += 1
+                for label, child in reversed(edges(node)):
+                    stack.append((child, depth, label, curr_row))
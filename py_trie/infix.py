@@ -0,0 +1,202 @@
+import time
+from typing import Dict, Iterable, Set, Union
+
+from .trie import Trie
+
+
+def contains(word: str, matcher) -> bool:
+    """Return True if a substring of the word is within the threshold of the
+    target of the matcher, by matching the target against the prefixes of
+    every suffix of the word."""
+    threshold = matcher.threshold
+    if not threshold:
+        return matcher.target in word
+
+    step = matcher.step
+    distance = matcher.distance
+    alive = matcher.alive
+    first_row = matcher.initial()
+    if distance(first_row) <= threshold:
+        return True
+
+    for i in range(len(word)):
+        row = first_row
+        for char in word[i:]:
+            row = step(row, char)
+            if distance(row) <= threshold:
+                return True
+            if not alive(row):
+                break
+    return False
+
+
+class InfixIndex:
+    """An index of the suffixes of the words, finding the words containing
+    a fragment anywhere rather than only at their start.
+
+    Every suffix of every word is stored in a compressed trie, and mapped to
+    the words ending with it. The words containing a fragment are the words
+    of the suffixes starting with the fragment, i.e. of the subtree of the
+    fragment in the suffix trie, so a search costs time proportional to the
+    length of the fragment and the number of its occurrences rather than to
+    the number of words. A fuzzy search descends the suffix trie with the
+    rows of a matcher and takes the whole subtree below the first position
+    within the threshold.
+
+    The index stores about as many suffixes as there are characters in the
+    words, so it takes several times the memory of the trie. The suffixes are
+    also kept as whole strings to map them to their words, so the memory of
+    a word grows with the square of its length, and the index is best suited
+    to short words such as names or tags rather than long texts.
+
+    Attributes:
+        num_words (int):
+            The number of indexed words.
+        num_entries (int):
+            The number of distinct suffixes.
+        build_time (float):
+            The total number of seconds spent indexing the words.
+
+    Methods:
+        add:
+            Index a word.
+        remove:
+            Remove a word from the index.
+        extend:
+            Index the words of an iterable.
+        search:
+            Return the words containing a fragment.
+        fuzzy_search:
+            Return the words containing a substring within the threshold
+            of a matcher.
+
+    To instantiate:
+        >>> index = InfixIndex()
+    """
+
+    def __init__(self) -> None:
+        """Construct an empty index."""
+        self._num_words: int = 0
+        self._build_time: float = 0.0
+        self._suffixes: Trie = Trie(compressed=True)
+
+        # Map a suffix to its only word, or to the set of its words
+        # to save the memory of a set for most of the suffixes
+        self._owners: Dict[str, Union[str, Set[str]]] = {}
+
+    def __len__(self) -> int:
+        """Enable the use of 'len' operator for retrieving the number of words."""
+        return self._num_words
+
+    @property
+    def num_words(self) -> int:
+        """Declare 'num_words' as a read-only attribute."""
+        return self._num_words
+
+    @property
+    def num_entries(self) -> int:
+        """Declare 'num_entries' as a read-only attribute."""
+        return len(self._owners)
+
+    @property
+    def build_time(self) -> float:
+        """Declare 'build_time' as a read-only attribute."""
+        return self._build_time
+
+    def add(self, word: str) -> None:
+        """Index a word which is not in the index yet."""
+        self.extend((word,))
+
+    def remove(self, word: str) -> None:
+        """Remove an indexed word from the index."""
+        owners = self._owners
+        for i in range(len(word)):
+            suffix = word[i:]
+            words = owners[suffix]
+            if isinstance(words, str):
+                del owners[suffix]
+                self._suffixes.delete(suffix)
+            else:
+                words.discard(word)
+                if len(words) == 1:
+                    owners[suffix] = words.pop()
+        self._num_words -= 1
+
+    def extend(self, words: Iterable[str]) -> None:
+        """Index the words of an iterable, none of which is in the index yet."""
+        start = time.perf_counter()
+        owners = self._owners
+        new_suffixes = []
+        for word in words:
+            for i in range(len(word)):
+                suffix = word[i:]
+                owned = owners.get(suffix)
+                if owned is None:
+                    owners[suffix] = word
+                    new_suffixes.append(suffix)
+                elif isinstance(owned, str):
+                    owners[suffix] = {owned, word}
+                else:
+                    owned.add(word)
+            self._num_words += 1
+
+        # Insert the new suffixes in one batch, in sorted order
+        self._suffixes.insert_many(new_suffixes)
+        self._build_time += time.perf_counter() - start
+
+    def search(self, fragment: str) -> Set[str]:
+        """Return the indexed words containing the fragment."""
+        trie = self._suffixes
+        node, rest = trie._locate(fragment)
+        if node is None:
+            return set()
+        return self._collect(trie._iter_subtree(node, fragment + rest, 'none', True))
+
+    def fuzzy_search(self, matcher) -> Set[str]:
+        """Return the indexed words containing a substring within the threshold
+        of the target of the matcher."""
+        trie = self._suffixes
+        threshold = matcher.threshold
+        step = matcher.step
+        distance = matcher.distance
+        alive = matcher.alive
+        edges = trie._edges
+
+        # The empty substring of every word is within the threshold
+        first_row = matcher.initial()
+        if distance(first_row) <= threshold:
+            return self._collect(self._owners)
+
+        res = set()
+        stack = [(trie.root, '', first_row)]
+        while stack:
+            node, word, row = stack.pop()
+            for label, child in edges(node):
+                child_row = row
+                for char in label:
+                    child_row = step(child_row, char)
+
+                    # Every suffix below the position has a prefix within the threshold
+                    if distance(child_row) <= threshold:
+                        res |= self._collect(
+                            trie._iter_subtree(child, word + label, 'none', True)
+                        )
+                        break
+                    if not alive(child_row):
+                        break
+                else:
+                    stack.append((child, word + label, child_row))
+
+        return res
+
+    def _collect(self, suffixes: Iterable[str]) -> Set[str]:
+        """Return the words ending with the suffixes."""
+        owners = self._owners
+        res = set()
+        for suffix in suffixes:
+            words = owners[suffix]
+            if isinstance(words, str):
+                res.add(words)
+            else:
+                res |= words
+        return res
@@ -0,0 +1,392 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+# A journal is a header holding the log sequence number (LSN) of the
+# snapshot it continues, followed by a record of every insertion and
+# deletion. A snapshot is a header holding the LSN of the last record it
+# contains and the number of its words, followed by an insertion record
+# of every word in ascending order. A record is a fixed-size little-endian
+# header followed by the word in UTF-8, and its checksum is the CRC-32 of
+# everything after the checksum, so a record torn by a crash is detected.
+JOURNAL_MAGIC = b'PYTRIEJ\x00'
+SNAPSHOT_MAGIC = b'PYTRIES\x00'
+VERSION = 1
+JOURNAL_HEADER = struct.Struct('<8sHHQ')
+SNAPSHOT_HEADER = struct.Struct('<8sHHQQ')
+RECORD = struct.Struct('<IQBdI')
+
+# The operations of the records, where an insertion without a weight keeps
+# the weight of a stored word
+OP_INSERT = 1
+OP_INSERT_WEIGHTED = 2
+OP_DELETE = 3
+
+
+def _encode(lsn: int, op: int, word: str, weight: Optional[float]) -> bytes:
+    """Return the record of an operation."""
+    data = word.encode('utf-8', 'surrogatepass')
+    record = RECORD.pack(0, lsn, op, weight or 0.0, len(data)) + data
+    return struct.pack('<I', zlib.crc32(record[4:])) + record[4:]
+
+
+def _read_records(f: BinaryIO) -> Iterator[Tuple[int, int, str, Optional[float], int]]:
+    """Yield the (lsn, op, word, weight, end offset) of the records from the
+    position of the file until the end or the first torn record."""
+    offset = f.tell()
+    while True:
+        header = f.read(RECORD.size)
+        if len(header) < RECORD.size:
+            return
+        checksum, lsn, op, weight, length = RECORD.unpack(header)
+        data = f.read(length)
+        if len(data) < length or zlib.crc32(data, zlib.crc32(header[4:])) != checksum:
+            return
+        offset += RECORD.size + length
+        yield (
+            lsn, op, data.decode('utf-8', 'surrogatepass'),
+            weight if op == OP_INSERT_WEIGHTED else None, offset
+        )
+
+
+def _fsync_directory(path: str) -> None:
+    """Persist the entries of the directory of the path after a rename."""
+    # The directories cannot be opened on Windows, where a rename is durable
+    if os.name != 'posix':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(path: str, entries: Iterable[Tuple[str, float]], lsn: int) -> int:
+    """Atomically replace the snapshot with the (word, weight) pairs in
+    ascending order of word and the LSN of the last record they contain.
+
+    The words are written into a temporary file, which replaces the snapshot
+    once synced, so a crash leaves either the old or the new snapshot.
+
+    Returns:
+        int: The number of words of the snapshot.
+    """
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, 0, lsn, 0))
+        for word, weight in entries:
+            op = OP_INSERT_WEIGHTED if weight else OP_INSERT
+            f.write(_encode(lsn, op, word, weight))
+            count += 1
+        f.seek(0)
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, 0, lsn, count))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path)
+    return count
+
+
+def read_snapshot(path: str) -> Tuple[int, Iterator[Tuple[str, float]]]:
+    """Return the LSN of a snapshot and an iterator streaming its (word,
+    weight) pairs in ascending order of word.
+
+    Raises:
+        FileNotFoundError: The snapshot does not exist.
+        ValueError: The file is not a valid snapshot, or it is truncated
+            or corrupted, raised once the iterator reaches the damage.
+    """
+    f = open(path, 'rb')
+    header = f.read(SNAPSHOT_HEADER.size)
+    if len(header) < SNAPSHOT_HEADER.size:
+        f.close()
+        raise ValueError(f"The file '{path}' is not a valid snapshot file.")
+
+    magic, version, _, lsn, count = SNAPSHOT_HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or version != VERSION:
+        f.close()
+        raise ValueError(f"The file '{path}' is not a valid snapshot file.")
+
+    def entries() -> Iterator[Tuple[str, float]]:
+        with f:
+            n = 0
+            for _, _, word, weight, _ in _read_records(f):
+                yield word, weight or 0
+                n += 1
+            if n != count or f.read(1):
+                raise ValueError(f"The snapshot '{path}' is truncated or corrupted.")
+
+    return lsn, entries()
+
+
+class Journal:
+    """An append-only log of the insertions and deletions of a trie, which
+    are synced to the disk in batches and folded into a snapshot by the
+    compactions.
+
+    Every record holds a log sequence number (LSN) one greater than the
+    previous record. The snapshot holds the LSN of the last record it
+    contains, so a recovery loads the snapshot and only replays the records
+    of the journal after it. A record torn by a crash ends the journal and is
+    truncated on opening.
+
+    Attributes:
+        path (str):
+            The path of the journal file.
+        snapshot (str):
+            The path of the snapshot file written by the compactions.
+        lsn (int):
+            The LSN of the last record, or of the snapshot the journal
+            continues if it has no record.
+        base_lsn (int):
+            The LSN of the snapshot the journal continues.
+        sync_every (int):
+            The number of records after which the journal is synced.
+        sync_interval (float):
+            The number of seconds after which a record syncs the journal, or
+            None to only sync every 'sync_every' records.
+        num_pending (int):
+            The number of records not yet synced to the disk.
+
+    Methods:
+        append:
+            Append the record of an insertion or a deletion.
+        sync:
+            Write the pending records to the disk.
+        replay:
+            Yield the records after an LSN.
+        compact:
+            Fold the records into the snapshot in the background.
+        truncate:
+            Drop the records up to an LSN.
+        close:
+            Wait for the compaction, sync and close the journal.
+
+    To instantiate:
+        >>> journal = trie.enable_journal('words.snapshot', 'words.journal')
+    """
+
+    def __init__(
+        self,
+        path: str,
+        snapshot: str,
+        sync_every: int = 128,
+        sync_interval: Optional[float] = 1.0,
+        lsn: int = 0
+    ) -> None:
+        """Open the journal, or create it continuing the snapshot of the LSN,
+        and truncate a record torn by a crash."""
+        if not isinstance(path, str) or not isinstance(snapshot, str):
+            raise TypeError("The input parameters 'path' and 'snapshot' must be strings.")
+
+        if not isinstance(sync_every, int) or sync_every < 1:
+            raise ValueError("The input parameter 'sync_every' must be a positive integer")
+
+        if sync_interval is not None and (
+            not isinstance(sync_interval, (int, float)) or isinstance(sync_interval, bool) or
+            not sync_interval >= 0
+        ):
+            raise ValueError("The input parameter 'sync_interval' must be a non-negative number")
+
+        self._path: str = path
+        self._snapshot: str = snapshot
+        self._sync_every: int = sync_every
+        self._sync_interval: Optional[float] = sync_interval
+        self._num_pending: int = 0
+        self._last_sync: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._base_lsn = lsn
+        self._lsn = lsn
+        end = 0
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f:
+                header = f.read(JOURNAL_HEADER.size)
+                if len(header) < JOURNAL_HEADER.size:
+                    raise ValueError(f"The file '{path}' is not a valid journal file.")
+                magic, version, _, base_lsn = JOURNAL_HEADER.unpack(header)
+                if magic != JOURNAL_MAGIC or version != VERSION:
+                    raise ValueError(f"The file '{path}' is not a valid journal file.")
+
+                end = JOURNAL_HEADER.size
+                self._base_lsn = self._lsn = base_lsn
+                for record_lsn, _, _, _, end in _read_records(f):
+                    self._lsn = record_lsn
+
+        if end <= JOURNAL_HEADER.size and self._base_lsn <= lsn:
+            # Start an empty journal after the snapshot
+            self._base_lsn = self._lsn = lsn
+            self._rewrite(lsn, [])
+        elif os.path.getsize(path) > end:
+            # Drop the torn record written during a crash
+            os.truncate(path, end)
+        self._file: BinaryIO = open(path, 'ab')
+
+    def __enter__(self) -> 'Journal':
+        """Enable the use of the journal as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the journal on leaving the context."""
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """Declare 'path' as a read-only attribute."""
+        return self._path
+
+    @property
+    def snapshot(self) -> str:
+        """Declare 'snapshot' as a read-only attribute."""
+        return self._snapshot
+
+    @property
+    def lsn(self) -> int:
+        """Declare 'lsn' as a read-only attribute."""
+        return self._lsn
+
+    @property
+    def base_lsn(self) -> int:
+        """Declare 'base_lsn' as a read-only attribute."""
+        return self._base_lsn
+
+    @property
+    def sync_every(self) -> int:
+        """Declare 'sync_every' as a read-only attribute."""
+        return self._sync_every
+
+    @property
+    def sync_interval(self) -> Optional[float]:
+        """Declare 'sync_interval' as a read-only attribute."""
+        return self._sync_interval
+
+    @property
+    def num_pending(self) -> int:
+        """Declare 'num_pending' as a read-only attribute."""
+        return self._num_pending
+
+    def append(self, word: str, inserted: bool, weight: Optional[float] = None) -> int:
+        """Append the record of an insertion or a deletion of the word and
+        return its LSN, syncing the journal if the batch is full or the last
+        sync is older than 'sync_interval'."""
+        if not inserted:
+            op = OP_DELETE
+        else:
+            op = OP_INSERT if weight is None else OP_INSERT_WEIGHTED
+
+        with self._lock:
+            lsn = self._lsn + 1
+            self._file.write(_encode(lsn, op, word, weight))
+            self._lsn = lsn
+            self._num_pending += 1
+            if self._num_pending >= self._sync_every or (
+                self._sync_interval is not None and
+                time.monotonic() - self._last_sync >= self._sync_interval
+            ):
+                self._sync()
+        return lsn
+
+    def sync(self) -> None:
+        """Write the pending records to the disk."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        """Flush and fsync the journal while holding the lock."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._num_pending = 0
+        self._last_sync = time.monotonic()
+
+    def replay(self, after: int = 0) -> Iterator[Tuple[int, int, str, Optional[float]]]:
+        """Stream the (lsn, op, word, weight) of the records after the LSN,
+        where the weight of an insertion keeping the weight is None."""
+        with self._lock:
+            self._file.flush()
+
+        with open(self._path, 'rb') as f:
+            f.seek(JOURNAL_HEADER.size)
+            for lsn, op, word, weight, _ in _read_records(f):
+                if lsn > after:
+                    yield lsn, op, word, weight
+
+    def compact(self, entries: Iterable[Tuple[str, float]], lsn: int) -> Future:
+        """Write the (word, weight) pairs of the trie at the LSN into the snapshot
+        and drop the records up to the LSN, in a background thread.
+
+        The compactions of the journal run one at a time in the order of
+        their calls, while the records keep being appended.
+
+        Returns:
+            Future: The future of the number of words of the snapshot.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='py_trie-compact')
+
+        def run() -> int:
+            count = write_snapshot(self._snapshot, entries, lsn)
+            self.truncate(lsn)
+            return count
+
+        return self._executor.submit(run)
+
+    def truncate(self, lsn: int) -> None:
+        """Drop the records up to the LSN, which the snapshot contains, by
+        atomically replacing the journal with its later records.
+
+        The records synced so far are copied without blocking the appends,
+        which are only blocked while copying the records appended meanwhile.
+        """
+        with self._lock:
+            self._sync()
+            end = self._file.tell()
+        records = self._records_after(lsn, JOURNAL_HEADER.size, end)
+
+        with self._lock:
+            self._sync()
+            records += self._records_after(lsn, end)
+            self._file.close()
+            self._rewrite(lsn, records)
+            self._file = open(self._path, 'ab')
+            self._base_lsn = lsn
+            self._lsn = max(self._lsn, lsn)
+
+    def _records_after(self, lsn: int, start: int, stop: Optional[int] = None) -> List[bytes]:
+        """Return the records after the LSN between the offsets of the journal."""
+        records = []
+        with open(self._path, 'rb') as f:
+            f.seek(start)
+            for record_lsn, op, word, weight, end in _read_records(f):
+                if stop is not None and end > stop:
+                    break
+                if record_lsn > lsn:
+                    records.append(_encode(record_lsn, op, word, weight))
+        return records
+
+    def _rewrite(self, base_lsn: int, records: Iterable[bytes]) -> None:
+        """Atomically replace the journal with a journal of the records."""
+        tmp_path = self._path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, 0, base_lsn))
+            for record in records:
+                f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+        _fsync_directory(self._path)
+
+    def close(self) -> None:
+        """Wait for the running compaction, then sync and close the journal."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
@@ -0,0 +1,210 @@
+from typing import Dict, List, Tuple
+
+
+class RowMatcher:
+    """Compute the Levenshtein distance one row of the DP matrix at a time.
+
+    Every character appended to the candidate word produces a new row of
+    len(target) + 1 cells, where the last cell is the distance between the
+    candidate and the target and the minimum cell is a lower bound for the
+    distance of every word sharing the candidate as a prefix.
+
+    Attributes:
+        target (str):
+            The target word of the search.
+        threshold (int):
+            The maximum Levenshtein distance of interest.
+        case_insensitive (bool):
+            Whether difference in case counts toward the distance.
+            (Default=False)
+    """
+
+    __slots__ = ('target', 'threshold', 'case_insensitive', '_letters')
+
+    def __init__(
+        self,
+        target: str,
+        threshold: int,
+        case_insensitive: bool = False
+    ) -> None:
+        """Fold the case of the target once for the whole query."""
+        self.target: str = target
+        self.threshold: int = threshold
+        self.case_insensitive: bool = case_insensitive
+        self._letters: List[str] = [
+            c.lower() if case_insensitive else c for c in target
+        ]
+
+    def initial(self) -> List[int]:
+        """Return the first row of the matrix, i.e. the row of the empty word."""
+        return list(range(len(self._letters) + 1))
+
+    def step(self, row: List[int], letter: str) -> List[int]:
+        """Return the row obtained by appending 'letter' to the candidate."""
+        if self.case_insensitive:
+            letter = letter.lower()
+
+        # Create the first value of the new row
+        curr_row = [row[0] + 1]
+        left = row[0] + 1
+
+        for col, char in enumerate(self._letters, 1):
+            # Take the value of the top left grid if the letters match,
+            # otherwise the minimum cost of the 3 surrounding grids plus 1
+            if char == letter:
+                left = row[col - 1]
+            else:
+                left = min(row[col - 1], left, row[col]) + 1
+            curr_row.append(left)
+
+        return curr_row
+
+    def distance(self, row: List[int]) -> int:
+        """Return the distance between the candidate and the target."""
+        return row[-1]
+
+    def row_min(self, row: List[int]) -> int:
+        """Return the minimum value of the row."""
+        return min(row)
+
+    def alive(self, row: List[int]) -> bool:
+        """Return True if a word extending the candidate may be within the threshold."""
+        return min(row) <= self.threshold
+
+
+class BitParallelMatcher:
+    """Simulate the Levenshtein automaton of the target with bitvectors.
+
+    The automaton state after reading a candidate is stored as threshold + 1
+    bitvectors, where bit j of the d-th bitvector is set if the candidate is
+    within distance d of the first j letters of the target (the bit-parallel
+    NFA simulation of Wu and Manber). A new state costs O(threshold) integer
+    operations instead of len(target) interpreted steps, and the pruning test
+    is a single comparison.
+
+    The state of a candidate is the tuple (depth, R_0, ..., R_threshold),
+    where the distances are only exact up to the threshold.
+
+    Attributes:
+        target (str):
+            The target word of the search.
+        threshold (int):
+            The maximum Levenshtein distance of interest.
+        case_insensitive (bool):
+            Whether difference in case counts toward the distance.
+            (Default=False)
+    """
+
+    __slots__ = (
+        'target', 'threshold', 'case_insensitive', '_peq', '_mask', '_high', '_levels'
+    )
+
+    def __init__(
+        self,
+        target: str,
+        threshold: int,
+        case_insensitive: bool = False
+    ) -> None:
+        """Build the match bitmask of every letter of the target."""
+        self.target: str = target
+        self.threshold: int = threshold
+        self.case_insensitive: bool = case_insensitive
+        self._mask: int = (1 << (len(target) + 1)) - 1
+        self._high: int = 1 << len(target)
+        self._levels: range = range(1, threshold + 1)
+
+        # Bit j of peq[c] is set if the j-th letter of the target is c
+        self._peq: Dict[str, int] = {}
+        for j, char in enumerate(target, 1):
+            if case_insensitive:
+                char = char.lower()
+            self._peq[char] = self._peq.get(char, 0) | (1 << j)
+
+    def initial(self) -> Tuple[int, ...]:
+        """Return the state of the empty word."""
+        # The empty word is within distance d of the first d letters
+        return (0,) + tuple(
+            ((1 << (d + 1)) - 1) & self._mask for d in range(self.threshold + 1)
+        )
+
+    def step(self, state: Tuple[int, ...], letter: str) -> Tuple[int, ...]:
+        """Return the state obtained by appending 'letter' to the candidate."""
+        if self.case_insensitive:
+            letter = letter.lower()
+        eq = self._peq.get(letter, 0)
+        mask = self._mask
+        depth = state[0] + 1
+
+        # Only a match keeps the candidate within distance 0
+        prev = state[1]
+        curr = (prev << 1) & eq
+        new_state = [depth, curr]
+
+        for d in self._levels:
+            old = state[d + 1]
+            # Match, substitution, deletion, insertion and the first column
+            curr = (
+                ((old << 1) & eq) | prev | ((prev | curr) << 1) | (depth <= d)
+            ) & mask
+            new_state.append(curr)
+            prev = old
+
+        return tuple(new_state)
+
+    def distance(self, state: Tuple[int, ...]) -> int:
+        """Return the distance between the candidate and the target,
+        capped at threshold + 1."""
+        high = self._high
+        for d in range(1, len(state)):
+            if state[d] & high:
+                return d - 1
+        return self.threshold + 1
+
+    def row_min(self, state: Tuple[int, ...]) -> int:
+        """Return the minimum value of the row, capped at threshold + 1."""
+        for d in range(1, len(state)):
+            if state[d]:
+                return d - 1
+        return self.threshold + 1
+
+    def alive(self, state: Tuple[int, ...]) -> bool:
+        """Return True if a word extending the candidate may be within the threshold."""
+        return state[-1] != 0
+
+
+ENGINES = {
+    'row': RowMatcher,
+    'bitparallel': BitParallelMatcher,
+}
+
+
+def make_matcher(
+    target: str,
+    threshold: int,
+    case_insensitive: bool = False,
+    engine: str = 'row'
+):
+    """Create the matcher of a fuzzy search engine.
+
+    Args:
+        target (str):
+            The target word.
+        threshold (int):
+            The maximum Levenshtein distance difference.
+        case_insensitive (bool):
+            Whether difference in case counts toward the LD difference.
+            (Default=False)
+        engine (str):
+            The name of the engine, either 'row' or 'bitparallel'. (Default='row')
+
+    Returns:
+        RowMatcher | BitParallelMatcher: The matcher of the selected engine.
+
+    Raises:
+        ValueError: Unknown name of the engine.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"The input parameter 'engine' must be one of {sorted(ENGINES)}."
+        )
+    return ENGINES[engine](target, threshold, case_insensitive)
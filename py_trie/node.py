@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class TrieNode:
     """An individual trie node.
     
@@ -7,11 +10,69 @@ class TrieNode:
         end_of_word (bool): 
             A boolean value indicating whether the current character 
             is the end of the word.
+        weight (int | float):
+            The non-negative score of the word ending at the node.
+        max_weight (int | float):
+            The maximum weight of the words in the subtree of the node.
+        count (int):
+            The number of words in the subtree of the node, including
+            the word ending at the node.
     """
     
-    __slots__ = ('children', 'end_of_word')
+    __slots__ = ('children', 'end_of_word', 'weight', 'max_weight', 'count')
     
     def __init__(self) -> None:
-        """Consturct the children and end_of_word attributes."""
+        """Consturct the children, end_of_word, weight and count attributes."""
         self.children: dict = {}
-        self.end_of_word: bool = False
\ No newline at end of file
+        self.end_of_word: bool = False
+        self.weight: float = 0
+        self.max_weight: float = 0
+        self.count: int = 0
+
+    def copy(self) -> TrieNode:
+        """Return a copy of the node with its own children dictionary,
+        which still holds the children of the node."""
+        cls = type(self)
+        node = cls.__new__(cls)
+        node.children = dict(self.children)
+        node.end_of_word = self.end_of_word
+        node.weight = self.weight
+        node.max_weight = self.max_weight
+        node.count = self.count
+        return node
+
+
+class RadixNode(TrieNode):
+    """An individual node of a path-compressed (radix) trie.
+
+    Attributes:
+        label (str):
+            The characters on the edge from the parent to the node.
+        children (dict):
+            A dictionary mapping the first character of the label
+            of each child to its RadixNode object.
+        end_of_word (bool):
+            A boolean value indicating whether the last character
+            of the label is the end of the word.
+        weight (int | float):
+            The non-negative score of the word ending at the node.
+        max_weight (int | float):
+            The maximum weight of the words in the subtree of the node.
+        count (int):
+            The number of words in the subtree of the node, including
+            the word ending at the node.
+    """
+
+    __slots__ = ('label',)
+
+    def __init__(self, label: str = '') -> None:
+        """Construct the label, children, end_of_word and weight attributes."""
+        super().__init__()
+        self.label: str = label
+
+    def copy(self) -> RadixNode:
+        """Return a copy of the node with its own children dictionary,
+        which still holds the children of the node."""
+        node = super().copy()
+        node.label = self.label
+        return node
@@ -0,0 +1,260 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .fuzzy_trie import FuzzyTrie
+    from .node import TrieNode
+
+
+class FuzzySession:
+    """An incremental fuzzy search following a target typed one character
+    at a time, e.g. in a search box.
+
+    Instead of the rows of the dynamic programming matrix of every node, the
+    session keeps the active positions of the trie, i.e. the positions whose
+    word is within the threshold of the current target, with their distances.
+    Appending a character to the target adds one column to the matrix, which
+    only depends on the active positions of the previous target, so every
+    keystroke costs time proportional to the active frontier rather than to
+    the part of the trie searched from the root. The active positions of the
+    previous targets are kept, so a backspace costs O(1).
+
+    A position is a node together with the number of characters of its label
+    read so far, so the session works on compressed tries as well. As the
+    nodes of a frozen trie are shared by different words, the positions are
+    identified by their words.
+
+    Attributes:
+        target (str):
+            The current target.
+        threshold (int):
+            The maximum Levenshtein distance difference.
+        case_insensitive (bool):
+            Whether difference in case counts toward the LD difference.
+        frontier_size (int):
+            The number of active positions of the current target.
+
+    Methods:
+        append:
+            Append characters to the target.
+        backspace:
+            Remove the last characters of the target.
+        results:
+            Return the words within the threshold of the current target.
+
+    To instantiate:
+        >>> session = trie.fuzzy_session(threshold=1)
+    """
+
+    def __init__(
+        self,
+        trie: FuzzyTrie,
+        threshold: int,
+        case_insensitive: bool = False
+    ) -> None:
+        """Activate the positions within the threshold of the empty target."""
+        if not isinstance(threshold, int) or threshold < 0:
+            raise ValueError(
+                "The input parameter 'threshold' must be a non-negative integer"
+            )
+
+        if not isinstance(case_insensitive, bool):
+            raise TypeError("The input parameter 'case_insensitive' must be a boolean.")
+
+        self._trie: FuzzyTrie = trie
+        self._threshold: int = threshold
+        self._case_insensitive: bool = case_insensitive
+        self._target: List[str] = []
+        self._history: List[Dict[str, tuple]] = []
+        self._reset()
+
+    @property
+    def target(self) -> str:
+        """Declare 'target' as a read-only attribute."""
+        return self._trie._word(''.join(self._target))
+
+    @property
+    def threshold(self) -> int:
+        """Declare 'threshold' as a read-only attribute."""
+        return self._threshold
+
+    @property
+    def case_insensitive(self) -> bool:
+        """Declare 'case_insensitive' as a read-only attribute."""
+        return self._case_insensitive
+
+    @property
+    def frontier_size(self) -> int:
+        """Declare 'frontier_size' as a read-only attribute."""
+        self._sync()
+        return len(self._history[-1])
+
+    def append(self, chars: str) -> None:
+        """Append the characters to the target one column at a time.
+
+        Args:
+            chars (str): The typed characters.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty input of 'chars'.
+
+        Example:
+            >>> session.append('h')
+        """
+        chars = self._trie._key(chars, 'chars', lower=False)
+
+        self._sync()
+        for char in chars:
+            self._history.append(self._step(self._history[-1], char))
+            self._target.append(char)
+
+    def backspace(self, num_chars: int = 1) -> None:
+        """Remove the last characters of the target, restoring the active
+        positions of the shorter target. Removing more characters than the
+        target holds leaves an empty target.
+
+        Args:
+            num_chars (int): The number of removed characters. (Default=1)
+
+        Raises:
+            ValueError: Invalid data type and range of input parameter 'num_chars'.
+
+        Example:
+            >>> session.backspace()
+        """
+        if not isinstance(num_chars, int) or num_chars < 1:
+            raise ValueError("The input parameter 'num_chars' must be a positive integer")
+
+        self._sync()
+        for _ in range(min(num_chars, len(self._target))):
+            self._history.pop()
+            self._target.pop()
+
+    def results(
+        self,
+        num_return: Optional[int] = None,
+        sort_by_distance: bool = False
+    ) -> List[str]:
+        """Return the words within the threshold of the current target in the
+        same order as 'fuzzy_search'.
+
+        Args:
+            num_return (int): The maximum number of return words. (Default=None)
+            sort_by_distance (bool): Return the words in ascending order of
+                LD difference, where the words of equal distance stay in
+                depth-first order. (Default=False)
+
+        Returns:
+            List[str]: A list of words within the threshold in the trie.
+
+        Raises:
+            TypeError: Invalid data type of input parameter 'sort_by_distance'.
+            ValueError: Invalid data type and range of input parameter 'num_return'.
+
+        Example:
+            >>> suggestions = session.results(num_return=5, sort_by_distance=True)
+        """
+        if not isinstance(sort_by_distance, bool):
+            raise TypeError("The input parameter 'sort_by_distance' must be a boolean.")
+
+        if num_return is not None and (not isinstance(num_return, int) or num_return < 1):
+            raise ValueError("The input parameter 'num_return' must be a positive integer")
+
+        self._sync()
+        is_word = self._trie._is_word
+        res = [
+            (word, dist)
+            for dist, node, label, j, word in self._history[-1].values()
+            if j == len(label) and is_word(node)
+        ]
+
+        # Keep the words of equal distance in depth-first order, as
+        # 'fuzzy_search' keeps them
+        trie = self._trie
+        dfs_key = trie._dfs_key
+        res.sort(key=lambda pair: dfs_key(pair[0]))
+        return trie._words(trie._select(res, num_return, sort_by_distance))
+
+    def _reset(self) -> None:
+        """Recompute the active positions of every prefix of the target."""
+        self._generation = self._trie._generation
+        root = self._trie._root
+        active: Dict[str, tuple] = {'': (0, root, '', 0, '')}
+        self._history = [self._propagate(active)]
+        for char in self._target:
+            self._history.append(self._step(self._history[-1], char))
+
+    def _sync(self) -> None:
+        """Recompute the active positions if the trie was modified."""
+        if self._generation != self._trie._generation:
+            self._reset()
+
+    def _children(
+        self,
+        node: Union[TrieNode, int],
+        label: str,
+        j: int,
+        word: str
+    ) -> Iterator[Tuple[str, tuple]]:
+        """Yield the next character and position of every position one
+        character below the position."""
+        # Read the next character of the label of a compressed trie
+        if j < len(label):
+            char = label[j]
+            yield char, (node, label, j + 1, word + char)
+            return
+
+        for child_label, child in self._trie._edges(node):
+            char = child_label[0]
+            yield char, (child, child_label, 1, word + char)
+
+    def _step(self, active: Dict[str, tuple], char: str) -> Dict[str, tuple]:
+        """Return the active positions after appending the character to the target."""
+        threshold = self._threshold
+        if self._case_insensitive:
+            char = char.lower()
+        res = {}
+
+        for dist, node, label, j, word in active.values():
+            # Skip the appended character
+            if dist < threshold:
+                self._relax(res, (node, label, j, word), dist + 1)
+
+            # Match or substitute the appended character
+            for child_char, position in self._children(node, label, j, word):
+                if self._case_insensitive:
+                    child_char = child_char.lower()
+                cost = dist + (child_char != char)
+                if cost <= threshold:
+                    self._relax(res, position, cost)
+
+        return self._propagate(res)
+
+    def _propagate(self, active: Dict[str, tuple]) -> Dict[str, tuple]:
+        """Extend the active positions by the characters of the trie skipped by
+        the target, visiting the positions in ascending order of distance."""
+        buckets = [[] for _ in range(self._threshold)]
+        for key, (dist, *_) in active.items():
+            if dist < self._threshold:
+                buckets[dist].append(key)
+
+        for dist, keys in enumerate(buckets):
+            for key in keys:
+                entry = active[key]
+                # Skip a position whose distance was lowered afterwards
+                if entry[0] != dist:
+                    continue
+                for _, position in self._children(*entry[1:]):
+                    if self._relax(active, position, dist + 1) and dist + 1 < self._threshold:
+                        buckets[dist + 1].append(position[3])
+
+        return active
+
+    @staticmethod
+    def _relax(active: Dict[str, tuple], position: tuple, dist: int) -> bool:
+        """Set the distance of the position if it is smaller than the known one."""
+        entry = active.get(position[3])
+        if entry is not None and entry[0] <= dist:
+            return False
+        active[position[3]] = (dist,) + position
+        return True
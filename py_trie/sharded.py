@@ -0,0 +1,532 @@
+from __future__ import annotations
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .fuzzy_trie import FuzzyTrie
+from .levenshtein import make_matcher
+
+MANIFEST = 'manifest.json'
+
+# The shards loaded by every worker process of the pool
+_shards: List[FuzzyTrie] = []
+
+
+def _load_shards(paths: List[str]) -> None:
+    """Memory-map the shards into a worker process once at startup."""
+    global _shards
+    _shards = [FuzzyTrie.load(path) for path in paths]
+
+
+def _first_char(word: str, lower_case: bool) -> str:
+    """Return the first character of the word as stored in the trie."""
+    return (word.lower() if lower_case else word)[0]
+
+
+def _build_shard(
+    source,
+    chars: List[str],
+    path: str,
+    lower_case: bool
+) -> int:
+    """Build the shard of the words starting with the characters from a txt
+    file or a list of words, save it into the path and return its size."""
+    chars = set(chars)
+    if isinstance(source, str):
+        with open(source, 'r') as f:
+            words = [
+                w for line in f for w in line.split()
+                if _first_char(w, lower_case) in chars
+            ]
+    else:
+        words = source
+
+    trie = FuzzyTrie.from_iterable(words, lower_case=lower_case)
+    trie.save(path)
+    return len(trie)
+
+
+def _shard_fuzzy_search(
+    shard: int,
+    target: str,
+    threshold: int,
+    num_return: Optional[int],
+    sort_by_distance: bool,
+    case_insensitive: bool,
+    engine: str
+) -> List[Tuple[str, int]]:
+    """Return the (word, distance) pairs of a shard in lexicographic order,
+    or in ascending order of distance if 'sort_by_distance' is set."""
+    matcher = make_matcher(target, threshold, case_insensitive, engine)
+
+    # The edges of a frozen trie are sorted, so the depth-first
+    # order of the words is the lexicographic order
+    pairs = _shards[shard]._iter_fuzzy(matcher)
+    if sort_by_distance:
+        return sorted(pairs, key=itemgetter(1))[:num_return]
+    return list(islice(pairs, num_return))
+
+
+class ShardedFuzzyTrie:
+    """A read-only FuzzyTrie partitioned by the first characters of the words
+    into shards searched by a pool of worker processes.
+
+    Every shard is a frozen trie saved into a binary file, which every worker
+    memory-maps once at startup, so the shards are shared through the page
+    cache instead of being pickled for every query. A fuzzy search is sent to
+    all the shards in parallel and the results are merged, while a completion
+    only concerns the shard of the first character of its prefix and runs in
+    the calling process on the memory-mapped shard.
+
+    Since the edges of the shards are sorted, the words are returned in
+    lexicographic order, or in ascending order of distance with the words of
+    equal distance in lexicographic order.
+
+    Attributes:
+        size (int):
+            The total number of words in the shards.
+        lower_case (bool):
+            Whether all the input words are converted to lower-case.
+        num_shards (int):
+            The number of shards.
+        workers (int):
+            The number of worker processes.
+        directory (str):
+            The directory of the shard files.
+
+    Methods:
+        find:
+            Return True if the word is in the trie else False.
+        complete:
+            Complete a word based on the input of the user.
+        fuzzy_search:
+            Search a list of words within a Levenshtein distance
+            to the target string in all the shards.
+        close:
+            Stop the worker processes.
+
+    Class Methods:
+        load:
+            Open the shards saved in a directory.
+        from_list:
+            Create a ShardedFuzzyTrie object from a python list.
+        from_iterable:
+            Create a ShardedFuzzyTrie object from an iterable of words.
+        from_txt:
+            Create a ShardedFuzzyTrie object from a txt file, building the
+            shards in parallel.
+
+    To instantiate:
+        >>> with ShardedFuzzyTrie.from_txt('words.txt', workers=8) as trie:
+        >>>     trie.fuzzy_search('hello', 2)
+    """
+
+    def __init__(self, directory: str, workers: Optional[int] = None) -> None:
+        """Open the shards saved in the directory and start the worker pool.
+
+        Raises:
+            FileNotFoundError: The directory does not contain the shards.
+            ValueError: Invalid data type and range of input parameter 'workers'.
+        """
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise ValueError("The input parameter 'workers' must be a positive integer")
+
+        with open(os.path.join(directory, MANIFEST), 'r') as f:
+            manifest = json.load(f)
+
+        self._directory: str = directory
+        self._lower_case: bool = manifest['lower_case']
+        self._paths: List[str] = [
+            os.path.join(directory, name) for name in manifest['files']
+        ]
+
+        # Route the first character of a word to its shard
+        self._routes: Dict[str, int] = {
+            char: i for i, chars in enumerate(manifest['chars']) for char in chars
+        }
+        self._shards: List[FuzzyTrie] = [FuzzyTrie.load(path) for path in self._paths]
+        self._size: int = sum(len(shard) for shard in self._shards)
+
+        # An empty trie validating the parameters of the queries
+        self._validator: FuzzyTrie = FuzzyTrie(self._lower_case)
+
+        self._workers: int = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            self._workers, initializer=_load_shards, initargs=(self._paths,)
+        )
+        self._owns_directory: bool = False
+
+    def __enter__(self) -> ShardedFuzzyTrie:
+        """Enable the use of the 'with' statement."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the workers when leaving the 'with' statement."""
+        self.close()
+
+    def __contains__(self, item: str) -> bool:
+        """Enable the use of membership test operator 'in' for the class."""
+        return self.find(item)
+
+    def __len__(self) -> int:
+        """Enable the use of 'len' operator for retrieving the total number of words."""
+        return self._size
+
+    @property
+    def size(self) -> int:
+        """Declare 'size' as a read-only attribute."""
+        return self._size
+
+    @property
+    def lower_case(self) -> bool:
+        """Declare 'lower_case' as a read-only attribute."""
+        return self._lower_case
+
+    @property
+    def num_shards(self) -> int:
+        """Declare 'num_shards' as a read-only attribute."""
+        return len(self._shards)
+
+    @property
+    def workers(self) -> int:
+        """Declare 'workers' as a read-only attribute."""
+        return self._workers
+
+    @property
+    def directory(self) -> str:
+        """Declare 'directory' as a read-only attribute."""
+        return self._directory
+
+    @classmethod
+    def load(cls, directory: str, workers: Optional[int] = None) -> ShardedFuzzyTrie:
+        """Open the shards saved in a directory by a previous build.
+
+        Args:
+            directory (str): The directory of the shard files.
+            workers (int): The number of worker processes, or None for the
+                number of CPUs. (Default=None)
+
+        Returns:
+            ShardedFuzzyTrie: A ShardedFuzzyTrie object serving the shards.
+
+        To instantiate:
+            >>> trie = ShardedFuzzyTrie.load('shards/', workers=8)
+        """
+        return cls(directory, workers)
+
+    @classmethod
+    def from_list(cls, words: List[str], **kwargs) -> ShardedFuzzyTrie:
+        """Create a ShardedFuzzyTrie object from a python list.
+
+        Args:
+            words (List[str]): A list of words to be inserted.
+            **kwargs: Keyword arguments passed to 'from_iterable'.
+
+        Returns:
+            ShardedFuzzyTrie: A ShardedFuzzyTrie object with the words of the list.
+
+        Raises:
+            TypeError: The input parameter 'words' is not a list of strings.
+
+        To instantiate:
+            >>> trie = ShardedFuzzyTrie.from_list([...], workers=4)
+        """
+        if not isinstance(words, list):
+            raise TypeError("The input parameter 'words' must be a list of strings.")
+
+        return cls.from_iterable(words, **kwargs)
+
+    @classmethod
+    def from_iterable(
+        cls,
+        words: Iterable[str],
+        workers: Optional[int] = None,
+        num_shards: Optional[int] = None,
+        lower_case: bool = False,
+        directory: Optional[str] = None
+    ) -> ShardedFuzzyTrie:
+        """Create a ShardedFuzzyTrie object from an iterable of words, which are
+        partitioned in the calling process and sent once to the workers.
+
+        Args:
+            words (Iterable[str]):
+                An iterable of words to be inserted.
+            workers (int):
+                The number of worker processes, or None for the number of CPUs.
+                (Default=None)
+            num_shards (int):
+                The number of shards, or None for the number of workers.
+                (Default=None)
+            lower_case (bool):
+                Whether all the input words will be converted to lower-case.
+                (Default=False)
+            directory (str):
+                The directory of the shard files, or None for a temporary
+                directory removed by 'close'. (Default=None)
+
+        Returns:
+            ShardedFuzzyTrie: A ShardedFuzzyTrie object with the words.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+
+        To instantiate:
+            >>> trie = ShardedFuzzyTrie.from_iterable(..., workers=4)
+        """
+        groups: Dict[str, List[str]] = {}
+        for word in words:
+            if not isinstance(word, str) or not word:
+                raise TypeError("The input parameter 'word' must be a non-empty string")
+            groups.setdefault(_first_char(word, lower_case), []).append(word)
+
+        counts = Counter({char: len(group) for char, group in groups.items()})
+
+        def sources(chars: List[str]) -> List[str]:
+            return [word for char in chars for word in groups[char]]
+
+        return cls._build(counts, sources, workers, num_shards, lower_case, directory)
+
+    @classmethod
+    def from_txt(
+        cls,
+        path: str,
+        workers: Optional[int] = None,
+        num_shards: Optional[int] = None,
+        lower_case: bool = False,
+        directory: Optional[str] = None
+    ) -> ShardedFuzzyTrie:
+        """Create a ShardedFuzzyTrie object from a txt file.
+
+        The first characters of the words are counted in one pass to balance
+        the shards, then every worker reads the file and builds its shards in
+        parallel.
+
+        Args:
+            path (str): The path of a txt file.
+            workers, num_shards, lower_case, directory: See 'from_iterable'.
+
+        Returns:
+            ShardedFuzzyTrie: A ShardedFuzzyTrie object with the words of the file.
+
+        Raises:
+            FileNotFoundError: The txt file is not found.
+
+        To instantiate:
+            >>> trie = ShardedFuzzyTrie.from_txt('words.txt', workers=8)
+        """
+        try:
+            f = open(path, 'r')
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(f'The file {path} is not found.') from exc
+
+        with f:
+            counts = Counter(
+                _first_char(w, lower_case) for line in f for w in line.split()
+            )
+
+        return cls._build(
+            counts, lambda chars: path, workers, num_shards, lower_case, directory
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        counts: Counter,
+        sources,
+        workers: Optional[int],
+        num_shards: Optional[int],
+        lower_case: bool,
+        directory: Optional[str]
+    ) -> ShardedFuzzyTrie:
+        """Assign the first characters to the shards, build the shards in a
+        worker pool and open them."""
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise ValueError("The input parameter 'workers' must be a positive integer")
+
+        if num_shards is not None and (not isinstance(num_shards, int) or num_shards < 1):
+            raise ValueError("The input parameter 'num_shards' must be a positive integer")
+
+        workers = workers or os.cpu_count() or 1
+        num_shards = num_shards or workers
+
+        # Assign the most frequent characters first to the smallest shard
+        shards = [(0, i, []) for i in range(num_shards)]
+        for char, num_words in counts.most_common():
+            size, i, chars = heapq.heappop(shards)
+            chars.append(char)
+            heapq.heappush(shards, (size + num_words, i, chars))
+        chars = [chars for _, _, chars in sorted(shards, key=itemgetter(1))]
+
+        owns_directory = directory is None
+        if owns_directory:
+            directory = tempfile.mkdtemp(prefix='py_trie_shards_')
+        else:
+            os.makedirs(directory, exist_ok=True)
+        files = [f'shard_{i}.trie' for i in range(num_shards)]
+
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(
+                _build_shard,
+                [sources(group) for group in chars],
+                chars,
+                [os.path.join(directory, name) for name in files],
+                [lower_case] * num_shards
+            ))
+
+        with open(os.path.join(directory, MANIFEST), 'w') as f:
+            json.dump({'lower_case': lower_case, 'files': files, 'chars': chars}, f)
+
+        trie = cls(directory, workers)
+        trie._owns_directory = owns_directory
+        return trie
+
+    def close(self) -> None:
+        """Stop the worker processes, and remove the shard files if they were
+        built into a temporary directory."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        if self._owns_directory:
+            # Release the memory maps before removing the files
+            self._shards = []
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._owns_directory = False
+
+    def find(self, word: str) -> bool:
+        """Search whether the word is stored in the shard of its first character.
+
+        Args:
+            word (str): A word to be searched for in the trie.
+
+        Returns:
+            bool: Return true if the word is found.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty input of 'word'.
+
+        Example:
+            >>> is_found = trie.find('...')
+        """
+        if not isinstance(word, str) or not word:
+            raise TypeError("The input parameter 'word' must be a non-empty string")
+
+        shard = self._routes.get(_first_char(word, self._lower_case))
+        return shard is not None and self._shards[shard].find(word)
+
+    def complete(
+        self,
+        word: str,
+        limit: Optional[int] = None,
+        order: str = 'length',
+        offset: int = 0
+    ) -> List[str]:
+        """Complete the given word by searching words with the same prefix.
+
+        A non-empty prefix is completed by the shard of its first character,
+        while the completions of the empty prefix are merged from all shards.
+
+        Args:
+            word (str): A word to be completed.
+            limit (int): The maximum number of return words. (Default=None)
+            order (str): 'length' for the shorter words first, or 'lex' or
+                'none' for the lexicographic order. (Default='length')
+            offset (int): The number of leading words to be skipped. (Default=0)
+
+        Returns:
+            List[str]: A list of possible words in the trie.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'word'.
+            ValueError: Invalid 'limit', 'order' or 'offset'.
+
+        Example:
+            >>> results = trie.complete('...', limit=10)
+        """
+        self._validator.complete(word, limit, order, offset)
+
+        if word:
+            shard = self._routes.get(_first_char(word, self._lower_case))
+            if shard is None:
+                return []
+            return self._shards[shard].complete(word, limit, order, offset)
+
+        # Every shard yields its words in the merged order
+        stop = None if limit is None else offset + limit
+        words = heapq.merge(
+            *(shard.iter_complete('', stop, order) for shard in self._shards),
+            key=(lambda w: (len(w), w)) if order == 'length' else None
+        )
+        return list(islice(words, offset, stop))
+
+    def fuzzy_search(
+        self,
+        target: str,
+        threshold: int,
+        num_return: Optional[int] = None,
+        sort_by_distance: bool = False,
+        case_insensitive: bool = False,
+        engine: str = 'row'
+    ) -> List[str]:
+        """Search the words within a Levenshtein distance threshold of the target
+        in all the shards in parallel.
+
+        Args:
+            target (str):
+                The target word.
+            threshold (int):
+                The maximum Levenshtein distance difference.
+            num_return (int):
+                The maximum number of return words. (Default=None)
+            sort_by_distance (bool):
+                Return the words in ascending order of LD difference. (Default=False)
+            case_insensitive (bool):
+                Whether difference in case counts toward the LD difference.
+                (Default=False)
+            engine (str):
+                The engine computing the distances, either 'row' or
+                'bitparallel'. (Default='row')
+
+        Returns:
+            List[str]:
+                A list of words within the threshold in lexicographic order, or
+                in ascending order of distance if 'sort_by_distance' is set.
+
+        Raises:
+            TypeError:
+                Invalid data type of input parameter 'target'.
+            ValueError:
+                Invalid data type and range of input parameters 'threshold'
+                or 'num_return', or unknown 'engine'.
+
+        Example:
+            >>> results = trie.fuzzy_search('hello', 2, num_return=10)
+        """
+        if self._pool is None:
+            raise ValueError("The ShardedFuzzyTrie object is closed.")
+
+        # Validate the parameters before sending them to the workers
+        self._validator.fuzzy_search(
+            target, threshold, num_return, sort_by_distance, case_insensitive, engine
+        )
+
+        futures = [
+            self._pool.submit(
+                _shard_fuzzy_search, i, target, threshold, num_return,
+                sort_by_distance, case_insensitive, engine
+            )
+            for i in range(len(self._shards))
+        ]
+        results = [future.result() for future in futures]
+
+        # Merge the sorted results of the shards
+        key = (lambda pair: (pair[1], pair[0])) if sort_by_distance else itemgetter(0)
+        pairs = heapq.merge(*results, key=key)
+        return [word for word, _ in islice(pairs, num_return)]
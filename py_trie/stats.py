@@ -0,0 +1,136 @@
+from typing import Dict, Generator, Optional, Tuple, Union
+
+
+class SearchStats:
+    """The counters of a single fuzzy search, collected while the statistics
+    of the trie are enabled.
+
+    Attributes:
+        target (str | bytes):
+            The target word of the search.
+        threshold (int):
+            The maximum Levenshtein distance of the search.
+        strategy (str):
+            How the search was answered: 'dfs' for the depth-first traversal,
+            'best_first' for the best-first traversal, 'index' for the
+            symmetric-delete index or 'cache' for the query cache.
+        nodes_visited (int):
+            The number of nodes taken from the stack or the heap.
+        rows_computed (int):
+            The number of rows (or states) computed by the matcher, i.e. one
+            per character of every traversed edge.
+        branches_pruned (int):
+            The number of rows whose minimum exceeded the threshold, each
+            cutting off the subtree below it.
+        max_depth (int):
+            The number of characters of the deepest row computed.
+        num_results (int):
+            The number of returned words.
+        elapsed (float):
+            The number of seconds spent on the search.
+
+    Methods:
+        as_dict:
+            Return the counters as a dictionary, e.g. for a metrics exporter.
+    """
+
+    __slots__ = (
+        'target', 'threshold', 'strategy', 'nodes_visited', 'rows_computed',
+        'branches_pruned', 'max_depth', 'num_results', 'elapsed'
+    )
+
+    def __init__(self, target: Union[str, bytes], threshold: int) -> None:
+        """Construct the counters of a search of the target."""
+        self.target: Union[str, bytes] = target
+        self.threshold: int = threshold
+        self.strategy: str = 'dfs'
+        self.nodes_visited: int = 0
+        self.rows_computed: int = 0
+        self.branches_pruned: int = 0
+        self.max_depth: int = 0
+        self.num_results: int = 0
+        self.elapsed: float = 0.0
+
+    def __repr__(self) -> str:
+        """Show the counters of the search."""
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'SearchStats({fields})'
+
+    def as_dict(self) -> Dict[str, Union[str, bytes, int, float]]:
+        """Return a dictionary of the attributes of the search."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def visits(
+        self,
+        steps: Generator[Optional[Tuple[str, int]], None, bool]
+    ) -> Generator[Tuple[str, int], None, Optional[bool]]:
+        """Count the checkpoints of a traversal run with 'checkpoints' set,
+        i.e. the visited nodes, and yield its (word, distance) pairs. The
+        return value of the traversal is returned."""
+        while True:
+            try:
+                step = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            if step is None:
+                self.nodes_visited += 1
+            else:
+                yield step
+
+
+class CountingMatcher:
+    """Wrap a matcher to count the rows it computes and prunes.
+
+    A row of the wrapper is the pair (depth, row of the matcher), where the
+    depth is the number of characters of the candidate, so the traversals
+    run unchanged on the wrapper. The plain matcher is only replaced while
+    the statistics are enabled, so the searches without statistics pay
+    nothing for them.
+
+    Attributes:
+        target (str):
+            The target word of the wrapped matcher.
+        threshold (int):
+            The maximum Levenshtein distance of the wrapped matcher.
+        case_insensitive (bool):
+            Whether difference in case counts toward the distance.
+    """
+
+    __slots__ = ('target', 'threshold', 'case_insensitive', '_matcher', '_stats')
+
+    def __init__(self, matcher, stats: SearchStats) -> None:
+        """Wrap the matcher and record into the statistics."""
+        self.target: str = matcher.target
+        self.threshold: int = matcher.threshold
+        self.case_insensitive: bool = matcher.case_insensitive
+        self._matcher = matcher
+        self._stats: SearchStats = stats
+
+    def initial(self) -> tuple:
+        """Return the row of the empty word."""
+        return 0, self._matcher.initial()
+
+    def step(self, row: tuple, letter: str) -> tuple:
+        """Return the row obtained by appending 'letter' to the candidate."""
+        stats = self._stats
+        depth = row[0] + 1
+        stats.rows_computed += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        return depth, self._matcher.step(row[1], letter)
+
+    def distance(self, row: tuple) -> int:
+        """Return the distance between the candidate and the target."""
+        return self._matcher.distance(row[1])
+
+    def row_min(self, row: tuple) -> int:
+        """Return the minimum value of the row."""
+        return self._matcher.row_min(row[1])
+
+    def alive(self, row: tuple) -> bool:
+        """Return True if a word extending the candidate may be within the
+        threshold, counting the pruned rows."""
+        if self._matcher.alive(row[1]):
+            return True
+        self._stats.branches_pruned += 1
+        return False
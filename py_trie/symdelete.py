@@ -0,0 +1,175 @@
+import sys
+import time
+from typing import Dict, Iterable, Set, Union
+
+
+def fold(word: str) -> str:
+    """Lower the case of every character which stays a single character,
+    so that the folded word is as long as the word."""
+    folded = []
+    for char in word:
+        lower = char.lower()
+        folded.append(lower if len(lower) == 1 else char)
+    return ''.join(folded)
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Return the strings obtained by deleting at most 'max_distance'
+    characters from the word, including the word itself."""
+    res = {word}
+    level = {word}
+    for _ in range(max_distance):
+        level = {
+            variant[:i] + variant[i + 1:]
+            for variant in level
+            for i in range(len(variant))
+        }
+        res |= level
+    return res
+
+
+class SymDeleteIndex:
+    """A symmetric-delete index mapping the deletion neighbourhood of every
+    word to the words, as in the SymSpell algorithm.
+
+    If the Levenshtein distance between two words is at most d, deleting at
+    most d characters from each of them leads to a common string. The
+    candidates of a target within a threshold are therefore the words sharing
+    a deletion variant with the target, found with a few dictionary lookups
+    instead of a traversal of the trie. The candidates are a superset of the
+    matches, which have to be verified with the exact distance.
+
+    The variants are built from the case-folded words, so the candidates are
+    a superset of the matches with or without 'case_insensitive'.
+
+    Attributes:
+        max_distance (int):
+            The maximum threshold served by the index.
+        num_words (int):
+            The number of indexed words.
+        num_entries (int):
+            The number of distinct deletion variants.
+        build_time (float):
+            The total number of seconds spent indexing the words.
+
+    Methods:
+        add:
+            Index a word.
+        remove:
+            Remove a word from the index.
+        extend:
+            Index the words of an iterable.
+        candidates:
+            Return the words which may be within a threshold of a target.
+        memory_usage:
+            Return the approximate memory of the index in bytes.
+
+    To instantiate:
+        >>> index = SymDeleteIndex(max_distance=2)
+    """
+
+    def __init__(self, max_distance: int = 2) -> None:
+        """Construct an empty index."""
+        if not isinstance(max_distance, int) or max_distance < 0:
+            raise ValueError(
+                "The input parameter 'max_distance' must be a non-negative integer"
+            )
+
+        self._max_distance: int = max_distance
+        self._num_words: int = 0
+        self._build_time: float = 0.0
+
+        # Map a variant to its only word, or to the set of its words
+        # to save the memory of a set for most of the variants
+        self._variants: Dict[str, Union[str, Set[str]]] = {}
+
+    def __len__(self) -> int:
+        """Enable the use of 'len' operator for retrieving the number of words."""
+        return self._num_words
+
+    @property
+    def max_distance(self) -> int:
+        """Declare 'max_distance' as a read-only attribute."""
+        return self._max_distance
+
+    @property
+    def num_words(self) -> int:
+        """Declare 'num_words' as a read-only attribute."""
+        return self._num_words
+
+    @property
+    def num_entries(self) -> int:
+        """Declare 'num_entries' as a read-only attribute."""
+        return len(self._variants)
+
+    @property
+    def build_time(self) -> float:
+        """Declare 'build_time' as a read-only attribute."""
+        return self._build_time
+
+    def add(self, word: str) -> None:
+        """Index a word which is not in the index yet."""
+        start = time.perf_counter()
+        variants = self._variants
+        for variant in deletes(fold(word), self._max_distance):
+            words = variants.get(variant)
+            if words is None:
+                variants[variant] = word
+            elif isinstance(words, str):
+                variants[variant] = {words, word}
+            else:
+                words.add(word)
+        self._num_words += 1
+        self._build_time += time.perf_counter() - start
+
+    def remove(self, word: str) -> None:
+        """Remove an indexed word from the index."""
+        variants = self._variants
+        for variant in deletes(fold(word), self._max_distance):
+            words = variants[variant]
+            if isinstance(words, str):
+                del variants[variant]
+            else:
+                words.discard(word)
+                if len(words) == 1:
+                    variants[variant] = words.pop()
+        self._num_words -= 1
+
+    def extend(self, words: Iterable[str]) -> None:
+        """Index the words of an iterable, none of which is in the index yet."""
+        for word in words:
+            self.add(word)
+
+    def candidates(self, target: str, threshold: int) -> Set[str]:
+        """Return the indexed words which may be within the threshold of the target."""
+        if threshold > self._max_distance:
+            raise ValueError(
+                f"The threshold {threshold} exceeds the 'max_distance' "
+                f"{self._max_distance} of the index."
+            )
+
+        res = set()
+        variants = self._variants
+        for variant in deletes(fold(target), threshold):
+            words = variants.get(variant)
+            if words is None:
+                continue
+            if isinstance(words, str):
+                res.add(words)
+            else:
+                res |= words
+        return res
+
+    def memory_usage(self) -> int:
+        """Return the approximate number of bytes taken by the index, counting
+        the dictionary, the variants, the sets and every word once."""
+        total = sys.getsizeof(self._variants)
+        words = set()
+        for variant, value in self._variants.items():
+            total += sys.getsizeof(variant)
+            if isinstance(value, str):
+                words.add(value)
+            else:
+                total += sys.getsizeof(value)
+                words |= value
+        return total + sum(sys.getsizeof(word) for word in words)
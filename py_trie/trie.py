@@ -1,7 +1,46 @@
 from __future__ import annotations
-from typing import List
+import asyncio
+import copy
+import gc
+import heapq
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import nullcontext
+from itertools import count, islice
+from operator import attrgetter, itemgetter
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+)
 
-from .node import TrieNode
+from .cache import QueryCache
+from .journal import OP_DELETE, OP_INSERT_WEIGHTED, Journal, read_snapshot
+from .levenshtein import make_matcher
+from .node import RadixNode, TrieNode
+
+if TYPE_CHECKING:
+    from .frozen import FrozenTrie
+    from .infix import InfixIndex
+
+# The types of the words of a bytes trie
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+def _shared_prefix(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of two strings by
+    binary searching the length with slice comparisons."""
+    i = 0
+    shared = min(len(a), len(b))
+    while i < shared:
+        mid = (i + shared + 1) // 2
+        if a[:mid] == b[:mid]:
+            i = mid
+        else:
+            shared = mid - 1
+    return i
 
 
 class Trie:
@@ -15,6 +54,24 @@ class Trie:
         lower_case (bool): 
             Whether all the input words will be converted to lower-case. 
             (Default=False)
+        compressed (bool):
+            Whether chains of single-child nodes are collapsed into one
+            RadixNode with a string label. (Default=False)
+        cache (QueryCache):
+            The cache of the query results, or None if caching is disabled.
+        copy_on_write (bool):
+            Whether the writers copy the nodes they modify, so that the
+            readers never need a lock. (Default=False)
+        alphabet (str | bytes):
+            The characters allowed in the inserted words, or None if any
+            character is allowed. A bytes alphabet makes a bytes trie, whose
+            words are bytes-like objects. (Default=None)
+        infix_index (InfixIndex):
+            The index of the suffixes of the words answering 'contains_search',
+            or None. (Default=None)
+        journal (Journal):
+            The journal recording the insertions and deletions, or None.
+            (Default=None)
 
     Methods:
         insert: 
@@ -23,26 +80,131 @@ class Trie:
             Return True if the word is in the Trie else False.
         delete: 
             Delete a word in the Trie and return True if successful.
+        find_many:
+            Search a batch of words in one pass over the Trie.
+        insert_many:
+            Insert a batch of words in one pass over the Trie.
+        delete_many:
+            Delete a batch of words in one pass over the Trie.
+        merge:
+            Insert the words of another trie, attaching its unshared subtrees whole.
+        union:
+            Return a new Trie of the words of either trie.
+        intersection:
+            Return a new Trie of the words of both tries.
+        difference:
+            Return a new Trie of the words missing from another trie.
         complete: 
             Complete a word based on the input of the user and
             return the list of words ordered by their length.
+        iter_complete:
+            Lazily yield the completions of a word in the chosen order.
+        acomplete:
+            Complete a word without blocking the event loop, within
+            an optional time or node budget.
+        top_k_complete:
+            Return the completions of a word with the greatest weights.
+        contains_search:
+            Return the words containing a fragment anywhere.
+        count_prefix:
+            Return the number of words starting with a prefix.
+        rank:
+            Return the number of words lexicographically smaller than a word.
+        select:
+            Return the word at an index of the sorted words.
+        snapshot:
+            Return an isolated copy of a copy-on-write Trie in O(1).
+        enable_cache:
+            Cache the results of the queries in a bounded LRU.
+        disable_cache:
+            Stop caching the results of the queries.
+        build_infix_index:
+            Build an index of the suffixes of the words for 'contains_search'.
+        drop_infix_index:
+            Drop the index of the suffixes.
+        enable_journal:
+            Snapshot the words and record the later modifications in a journal.
+        disable_journal:
+            Sync and close the journal.
+        compact:
+            Fold the journal into a fresh snapshot in the background.
+        memory_usage:
+            Return the approximate number of bytes taken by the nodes.
+        structure_stats:
+            Describe the number of nodes, the fan-out and the depths of the Trie.
+        freeze:
+            Return an immutable array-backed copy of the Trie.
+        save:
+            Write the Trie into a binary file.
 
     Class Methods:
+        load:
+            Load a read-only trie from a binary file.
         from_list: 
             Create a Trie object from a python list.
+        from_iterable:
+            Create a Trie object from an iterable of words.
         from_txt: 
             Create a Trie object from a txt file.
+        recover:
+            Rebuild a Trie object from its snapshot and the tail of its journal.
 
     To instantiate:
         >>> case_sensitive_trie = Trie()
         >>> case_insensitive_trie = Trie(lower_case=True)
+        >>> compressed_trie = Trie(compressed=True)
+        >>> concurrent_trie = Trie(copy_on_write=True)
+        >>> ascii_trie = Trie(alphabet='abcdefghijklmnopqrstuvwxyz0123456789-_')
+        >>> bytes_trie = Trie(alphabet=bytes(range(256)))
     """
     
-    def __init__(self, lower_case: bool = False) -> None:
+    # Return True if the node is marked as the end of a word
+    _is_word = staticmethod(attrgetter('end_of_word'))
+
+    # Return the number of words in the subtree of the node
+    _count = staticmethod(attrgetter('count'))
+
+    def __init__(
+        self,
+        lower_case: bool = False,
+        compressed: bool = False,
+        copy_on_write: bool = False,
+        alphabet: Optional[Union[str, bytes]] = None
+    ) -> None:
         """Construct the root of the trie."""
-        self._root: TrieNode = TrieNode()
+        self._root: TrieNode = RadixNode() if compressed else TrieNode()
         self._size: int = 0
         self._lower_case: bool = lower_case
+        self._compressed: bool = compressed
+
+        # The number of insertions and deletions, which invalidates the
+        # cached results of the previous generations
+        self._generation: int = 0
+        self._cache: Optional[QueryCache] = None
+        self._infix_index: Optional[InfixIndex] = None
+        self._journal: Optional[Journal] = None
+
+        # The writers of a copy-on-write trie take turns to modify a copy of
+        # the path of their word and publish the new root
+        self._copy_on_write: bool = copy_on_write
+        self._write_lock: Optional[threading.Lock] = (
+            threading.Lock() if copy_on_write else None
+        )
+
+        # The words of a bytes trie are stored as the strings of the same
+        # code points, i.e. every byte is a character below 256, so the
+        # nodes and the traversals are shared with the string tries
+        self._bytes_keys: bool = isinstance(alphabet, BYTES_TYPES)
+        if alphabet is None:
+            self._alphabet: Optional[frozenset] = None
+        elif isinstance(alphabet, str) or self._bytes_keys:
+            if self._bytes_keys:
+                alphabet = str(alphabet, 'latin-1')
+            self._alphabet = frozenset(alphabet)
+        else:
+            raise TypeError(
+                "The input parameter 'alphabet' must be a string or a bytes-like object."
+            )
 
     def __contains__(self, item: str) -> bool:
         """Enable the use of membership test operator 'in' for the class."""
@@ -71,13 +233,46 @@ class Trie:
     def lower_case(self) -> bool:
         """Declare 'lower_case' as a read-only attribute."""
         return self._lower_case
+
+    @property
+    def compressed(self) -> bool:
+        """Declare 'compressed' as a read-only attribute."""
+        return self._compressed
+
+    @property
+    def cache(self) -> Optional[QueryCache]:
+        """Declare 'cache' as a read-only attribute."""
+        return self._cache
+
+    @property
+    def copy_on_write(self) -> bool:
+        """Declare 'copy_on_write' as a read-only attribute."""
+        return self._copy_on_write
+
+    @property
+    def infix_index(self) -> Optional[InfixIndex]:
+        """Declare 'infix_index' as a read-only attribute."""
+        return self._infix_index
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        """Declare 'journal' as a read-only attribute."""
+        return self._journal
+
+    @property
+    def alphabet(self) -> Optional[Union[str, bytes]]:
+        """Declare 'alphabet' as a read-only attribute."""
+        if self._alphabet is None:
+            return None
+        return self._word(''.join(sorted(self._alphabet)))
     
     @classmethod
-    def from_list(cls, words: List[str]) -> Trie:
+    def from_list(cls, words: List[str], **kwargs) -> Trie:
         """Create a Trie object from a python list.
         
         Args:
             words (List[str]): A list of words to be inserted.
+            **kwargs: Keyword arguments passed to 'from_iterable'.
     
         Returns:
             Trie: A Trie object with inserted words from the list.
@@ -88,25 +283,140 @@ class Trie:
         To instantiate:
             >>> trie = Trie.from_list([...])
         """
-        if not (
-            isinstance(words, list) or 
-            all([isinstance(w, str) for w in words])
-        ):
+        if not isinstance(words, list):
             raise TypeError("The input parameter 'words' must be a list of strings.")
 
-        trie = cls()
+        return cls.from_iterable(words, **kwargs)
+
+    @classmethod
+    def from_iterable(
+        cls,
+        words: Iterable[str],
+        sorted_input: bool = False,
+        **kwargs
+    ) -> Trie:
+        """Create a Trie object from any iterable of words, consumed lazily.
+
+        Args:
+            words (Iterable[str]):
+                An iterable of words to be inserted, e.g. a generator.
+            sorted_input (bool):
+                Whether the words are in ascending order (after the conversion
+                to lower-case if 'lower_case' is set). The trie is then built
+                by reusing the path of the previous word instead of descending
+                from the root for every word. (Default=False)
+            **kwargs:
+                Keyword arguments passed to the constructor of the class.
+
+        Returns:
+            Trie: A Trie object with inserted words from the iterable.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+            ValueError: The words are not sorted although 'sorted_input' is set.
+
+        To instantiate:
+            >>> trie = Trie.from_iterable(word for word in ...)
+            >>> trie = Trie.from_iterable(sorted_words, sorted_input=True)
+        """
+        trie = cls(**kwargs)
+        trie._extend(words, sorted_input)
+        return trie
+
+    @classmethod
+    def recover(
+        cls,
+        snapshot: str,
+        journal: str,
+        sync_every: int = 128,
+        sync_interval: Optional[float] = 1.0,
+        **kwargs
+    ) -> Trie:
+        """Rebuild a trie from the snapshot and the journal written by
+        'enable_journal' and 'compact', e.g. after a restart or a crash, and
+        keep recording the modifications into the journal.
+
+        The words of the snapshot are streamed into the trie in ascending
+        order, and only the records of the journal after the snapshot are
+        replayed, so the replay takes time proportional to the modifications
+        since the last compaction rather than to the number of words. A record
+        torn by a crash is dropped. Without a snapshot file, the trie is
+        rebuilt from the journal alone.
+
+        Args:
+            snapshot (str): The path of the snapshot file.
+            journal (str): The path of the journal file.
+            sync_every, sync_interval: See 'enable_journal'.
+            **kwargs: Keyword arguments passed to the constructor of the class,
+                which should be the same as those of the journaled trie.
+
+        Returns:
+            Trie: A Trie object with the words at the last synced record,
+                recording into the journal.
+
+        Raises:
+            TypeError: The input parameters 'snapshot' or 'journal' are not strings.
+            ValueError: The files are not a valid snapshot and journal, or the
+                journal does not continue the snapshot.
+
+        To instantiate:
+            >>> trie = Trie.recover('words.snapshot', 'words.journal')
+        """
+        if not isinstance(snapshot, str) or not isinstance(journal, str):
+            raise TypeError("The input parameters 'snapshot' and 'journal' must be strings.")
+
+        if os.path.exists(snapshot):
+            lsn, entries = read_snapshot(snapshot)
+        else:
+            lsn, entries = 0, iter(())
+
+        trie = cls(**kwargs)
+        log = Journal(journal, snapshot, sync_every, sync_interval, lsn)
+        if log.base_lsn > lsn:
+            log.close()
+            raise ValueError(
+                f"The journal '{journal}' does not continue the snapshot '{snapshot}'."
+            )
+
+        # The words of the snapshot are stored in ascending order, and
+        # only their weights are set afterwards
+        weights = []
 
-        for w in words:
-            trie.insert(w)
+        def words() -> Iterator[str]:
+            for word, weight in entries:
+                if weight:
+                    weights.append((word, weight))
+                yield trie._word(word)
 
+        try:
+            trie._extend(words(), True)
+            for word, weight in weights:
+                trie._replay(OP_INSERT_WEIGHTED, word, weight)
+            for _, op, word, weight in log.replay(lsn):
+                trie._replay(op, word, weight)
+        except BaseException:
+            log.close()
+            raise
+
+        # A journal older than the snapshot starts over after the snapshot
+        if log.lsn < lsn:
+            log.truncate(lsn)
+        trie._journal = log
         return trie
 
     @classmethod
-    def from_txt(cls, path: str) -> Trie:
+    def from_txt(cls, path: str, sorted_input: bool = False, **kwargs) -> Trie:
         """Create a Trie object from a txt file.
+
+        The file is read line by line, so the words of the file are
+        never held in memory at once. The file of a bytes trie is read
+        in binary mode without decoding its words.
         
         Args:
             path (str): The absolute path of the txt file.
+            sorted_input (bool): Whether the words of the file are in ascending order.
+                (Default=False)
+            **kwargs: Keyword arguments passed to the constructor of the class.
     
         Returns:
             Trie: A Trie object with inserted words from the file.
@@ -114,6 +424,7 @@ class Trie:
         Raises:
             TypeError: The input parameter 'path' is not a string.
             FileNotFoundError: The file with the input path does not exist.
+            ValueError: The words are not sorted although 'sorted_input' is set.
         
         To instantiate:
             >>> import os
@@ -122,59 +433,371 @@ class Trie:
         """
         if not isinstance(path, str):
             raise TypeError("The input parameter 'path' must be a string.")
-        
-        words = []
 
+        binary = isinstance(kwargs.get('alphabet'), BYTES_TYPES)
         try:
-            with open(path, 'r') as f:
-                for line in f:
-                    words.extend(line.strip().split())
+            f = open(path, 'rb' if binary else 'r')
         except FileNotFoundError as exc:
             raise FileNotFoundError(
                 f"""The file with the path '{path}' is not found,
                 please use the absolute path of the file."""
             ) from exc
-        
-        return cls.from_list(words)
 
-    def insert(self, word: str) -> bool:
+        with f:
+            words = (w for line in f for w in line.split())
+            return cls.from_iterable(words, sorted_input, **kwargs)
+
+    def enable_cache(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        scoped: bool = False
+    ) -> QueryCache:
+        """Cache the results of 'complete' and 'fuzzy_search' in a bounded LRU.
+
+        The cached results are invalidated by 'insert' and 'delete', either all
+        at once or, with 'scoped' set, only those the modified word may change.
+
+        Args:
+            max_size (int): The maximum number of cached results. (Default=1024)
+            ttl (float): The number of seconds after which a result expires,
+                or None if the results never expire. (Default=None)
+            scoped (bool): Whether a modification only invalidates the results
+                it affects. (Default=False)
+
+        Returns:
+            QueryCache: The new cache of the trie exposing the hit, miss and
+                eviction counters.
+
+        Raises:
+            TypeError: Invalid data type of input parameter 'scoped', or the
+                trie is a copy-on-write trie.
+            ValueError: Invalid data type and range of input parameters
+                'max_size' or 'ttl'.
+
+        Example:
+            >>> trie = Trie()
+            >>> cache = trie.enable_cache(max_size=4096, scoped=True)
+            >>> trie.complete('...')
+            >>> cache.hits, cache.misses
+        """
+        # The readers of a copy-on-write trie would update the cache concurrently
+        if self._copy_on_write:
+            raise TypeError("A copy-on-write trie does not support the query cache.")
+
+        self._cache = QueryCache(max_size, ttl, scoped)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        """Stop caching and drop the cached results."""
+        self._cache = None
+
+    def build_infix_index(self) -> InfixIndex:
+        """Build an index of the suffixes of the words in the trie.
+
+        While the index exists, it is updated by 'insert' and 'delete', and
+        'contains_search' looks up the fragments in the index instead of
+        scanning the words.
+
+        Returns:
+            InfixIndex: The new index reporting its size and build time.
+
+        Raises:
+            TypeError: The trie is a copy-on-write trie.
+
+        Example:
+            >>> trie = Trie.from_list([...])
+            >>> index = trie.build_infix_index()
+            >>> index.num_entries, index.build_time
+        """
+        # The index is modified in place, so the readers of a copy-on-write
+        # trie could see it in the middle of an update
+        if self._copy_on_write:
+            raise TypeError("A copy-on-write trie does not support the infix index.")
+
+        from .infix import InfixIndex
+        index = InfixIndex()
+        index.extend(self._iter_subtree(self._root, '', 'none', False))
+        self._infix_index = index
+        return index
+
+    def drop_infix_index(self) -> None:
+        """Drop the index of the suffixes and scan the words instead."""
+        self._infix_index = None
+
+    def enable_journal(
+        self,
+        snapshot: str,
+        journal: str,
+        sync_every: int = 128,
+        sync_interval: Optional[float] = 1.0
+    ) -> Journal:
+        """Write a snapshot of the words and record every later insertion and
+        deletion in an append-only journal, so that 'recover' rebuilds the
+        trie after a restart without saving the whole trie again.
+
+        The records are synced to the disk in batches: after 'sync_every'
+        records, by the first record more than 'sync_interval' seconds after
+        the last sync, and by 'Journal.sync' or 'disable_journal'. A crash
+        loses at most the records not synced yet. 'compact' folds the journal
+        into a fresh snapshot, keeping the journal short.
+
+        Args:
+            snapshot (str):
+                The path of the snapshot file.
+            journal (str):
+                The path of the journal file.
+            sync_every (int):
+                The number of records synced to the disk at once. (Default=128)
+            sync_interval (float):
+                The maximum number of seconds between two syncs while records
+                are appended, or None to sync by 'sync_every' only. (Default=1.0)
+
+        Returns:
+            Journal: The journal of the trie.
+
+        Raises:
+            TypeError: The input parameters 'snapshot' or 'journal' are not strings.
+            ValueError: Invalid data type and range of input parameters
+                'sync_every' or 'sync_interval', or the journal file is invalid.
+
+        Example:
+            >>> trie = Trie.from_txt('words.txt')
+            >>> trie.enable_journal('words.snapshot', 'words.journal')
+            >>> trie.insert('...')
+            >>> trie.compact()
+            >>> # After a restart
+            >>> trie = Trie.recover('words.snapshot', 'words.journal')
+        """
+        self.disable_journal()
+        log = Journal(journal, snapshot, sync_every, sync_interval)
+        self._journal = log
+
+        # Every record of the journal so far is superseded by the snapshot
+        try:
+            self.compact().result()
+        except BaseException:
+            self.disable_journal()
+            raise
+        return log
+
+    def disable_journal(self) -> None:
+        """Wait for the running compaction, then sync and close the journal."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def compact(self) -> Future:
+        """Write the words into a fresh snapshot and drop the records of the
+        journal it contains, in a background thread.
+
+        The words of a copy-on-write trie are taken in O(1) and written in the
+        background while the writers continue. The words of another trie are
+        collected before returning, as its nodes are modified in place.
+
+        Returns:
+            Future: The future of the number of words of the snapshot.
+
+        Raises:
+            TypeError: The trie has no journal.
+
+        Example:
+            >>> trie.enable_journal('words.snapshot', 'words.journal')
+            >>> future = trie.compact()
+            >>> future.result()
+        """
+        journal = self._journal
+        if journal is None:
+            raise TypeError("A trie without a journal cannot be compacted.")
+
+        # Take the words and the LSN of their last record together
+        with self._write_lock or nullcontext():
+            root = self._root
+            lsn = journal.lsn
+        entries = self._iter_weights(root)
+        if not self._copy_on_write:
+            entries = list(entries)
+        return journal.compact(entries, lsn)
+
+    def memory_usage(self) -> int:
+        """Return the approximate number of bytes taken by the nodes, counting
+        every node, its dictionary of children and its label."""
+        total = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node.children)
+            if self._compressed:
+                total += sys.getsizeof(node.label)
+            stack.extend(node.children.values())
+        return total
+
+    def structure_stats(self) -> Dict[str, Union[int, Dict[int, int]]]:
+        """Describe the shape of the trie, e.g. to explain the cost of a search.
+
+        Returns:
+            Dict[str, int | Dict[int, int]]: The number of nodes and words,
+                the histograms of the number of children of the nodes
+                ('fan_out') and of the number of characters above the nodes
+                ('depths'), and the 'estimated_bytes' of 'memory_usage'. The
+                nodes of a frozen trie shared by several paths are counted
+                once per path, so the shape is the shape of the plain trie.
+
+        Example:
+            >>> trie = Trie.from_list([...])
+            >>> stats = trie.structure_stats()
+            >>> stats['num_nodes'], stats['fan_out'], stats['estimated_bytes']
+        """
+        edges = self._edges
+        fan_out: Dict[int, int] = {}
+        depths: Dict[int, int] = {}
+        stack = [(self._root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            children = edges(node)
+            fan_out[len(children)] = fan_out.get(len(children), 0) + 1
+            depths[depth] = depths.get(depth, 0) + 1
+            for label, child in children:
+                stack.append((child, depth + len(label)))
+
+        return {
+            'num_nodes': sum(fan_out.values()),
+            'num_words': self._size,
+            'fan_out': dict(sorted(fan_out.items())),
+            'depths': dict(sorted(depths.items())),
+            'estimated_bytes': self.memory_usage(),
+        }
+
+    def freeze(self) -> FrozenTrie:
+        """Create an immutable copy of the trie stored in flat arrays.
+
+        Returns:
+            FrozenTrie: A read-only trie with the same words.
+
+        Example:
+            >>> trie = Trie.from_list([...])
+            >>> frozen_trie = trie.freeze()
+        """
+        from .frozen import FrozenTrie
+        return FrozenTrie.from_trie(self)
+
+    def save(self, path: str) -> None:
+        """Write the trie into a binary file which can be loaded with 'load'.
+
+        Args:
+            path (str): The path of the binary file.
+
+        Raises:
+            TypeError: The input parameter 'path' is not a string.
+
+        Example:
+            >>> trie = Trie.from_list([...])
+            >>> trie.save('words.trie')
+        """
+        self.freeze().save(path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, verify: bool = True) -> FrozenTrie:
+        """Load a read-only trie from a binary file written by 'save'.
+
+        The trie runs straight off the content of the file without rebuilding
+        any node, see 'FrozenTrie.load'.
+
+        Args:
+            path (str):
+                The path of the binary file.
+            mmap (bool):
+                Whether the file is memory-mapped instead of read into memory.
+                (Default=True)
+            verify (bool):
+                Whether the checksum of the file is verified. (Default=True)
+
+        Returns:
+            FrozenTrie: A read-only trie backed by the content of the file.
+
+        Raises:
+            TypeError: The input parameter 'path' is not a string.
+            FileNotFoundError: The file with the input path does not exist.
+            ValueError: The file is not a valid trie file of a supported version.
+
+        To instantiate:
+            >>> trie = Trie.load('words.trie')
+        """
+        from .frozen import FrozenTrie
+        return FrozenTrie.load(path, mmap, verify)
+
+    def insert(self, word: str, weight: Optional[float] = None) -> bool:
         """Insert the word into the trie.
 
         Args:
             word (str): A word to be inserted into the trie.
+            weight (int | float): A non-negative score of the word used by
+                'top_k_complete'. If None, a new word has a weight of 0 and an
+                existing word keeps its weight. (Default=None)
 
         Returns:
             bool: Return true if the word is successfully added to the trie.
 
         Raises:
             TypeError: Errors caused by non-string or empty input of 'word'.
+            ValueError: Invalid data type and range of input parameter 'weight',
+                or a character of the word is not in the alphabet.
 
         Example:
             >>> trie = Trie()
             >>> trie.insert('...')
+            >>> trie.insert('...', weight=42)
         """
-        if not isinstance(word, str) or not word:
-            raise TypeError("The input parameter 'word' must be a non-empty string")
-        
-        if self._lower_case:
-            word = word.lower()
+        word = self._key(word)
 
-        # Create a pointer to the root
-        node = self._root
+        if weight is not None and (
+            not isinstance(weight, (int, float)) or isinstance(weight, bool) or
+            not weight >= 0
+        ):
+            raise ValueError("The input parameter 'weight' must be a non-negative number")
 
-        # Check if the character is a child of the root
-        for char in word:
-            # Create a new branch if the character is not found
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            # Traverse to the node storing the character 
-            node = node.children[char]
+        self._check_alphabet(word)
+        self._write(word, True, lambda root: self._insert(root, word, weight), weight)
+        return True
+
+    def _insert(self, root: TrieNode, word: str, weight: Optional[float]) -> bool:
+        """Insert the word below the root and return True if it is a new word."""
+        if self._compressed:
+            path = self._insert_radix(root, word)
+            node = path[-1]
+        else:
+            # Create a pointer to the root
+            node = root
+            path = [node]
+
+            # Check if the character is a child of the root
+            for char in word:
+                # Create a new branch if the character is not found
+                if char not in node.children:
+                    node.children[char] = TrieNode()
+                # Traverse to the node storing the character 
+                node = node.children[char]
+                path.append(node)
+
+        # Update the weight of the word and the maximum weights on its path
+        if weight is not None or not node.end_of_word:
+            old_weight = node.weight if node.end_of_word else 0
+            node.weight = weight or 0
+            if node.weight >= old_weight:
+                self._raise_max_weight(path, node.weight)
+            else:
+                self._refresh_max_weight(path)
             
+        # Re-inserting a stored word does not change the counts
+        if node.end_of_word:
+            return False
+
         # Set the node storing the last character of the word to be the end_of_word
         node.end_of_word = True
 
-        # Increment the number of words in the trie by 1
-        self._size += 1
+        # Count the word in every subtree on its path
+        for parent in path:
+            parent.count += 1
 
         return True
     
@@ -194,50 +817,78 @@ class Trie:
             >>> trie = Trie()
             >>> trie.delete('...')
         """
-        if not isinstance(word, str) or not word:
-            raise TypeError("The input parameter 'word' must be a non-empty string")
+        word = self._key(word)
+        return self._write(word, False, lambda root: self._delete(root, word))
 
-        if self._lower_case:
-            word = word.lower()
-        
-        # Return False if the word to be deleted is not present in the trie.
-        if not self.find(word):
+    def _delete(self, root: TrieNode, word: str) -> bool:
+        """Delete the word below the root and return False if it is not present."""
+        if self._compressed:
+            return self._delete_radix(root, word)
+
+        # Record the path from the root to the node storing the word
+        path = [root]
+        for char in word:
+            child = path[-1].children.get(char)
+            # Return False if the word to be deleted is not present in the trie.
+            if child is None:
+                return False
+            path.append(child)
+        if not path[-1].end_of_word:
             return False
 
-        def dfs(i: int, node: TrieNode) -> None:
-            # Stop the recusion whether after reaching the last character.
-            # Set the end of word attribute to be False
-            # and return True to indicate the node is deletable if it is a leaf.
-            if i == len(word) - 1:
-                node.end_of_word = False
-                return not node.children
-            
-            # The variable 'removable' indicates whether
-            # the subtree of the node could be deleted. 
-            removable = dfs(i + 1, node.children[word[i + 1]])
-
-            # If the subtree is removable and the current node 
-            # and only has 1 child, remove its child.
-            if removable and len(node.children) == 1:
-                del node.children[word[i + 1]]
-            
-            # Return current node to be deletable if it is the not 
-            # the end of a word, has no children and has a removable subtree.
-            return (
-                not node.end_of_word and 
-                not node.children and
-                removable
-            )
+        # Uncount the word in every subtree on its path
+        for parent in path:
+            parent.count -= 1
 
-        # Start the dfs at the first character of the word
-        node = self._root
-        dfs(0, node.children[word[0]])
+        node = path[-1]
+        node.end_of_word = False
+
+        # Unlink the highest node on the path left without words,
+        # which removes the nodes below it along with it
+        for i in range(1, len(path)):
+            if not path[i].count:
+                del path[i - 1].children[word[i - 1]]
+                del path[i:]
+                break
 
-        # Decrement the number of words in the trie by 1
-        self._size -= 1
+        # Remove the weight of the word from the maximum weights on its path
+        node.weight = 0
+        self._refresh_max_weight(path)
 
         return True
 
+    def snapshot(self) -> Trie:
+        """Return a copy of a copy-on-write trie in O(1), for running several
+        queries against the same version of the words.
+
+        The snapshot shares every node with the trie. As the writers of both
+        only modify copies of the nodes, the snapshot does not see the later
+        insertions and deletions of the trie, and vice versa.
+
+        Returns:
+            Trie: A copy-on-write trie with the current words of the trie.
+
+        Raises:
+            TypeError: The trie is not a copy-on-write trie.
+
+        Example:
+            >>> trie = Trie(copy_on_write=True)
+            >>> snapshot = trie.snapshot()
+            >>> total = snapshot.count_prefix('...')
+            >>> page = snapshot.complete('...', limit=10, order='lex')
+        """
+        if not self._copy_on_write:
+            raise TypeError("Only a copy-on-write trie supports snapshots.")
+
+        # Wait for the writer to publish both the root and the size
+        with self._write_lock:
+            snapshot = copy.copy(self)
+        snapshot._write_lock = threading.Lock()
+
+        # The modifications of the snapshot are not recorded
+        snapshot._journal = None
+        return snapshot
+
     def find(self, word: str) -> bool:
         """Search whether the word is stored in the trie.
 
@@ -254,11 +905,11 @@ class Trie:
             >>> trie = Trie()
             >>> is_found = trie.find('...')
         """
-        if not isinstance(word, str) or not word:
-            raise TypeError("The input parameter 'word' must be a non-empty string")
-        
-        if self._lower_case:
-            word = word.lower()
+        word = self._key(word)
+
+        if self._compressed:
+            node, rest = self._locate(word)
+            return node is not None and not rest and node.end_of_word
 
         node = self._root
         # Check every character in the word
@@ -272,55 +923,1536 @@ class Trie:
         # Return true if the last char is marked as the end of word
         return node.end_of_word
 
-    def complete(self, word: str) -> List[str]:
+    def find_many(self, words: Iterable[str]) -> List[bool]:
+        """Search whether each word of a batch is stored in the trie.
+
+        The words are validated and converted to lower-case once, and every
+        distinct word is only searched once.
+
+        Args:
+            words (Iterable[str]): The words to be searched for in the trie.
+
+        Returns:
+            List[bool]: Whether each word is found, in the order of the input.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+
+        Example:
+            >>> trie = Trie()
+            >>> is_found = trie.find_many(['...', '...'])
+        """
+        keys = self._batch_keys(words)
+        locate = self._locate
+        is_word = self._is_word
+        found = {}
+        res = []
+
+        for key in keys:
+            hit = found.get(key)
+            if hit is None:
+                node, rest = locate(key)
+                hit = found[key] = node is not None and not rest and bool(is_word(node))
+            res.append(hit)
+
+        return res
+
+    def insert_many(self, words: Iterable[str]) -> List[bool]:
+        """Insert a batch of words into the trie.
+
+        The words are validated and converted to lower-case once, then
+        inserted in sorted order, so every word continues from the nodes on
+        the path of the previous word and the counts of the shared nodes are
+        updated once. A copy-on-write trie publishes the whole batch at once.
+        The stored words keep their weights and the new words have a weight
+        of 0, as with 'insert'.
+
+        Args:
+            words (Iterable[str]): The words to be inserted into the trie.
+
+        Returns:
+            List[bool]: Whether each word is new to the trie, in the order of
+                the input, where only the first of repeated words is new.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+            ValueError: A character of a word is not in the alphabet.
+
+        Example:
+            >>> trie = Trie()
+            >>> is_new = trie.insert_many(['...', '...'])
+        """
+        keys = self._batch_keys(words)
+        for key in keys:
+            self._check_alphabet(key)
+        return self._write_many(keys, True)
+
+    def delete_many(self, words: Iterable[str]) -> List[bool]:
+        """Delete a batch of words in the trie.
+
+        The words are validated and converted to lower-case once, then
+        deleted in sorted order, so every word continues from the nodes on the
+        path of the previous word and the shared nodes are updated once.
+        A copy-on-write trie publishes the whole batch at once.
+
+        Args:
+            words (Iterable[str]): The words to be deleted in the trie.
+
+        Returns:
+            List[bool]: Whether each word is deleted, in the order of the input,
+                where only the first of repeated words is deleted.
+
+        Raises:
+            TypeError: Errors caused by non-string or empty words.
+
+        Example:
+            >>> trie = Trie()
+            >>> is_deleted = trie.delete_many(['...', '...'])
+        """
+        return self._write_many(self._batch_keys(words), False)
+
+    def merge(self, other: Trie) -> int:
+        """Insert the words of another trie into the trie.
+
+        Both tries are walked together, and every subtree of the other trie
+        without a counterpart in the trie is attached whole, so the merge
+        takes time proportional to the nodes shared by both tries rather than
+        to their numbers of words. The subtrees are shared by reference if
+        both tries are copy-on-write, as their nodes are never modified once
+        published, and copied otherwise. A copy-on-write trie publishes the
+        merged words at once. A word stored in both tries keeps the greater of
+        its weights.
+
+        A trie with a different layout, lower-case conversion or alphabet, or
+        a FrozenTrie, is first loaded into a temporary trie of the layout of
+        the trie, which takes time proportional to its number of words.
+
+        Args:
+            other (Trie): The trie whose words are inserted.
+
+        Returns:
+            int: The number of words new to the trie.
+
+        Raises:
+            TypeError: The input parameter 'other' is not a Trie object, or
+                only one of the tries stores bytes.
+            ValueError: A character of a word is not in the alphabet.
+
+        Example:
+            >>> trie = Trie.from_list(['...', '...'])
+            >>> shard = Trie.from_list(['...', '...'])
+            >>> num_new_words = trie.merge(shard)
+        """
+        other_root, share = self._nodes_of(other)
+        if other_root is self._root:
+            return 0
+
+        # The new words and the raised weights are only listed if they are
+        # recorded by the journal or an index
+        changes = [] if self._tracks_words() else None
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self._write_lock or nullcontext():
+                root = self._root.copy() if self._copy_on_write else self._root
+                self._merge_nodes(root, other_root, share, changes)
+                added = root.count - self._size
+                self._root = root
+                self._size = root.count
+
+                if changes is None:
+                    if added:
+                        self._generation += 1
+                else:
+                    journal = self._journal
+                    for word, weight, new in changes:
+                        if new:
+                            self._modified(word, True)
+                        if journal is not None:
+                            journal.append(word, True, weight if weight or not new else None)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return added
+
+    def union(self, other: Trie) -> Trie:
+        """Return a new trie of the words stored in either trie.
+
+        The new trie has the class and the options of the trie. It shares the
+        nodes of a copy-on-write trie and copies the nodes of another trie,
+        then merges the other trie as 'merge' does.
+
+        Args:
+            other (Trie): The trie whose words are added.
+
+        Returns:
+            Trie: A new trie of the words of both tries.
+
+        Raises:
+            TypeError: The input parameter 'other' is not a Trie object, or
+                only one of the tries stores bytes.
+            ValueError: A character of a word is not in the alphabet.
+
+        Example:
+            >>> words = Trie.from_list(['...', '...'])
+            >>> all_words = words.union(Trie.from_list(['...', '...']))
+        """
+        root = self._root
+        trie = self._with_root(root if self._copy_on_write else self._copy_subtree(root))
+        trie.merge(other)
+        return trie
+
+    def intersection(self, other: Trie) -> Trie:
+        """Return a new trie of the words stored in both tries.
+
+        Both tries are walked together and only their shared nodes are
+        visited, so the intersection takes time proportional to the overlap
+        of the tries. A word keeps the greater of its weights.
+
+        Args:
+            other (Trie): The trie whose words are kept.
+
+        Returns:
+            Trie: A new trie of the class and the options of the trie.
+
+        Raises:
+            TypeError: The input parameter 'other' is not a Trie object, or
+                only one of the tries stores bytes.
+
+        Example:
+            >>> words = Trie.from_list(['...', '...'])
+            >>> shared_words = words.intersection(Trie.from_list(['...', '...']))
+        """
+        other_root, _ = self._nodes_of(other)
+        return self._with_root(self._combine(self._root, other_root, False))
+
+    def difference(self, other: Trie) -> Trie:
+        """Return a new trie of the words stored in the trie but not in the
+        other trie.
+
+        Both tries are walked together, and every subtree of the trie without
+        a counterpart in the other trie is kept whole, as 'merge' does. The
+        words keep their weights.
+
+        Args:
+            other (Trie): The trie whose words are removed.
+
+        Returns:
+            Trie: A new trie of the class and the options of the trie.
+
+        Raises:
+            TypeError: The input parameter 'other' is not a Trie object, or
+                only one of the tries stores bytes.
+
+        Example:
+            >>> words = Trie.from_list(['...', '...'])
+            >>> new_words = words.difference(Trie.from_list(['...', '...']))
+        """
+        other_root, _ = self._nodes_of(other)
+        return self._with_root(self._combine(self._root, other_root, True))
+
+    def complete(
+        self,
+        word: str,
+        limit: Optional[int] = None,
+        order: str = 'length',
+        offset: int = 0
+    ) -> List[str]:
         """Complete the given word by searching words in the trie with the same prefix.
 
         Args:
             word (str): A word to be completed.
+            limit (int): The maximum number of return words. (Default=None)
+            order (str): The order of the return words, see 'iter_complete'.
+                (Default='length')
+            offset (int): The number of leading words to be skipped, see
+                'iter_complete'. (Default=0)
         
         Returns:
             List[str]: A list of possible words in the trie.
 
         Raises:
             TypeError: Errors caused by non-string input of 'word'.
+            ValueError: Invalid 'limit', 'order' or 'offset'.
 
         Example:
             >>> trie = Trie()
             >>> results = trie.complete('...')
+            >>> suggestions = trie.complete('...', limit=10)
+            >>> page = trie.complete('...', limit=10, order='lex', offset=20)
         """
-        if not isinstance(word, str):
-            raise TypeError("The input parameter 'word' must be a string")
-        
-        if self._lower_case:
-            word = word.lower()
+        cache = self._cache
+        if cache is None:
+            return list(self.iter_complete(word, limit, order, offset))
+
+        prefix = self._key(word, 'prefix', empty=True)
+        key = ('complete', prefix, limit, order, offset)
+        res = cache.get(key, self._generation)
+        if res is None:
+            res = list(self.iter_complete(word, limit, order, offset))
+            cache.put(key, res, self._generation, ('prefix', prefix))
+        return res
+
+    def iter_complete(
+        self,
+        prefix: str,
+        limit: Optional[int] = None,
+        order: str = 'length',
+        offset: int = 0
+    ) -> Iterator[str]:
+        """Lazily yield the words in the trie starting with the prefix.
+
+        The words are generated while traversing the subtree of the prefix,
+        so the cost of taking the first few words does not depend on the
+        size of the subtree.
+
+        Args:
+            prefix (str):
+                A word to be completed, which is not yielded itself.
+            limit (int):
+                The maximum number of yielded words. (Default=None)
+            order (str):
+                'length' to yield shorter words first using a breadth-first
+                traversal, 'lex' to yield the words in lexicographic order, or
+                'none' to yield the words in the order of the trie.
+                (Default='length')
+            offset (int):
+                The number of leading words to be skipped. With the 'lex' and
+                'none' orders, whole subtrees are skipped using the number of
+                words stored below every node. (Default=0)
+
+        Returns:
+            Iterator[str]: An iterator over the possible words in the trie.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'prefix'.
+            ValueError: Invalid 'limit', 'order' or 'offset'.
+
+        Example:
+            >>> trie = Trie()
+            >>> for word in trie.iter_complete('...', order='lex'):
+            >>>     ...
+        """
+        words, skip = self._completions(prefix, limit, order, offset)
+        if limit is not None or skip:
+            words = islice(words, skip, None if limit is None else skip + limit)
+        if self._bytes_keys:
+            words = map(self._word, words)
+        return words
+
+    async def acomplete(
+        self,
+        word: str,
+        limit: Optional[int] = None,
+        order: str = 'length',
+        offset: int = 0,
+        deadline: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        chunk_size: int = 1000
+    ) -> Tuple[List[str], bool]:
+        """Complete the given word like 'complete' while giving control back to
+        the event loop every 'chunk_size' visited nodes.
+
+        The search honors the cancellation of its task whenever it gives
+        control back, and stops early once it has run for 'deadline' seconds
+        or visited 'max_nodes' nodes, returning the words found so far.
+
+        Args:
+            word (str): A word to be completed.
+            limit, order, offset: See 'complete'.
+            deadline (int | float): The number of seconds after which the search
+                stops, checked every 'chunk_size' nodes. (Default=None)
+            max_nodes (int): The maximum number of visited nodes. (Default=None)
+            chunk_size (int): The number of nodes visited between giving
+                control back to the event loop. (Default=1000)
+
+        Returns:
+            Tuple[List[str], bool]: The words found and whether the search was
+                stopped by the deadline or the node budget before finishing.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'word'.
+            ValueError: Invalid 'limit', 'order', 'offset', 'deadline',
+                'max_nodes' or 'chunk_size'.
+            RuntimeError: The trie was modified while the search gave control
+                back, unless it is a copy-on-write trie.
+
+        Example:
+            >>> trie = Trie()
+            >>> results, truncated = await trie.acomplete('...', deadline=0.05)
+        """
+        self._check_budget(deadline, max_nodes, chunk_size)
+
+        cache = self._cache
+        if cache is not None:
+            prefix = self._key(word, 'prefix', empty=True)
+            key = ('complete', prefix, limit, order, offset)
+            res = cache.get(key, self._generation)
+            if res is not None:
+                return res, False
+
+        generation = self._generation
+        steps, skip = self._completions(word, limit, order, offset, checkpoints=True)
+        res, truncated = await self._run_chunked(
+            steps, skip, limit, deadline, max_nodes, chunk_size
+        )
+        res = self._words(res)
+
+        # Only cache the complete results of the current generation
+        if cache is not None and not truncated:
+            cache.put(key, res, generation, ('prefix', prefix))
+        return res, truncated
+
+    def _completions(
+        self,
+        prefix: str,
+        limit: Optional[int],
+        order: str,
+        offset: int,
+        checkpoints: bool = False
+    ) -> Tuple[Iterator[Optional[str]], int]:
+        """Validate the arguments of 'iter_complete' and return an iterator over
+        the completions of the prefix, and the number of leading completions
+        it yields which have to be skipped."""
+        prefix = self._key(prefix, 'prefix', empty=True)
+
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError("The input parameter 'limit' must be a positive integer")
+
+        if order not in ('length', 'lex', 'none'):
+            raise ValueError(
+                "The input parameter 'order' must be one of 'length', 'lex' or 'none'"
+            )
+
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("The input parameter 'offset' must be a non-negative integer")
+
+        # Find the node storing the last character of the input string
+        node, rest = self._locate(prefix)
+
+        # Return an empty iterator if the input string is not found
+        if node is None:
+            return iter(()), 0
+
+        # The depth-first orders skip the subtrees by their counts,
+        # while the breadth-first order has to generate the skipped words
+        skip = offset if order == 'length' else 0
+
+        # The node is only a completion if the prefix ends in
+        # the middle of its label
+        words = self._iter_subtree(
+            node, prefix + rest, order, bool(rest), offset - skip, checkpoints
+        )
+        return words, skip
+
+    def contains_search(
+        self,
+        fragment: str,
+        limit: Optional[int] = None,
+        threshold: int = 0
+    ) -> List[str]:
+        """Return the words in the trie containing the fragment anywhere, e.g.
+        the middle of a product name, rather than only as a prefix.
+
+        With the index built by 'build_infix_index', the search takes time
+        proportional to the length of the fragment and the number of matching
+        words, otherwise every word of the trie is scanned.
+
+        Args:
+            fragment (str):
+                The fragment to be searched for in the words.
+            limit (int):
+                The maximum number of return words. (Default=None)
+            threshold (int):
+                The maximum Levenshtein distance difference between the
+                fragment and a substring of the words, where 0 only
+                matches the exact fragment. (Default=0)
+
+        Returns:
+            List[str]: A list of the matching words in lexicographic order.
 
+        Raises:
+            TypeError: Errors caused by non-string input of 'fragment'.
+            ValueError: Invalid data type and range of input parameters
+                'limit' or 'threshold'.
+
+        Example:
+            >>> trie = Trie.from_list([...])
+            >>> trie.build_infix_index()
+            >>> results = trie.contains_search('phone', limit=10)
+            >>> suggestions = trie.contains_search('fone', limit=10, threshold=1)
+        """
+        fragment = self._key(fragment, 'fragment', empty=True)
+
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError("The input parameter 'limit' must be a positive integer")
+
+        if not isinstance(threshold, int) or isinstance(threshold, bool) or threshold < 0:
+            raise ValueError(
+                "The input parameter 'threshold' must be a non-negative integer"
+            )
+
+        matcher = make_matcher(fragment, threshold)
+        index = self._infix_index
+        if index is not None:
+            if threshold:
+                words = index.fuzzy_search(matcher)
+            else:
+                words = index.search(fragment)
+            if limit is not None:
+                return self._words(heapq.nsmallest(limit, words))
+            return self._words(sorted(words))
+
+        # Scan the words in lexicographic order until enough words are found
+        from .infix import contains
+        words = (
+            word for word in self._iter_subtree(self._root, '', 'lex', False)
+            if contains(word, matcher)
+        )
+        return self._words(list(islice(words, limit)))
+
+    def count_prefix(self, prefix: str) -> int:
+        """Return the number of words in the trie starting with the prefix,
+        including the prefix itself, in O(len(prefix)).
+
+        Args:
+            prefix (str): A prefix of the words to be counted.
+
+        Returns:
+            int: The number of words starting with the prefix.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'prefix'.
+
+        Example:
+            >>> trie = Trie()
+            >>> num_words = trie.count_prefix('...')
+        """
+        prefix = self._key(prefix, 'prefix', empty=True)
+        node, _ = self._locate(prefix)
+        return 0 if node is None else self._count(node)
+
+    def rank(self, word: str) -> int:
+        """Return the number of words in the trie lexicographically smaller
+        than the word, i.e. the index of the word in the sorted words.
+
+        The word does not need to be stored in the trie, and the subtrees on
+        the left of its path are counted without being visited.
+
+        Args:
+            word (str): A word to be ranked.
+
+        Returns:
+            int: The number of words smaller than the word.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'word'.
+
+        Example:
+            >>> trie = Trie()
+            >>> index = trie.rank('...')
+        """
+        word = self._key(word, empty=True)
+        count_of = self._count
+        node = self._root
+        res = 0
+        i = 0
+
+        while i < len(word):
+            # The word of the node is a proper prefix of the word
+            if self._is_word(node):
+                res += 1
+
+            # Count the subtrees of the labels smaller than the rest of the
+            # word, comparing a label with as many characters of the word
+            next_node = None
+            for label, child in self._edges(node):
+                if word.startswith(label, i):
+                    next_node, next_label = child, label
+                elif label < word[i:i + len(label)]:
+                    res += count_of(child)
+
+            # Stop if the word leaves the trie
+            if next_node is None:
+                break
+            node = next_node
+            i += len(next_label)
+
+        return res
+
+    def select(self, i: int) -> str:
+        """Return the word at the index i of the sorted words in the trie.
+
+        Args:
+            i (int): The index of the word, which may be negative
+                to count from the end.
+
+        Returns:
+            str: The i-th smallest word in the trie.
+
+        Raises:
+            ValueError: Invalid data type of input parameter 'i'.
+            IndexError: The index is out of range.
+
+        Example:
+            >>> trie = Trie()
+            >>> first_word = trie.select(0)
+        """
+        if not isinstance(i, int) or isinstance(i, bool):
+            raise ValueError("The input parameter 'i' must be an integer")
+
+        # Count the words of the root to be consistent with the root
+        # published by a concurrent writer
+        count_of = self._count
         node = self._root
+        size = count_of(node)
+        labels = []
+
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("The index is out of range.")
+
+        while True:
+            if self._is_word(node):
+                if i == 0:
+                    return self._word(''.join(labels))
+                i -= 1
+
+            # Descend into the child whose subtree holds the i-th word
+            for label, child in sorted(self._edges(node), key=itemgetter(0)):
+                num_words = count_of(child)
+                if i < num_words:
+                    break
+                i -= num_words
+            node = child
+            labels.append(label)
+
+    def top_k_complete(self, prefix: str, k: int) -> List[str]:
+        """Return the k completions of the prefix with the greatest weights.
+
+        Every node stores the maximum weight of the words in its subtree,
+        so the subtrees are visited best-first and the search stops once
+        k words are found, without visiting the rest of the subtree of the
+        prefix. Words with the same weight are returned in the order of
+        visiting.
+
+        Args:
+            prefix (str): A word to be completed, which is not returned itself.
+            k (int): The maximum number of return words.
+
+        Returns:
+            List[str]: A list of words ordered by descending weight.
+
+        Raises:
+            TypeError: Errors caused by non-string input of 'prefix'.
+            ValueError: Invalid data type and range of input parameter 'k'.
+
+        Example:
+            >>> trie = Trie()
+            >>> trie.insert('...', weight=3)
+            >>> results = trie.top_k_complete('...', k=5)
+        """
+        prefix = self._key(prefix, 'prefix', empty=True)
+
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("The input parameter 'k' must be a positive integer")
+
+        node, rest = self._locate(prefix)
+        if node is None:
+            return []
+
         res = []
+        seq = count()
+        # Nodes are ranked by the best weight of their subtree and words by
+        # their own weight, a word is final once it is at the top of the heap
+        heap = [(-node.max_weight, next(seq), node, prefix + rest)]
+        while heap and len(res) < k:
+            _, _, node, word = heapq.heappop(heap)
+            if node is None:
+                res.append(word)
+                continue
 
-        # Find the node storing the last character of the input string
-        for char in word:
-            # Return an empty list if the input string is not found
-            if char not in node.children:
-                return []
-            node = node.children[char]
+            # The node is only a completion if the prefix ends in
+            # the middle of its label
+            if node.end_of_word and (word != prefix or rest):
+                heapq.heappush(heap, (-node.weight, next(seq), None, word))
+            for label, child in self._edges(node):
+                heapq.heappush(heap, (-child.max_weight, next(seq), child, word + label))
+
+        return self._words(res)
+
+    def _iter_subtree(
+        self,
+        node: TrieNode,
+        word: str,
+        order: str,
+        include_node: bool,
+        skip: int = 0,
+        checkpoints: bool = False
+    ) -> Iterator[Optional[str]]:
+        """Yield the words stored below the node, whose word is 'word',
+        after skipping the first 'skip' words of a depth-first order.
+        With 'checkpoints' set, None is yielded before visiting every node."""
+        edges = self._edges
+        is_word = self._is_word
+
+        if include_node and is_word(node):
+            if skip:
+                skip -= 1
+            else:
+                yield word
+
+        if order == 'length' and not self._compressed:
+            # Every word of a level is yielded before the next level is visited
+            queue = deque([(node, word)])
+            while queue:
+                node, word = queue.popleft()
+                if checkpoints:
+                    yield None
+                for label, child in edges(node):
+                    child_word = word + label
+                    if is_word(child):
+                        yield child_word
+                    queue.append((child, child_word))
+
+        elif order == 'length':
+            # The labels of a compressed trie differ in length, so the nodes
+            # are visited in order of the length of their words
+            seq = count()
+            heap = []
+            while True:
+                for label, child in edges(node):
+                    child_word = word + label
+                    heapq.heappush(heap, (len(child_word), next(seq), child, child_word))
+                if not heap:
+                    break
+                _, _, node, word = heapq.heappop(heap)
+                if checkpoints:
+                    yield None
+                if is_word(node):
+                    yield word
+
+        else:
+            # Visit the children depth-first in lexicographic or stored order.
+            # The labels on the path of the visited node are kept in a shared
+            # buffer, so a word is only built when it is yielded.
+            count_of = self._count
+            buffer = [word]
+            stack = []
+            depth = 1
+            expand = True
+            while True:
+                if expand:
+                    if order == 'lex':
+                        children = sorted(edges(node), key=itemgetter(0), reverse=True)
+                    else:
+                        children = reversed(edges(node))
+                    for label, child in children:
+                        stack.append((child, depth, label))
+                if not stack:
+                    break
+                node, depth, label = stack.pop()
+                del buffer[depth:]
+                buffer.append(label)
+                depth += 1
+                expand = True
+                if checkpoints:
+                    yield None
+
+                # Skip the whole subtree if all of its words are skipped
+                if skip:
+                    num_words = count_of(node)
+                    if skip >= num_words:
+                        skip -= num_words
+                        expand = False
+                        continue
+                    if is_word(node):
+                        skip -= 1
+                        continue
+
+                if is_word(node):
+                    yield ''.join(buffer)
+
+    def _extend(self, words: Iterable[str], sorted_input: bool) -> None:
+        """Insert the words into an empty trie, streaming them into the trie
+        if they are in ascending order."""
+        # The nodes never form reference cycles, so the cyclic garbage
+        # collector is paused instead of repeatedly scanning the new nodes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # A compressed trie splits and merges edges on insertion,
+            # so its words are always inserted one by one
+            if sorted_input and not self._compressed:
+                self._extend_sorted(words)
+            else:
+                for w in words:
+                    self.insert(w)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _extend_sorted(self, words: Iterable[str]) -> None:
+        """Insert words in ascending order into an empty plain trie."""
+        # The nodes on the path of the previous word
+        stack = [self._root]
+        prev = ''
+
+        for word in words:
+            word = self._key(word)
+            self._check_alphabet(word)
+
+            if word <= prev:
+                # Skip the duplicates of the previous word
+                if word == prev:
+                    continue
+                raise ValueError(
+                    f"The input words must be sorted, but {self._word(word)!r} "
+                    f"follows {self._word(prev)!r}."
+                )
+
+            i = _shared_prefix(word, prev)
+
+            # The rest of the word is greater than any path inserted below
+            # the last shared node, so its nodes are created without lookups
+            del stack[i + 1:]
+            for node in stack:
+                node.count += 1
+            node = stack[-1]
+            for char in word[i:]:
+                child = TrieNode()
+                child.count = 1
+                node.children[char] = child
+                stack.append(child)
+                node = child
+
+            node.end_of_word = True
+            self._size += 1
+            prev = word
+
+    @staticmethod
+    def _check_budget(
+        deadline: Optional[float],
+        max_nodes: Optional[int],
+        chunk_size: int
+    ) -> None:
+        """Validate the budget of an asynchronous search."""
+        if deadline is not None and (
+            not isinstance(deadline, (int, float)) or isinstance(deadline, bool) or
+            not deadline >= 0
+        ):
+            raise ValueError("The input parameter 'deadline' must be a non-negative number")
+
+        if max_nodes is not None and (not isinstance(max_nodes, int) or max_nodes < 1):
+            raise ValueError("The input parameter 'max_nodes' must be a positive integer")
+
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("The input parameter 'chunk_size' must be a positive integer")
+
+    async def _run_chunked(
+        self,
+        steps: Iterator,
+        skip: int,
+        limit: Optional[int],
+        deadline: Optional[float],
+        max_nodes: Optional[int],
+        chunk_size: int
+    ) -> Tuple[list, bool]:
+        """Collect the results of a traversal which yields None before visiting
+        every node, and return them with whether the budget stopped the
+        traversal before it finished."""
+        stop_time = None if deadline is None else time.monotonic() + deadline
+        generation = self._generation
+        res = []
+        visited = 0
+
+        for item in steps:
+            if item is not None:
+                if skip:
+                    skip -= 1
+                    continue
+                res.append(item)
+                if len(res) == limit:
+                    break
+                continue
+
+            # Stop before visiting a node beyond the budget
+            visited += 1
+            if max_nodes is not None and visited > max_nodes:
+                return res, True
+
+            if visited % chunk_size == 0:
+                if stop_time is not None and time.monotonic() >= stop_time:
+                    return res, True
+
+                # Let the other tasks run, which raises CancelledError
+                # if the search is cancelled in the meantime
+                await asyncio.sleep(0)
+
+                # Only the nodes of a copy-on-write trie are never modified
+                if generation != self._generation and not self._copy_on_write:
+                    raise RuntimeError("The trie was modified during the search.")
+
+        return res, False
+
+    def _write(
+        self,
+        word: str,
+        inserted: bool,
+        modify: Callable[[TrieNode], bool],
+        weight: Optional[float] = None
+    ) -> bool:
+        """Apply the modification of the word to the root and return whether
+        it changed the words. A copy-on-write trie modifies a copy of the path
+        of the word instead, which is published in one assignment.
+
+        The journal records the modifications changing the words or the
+        weight of a word in the order they are applied."""
+        with self._write_lock or nullcontext():
+            root = self._root
+            if self._copy_on_write:
+                root = root.copy()
+                self._copy_path(root, word)
+            changed = modify(root)
+            self._root = root
+            if changed:
+                self._size += 1 if inserted else -1
+                self._modified(word, inserted)
+            if self._journal is not None and (changed or weight is not None):
+                self._journal.append(word, inserted, weight)
+        return changed
+
+    def _replay(self, op: int, word: str, weight: Optional[float]) -> None:
+        """Apply a record of the journal to the trie."""
+        if op == OP_DELETE:
+            self._write(word, False, lambda root: self._delete(root, word))
+        else:
+            self._write(word, True, lambda root: self._insert(root, word, weight), weight)
+
+    def _iter_weights(self, root: TrieNode) -> Iterator[Tuple[str, float]]:
+        """Yield the (word, weight) pairs below the root in lexicographic order."""
+        stack = [(root, '')]
+        while stack:
+            node, word = stack.pop()
+            if node.end_of_word:
+                yield word, node.weight
+
+            # The edges of a compressed trie are keyed by their first character
+            for char, child in sorted(node.children.items(), reverse=True):
+                stack.append((child, word + (child.label if self._compressed else char)))
+
+    def _write_many(self, keys: List[str], inserted: bool) -> List[bool]:
+        """Insert or delete a batch of validated words and return whether each
+        of them changed the words, in the order of the batch."""
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        # The nodes never form reference cycles, so the cyclic garbage
+        # collector is paused instead of repeatedly scanning the new nodes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self._write_lock or nullcontext():
+                root = self._root.copy() if self._copy_on_write else self._root
+                if self._compressed:
+                    # Splitting and merging the edges does not keep the path of
+                    # the previous word, so the words are modified one by one
+                    res = [False] * len(keys)
+                    for i in order:
+                        key = keys[i]
+                        if self._copy_on_write:
+                            self._copy_path(root, key)
+                        if inserted:
+                            res[i] = self._insert(root, key, None)
+                        else:
+                            res[i] = self._delete(root, key)
+                else:
+                    res = self._write_sorted(root, keys, order, inserted)
+                self._root = root
+
+                journal = self._journal
+                for i in order:
+                    if res[i]:
+                        self._size += 1 if inserted else -1
+                        self._modified(keys[i], inserted)
+                        if journal is not None:
+                            journal.append(keys[i], inserted)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return res
+
+    def _write_sorted(
+        self,
+        root: TrieNode,
+        keys: List[str],
+        order: List[int],
+        inserted: bool
+    ) -> List[bool]:
+        """Insert or delete the words of a plain trie in the sorted order of
+        their indices, and return whether each of them changed the words."""
+        res = [False] * len(keys)
+        copy_on_write = self._copy_on_write
+
+        # Every entry holds a node on the path of the previous word, the
+        # character of its edge, the pending change of its count and whether
+        # its maximum weight has to be recomputed. The entries are settled
+        # once the following words leave their subtrees.
+        stack = [[root, '', 0, False]]
+        prev = ''
+
+        for i in order:
+            key = keys[i]
+            if key == prev:
+                continue
+
+            # Settle the nodes below the prefix shared with the previous word
+            shared = _shared_prefix(prev, key)
+            while len(stack) > shared + 1:
+                self._settle(stack)
+            prev = key
+
+            # Continue from the deepest node shared with the previous word
+            node = stack[-1][0]
+            for char in key[len(stack) - 1:]:
+                child = node.children.get(char)
+                if child is None:
+                    if not inserted:
+                        break
+                    child = node.children[char] = TrieNode()
+                elif copy_on_write:
+                    # The sorted words never come back to a settled node,
+                    # so every node is copied once
+                    child = node.children[char] = child.copy()
+                node = child
+                stack.append([node, char, 0, False])
+            else:
+                if node.end_of_word == inserted:
+                    continue
+                node.end_of_word = inserted
+                entry = stack[-1]
+                entry[2] += 1 if inserted else -1
+                if node.weight:
+                    node.weight = 0
+                    entry[3] = True
+                res[i] = True
+
+        while len(stack) > 1:
+            self._settle(stack)
+        root.count += stack[0][2]
+        if stack[0][3]:
+            self._refresh_max_weight([root])
+
+        return res
+
+    def _nodes_of(self, other: Trie) -> Tuple[TrieNode, bool]:
+        """Return the root of the nodes of the other trie in the layout of the
+        trie, and whether the trie may share them."""
+        if not isinstance(other, Trie):
+            raise TypeError("The input parameter 'other' must be a Trie object.")
+        if other._bytes_keys != self._bytes_keys:
+            raise TypeError("The tries must either both store strings or both store bytes.")
+
+        # The nodes of a copy-on-write trie are never modified once published
+        root = other._root
+        if isinstance(root, TrieNode) and other._compressed == self._compressed and (
+            other._lower_case or not self._lower_case
+        ) and (
+            self._alphabet is None or
+            other._alphabet is not None and other._alphabet <= self._alphabet
+        ):
+            return root, self._copy_on_write and other._copy_on_write
+
+        # Convert and validate the words in a temporary trie owned by nobody
+        trie = Trie(self._lower_case, self._compressed, alphabet=self.alphabet)
+        if isinstance(root, TrieNode):
+            for key, weight in other._iter_weights(root):
+                trie.insert(other._word(key), weight or None)
+        else:
+            trie.insert_many(other.iter_complete(other._word(''), order='lex'))
+        return trie._root, True
+
+    def _tracks_words(self) -> bool:
+        """Return True if the words inserted in bulk have to be passed one by
+        one to '_modified' or the journal."""
+        return (
+            self._journal is not None or self._infix_index is not None or
+            self._cache is not None and self._cache.scoped
+        )
+
+    def _empty(self) -> Trie:
+        """Return an empty trie of the class and the options of the trie."""
+        return type(self)(self._lower_case, self._compressed, self._copy_on_write, self.alphabet)
+
+    def _with_root(self, root: TrieNode) -> Trie:
+        """Return a trie of the class and the options of the trie holding the
+        words below the root."""
+        trie = self._empty()
+        trie._root = root
+        trie._size = root.count
+        return trie
+
+    def _copy_subtree(self, node: TrieNode) -> TrieNode:
+        """Return a copy of the node and all the nodes below it."""
+        node = node.copy()
+        stack = [node]
+
+        # The nodes never form reference cycles, so the cyclic garbage
+        # collector is paused instead of repeatedly scanning the new nodes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while stack:
+                parent = stack.pop()
+                children = parent.children
+                for char, child in children.items():
+                    child = children[char] = child.copy()
+                    stack.append(child)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return node
+
+    def _split(self, node: RadixNode, length: int) -> RadixNode:
+        """Return a new node holding the first characters of the label of a
+        compressed node, whose only child is a copy of the node holding the
+        rest of its label."""
+        child = node.copy()
+        child.label = node.label[length:]
+        middle = RadixNode(node.label[:length])
+        middle.children[child.label[0]] = child
+        middle.count = node.count
+        middle.max_weight = node.max_weight
+        return middle
+
+    def _align(
+        self,
+        node: TrieNode,
+        other: Optional[TrieNode]
+    ) -> Optional[Tuple[TrieNode, TrieNode]]:
+        """Return the nodes of two children on the same character where their
+        paths next meet, or None if no word is below both children. The edge
+        of a compressed child whose label extends the other label is split."""
+        if other is None:
+            return None
+        if not self._compressed:
+            return node, other
+
+        label, other_label = node.label, other.label
+        if label == other_label:
+            return node, other
+        if other_label.startswith(label):
+            return node, self._split(other, len(label))
+        if label.startswith(other_label):
+            return self._split(node, len(other_label)), other
+        return None
+
+    def _merge_nodes(
+        self,
+        root: TrieNode,
+        other_root: TrieNode,
+        share: bool,
+        changes: Optional[List[Tuple[str, float, bool]]]
+    ) -> None:
+        """Merge the nodes below the other root into the nodes below the root,
+        listing the (word, weight, is new) of the new words and the raised
+        weights into 'changes' unless it is None."""
+        compressed = self._compressed
+        copy_on_write = self._copy_on_write
+        iter_weights = self._iter_weights
+        visited = []
+        stack = [(root, other_root, '')]
+
+        def attach(parent: TrieNode, char: str, other_child: TrieNode, word: str) -> None:
+            """Attach a whole subtree of the other trie missing from the trie."""
+            parent.children[char] = other_child if share else self._copy_subtree(other_child)
+            if changes is not None:
+                prefix = word + (other_child.label if compressed else char)
+                changes.extend(
+                    (prefix + rest, weight, True) for rest, weight in iter_weights(other_child)
+                )
+
+        while stack:
+            node, other, word = stack.pop()
+            visited.append((node, other))
+
+            if other.end_of_word:
+                if not node.end_of_word:
+                    node.end_of_word = True
+                    node.weight = other.weight
+                    if changes is not None:
+                        changes.append((word, other.weight, True))
+                elif other.weight > node.weight:
+                    node.weight = other.weight
+                    if changes is not None:
+                        changes.append((word, other.weight, False))
+
+            children = node.children
+            for char, other_child in other.children.items():
+                child = children.get(char)
+                if child is None:
+                    attach(node, char, other_child, word)
+                    continue
+                if copy_on_write:
+                    child = children[char] = child.copy()
+
+                if compressed:
+                    label, other_label = child.label, other_child.label
+                    shared = _shared_prefix(label, other_label)
+                    if shared < len(label):
+                        # Split the edge of the trie where the edges diverge
+                        # or the edge of the other trie ends
+                        child = children[char] = self._split(child, shared)
+                        if shared < len(other_label):
+                            rest = other_child.copy()
+                            rest.label = other_label[shared:]
+                            attach(child, rest.label[0], rest, word + child.label)
+                            child.count += rest.count
+                            if rest.max_weight > child.max_weight:
+                                child.max_weight = rest.max_weight
+                            continue
+                    elif shared < len(other_label):
+                        other_child = self._split(other_child, shared)
+                    word_of_child = word + child.label
+                else:
+                    word_of_child = word + char
+
+                stack.append((child, other_child, word_of_child))
+
+        # Recompute the counts and the maximum weights from the bottom up
+        for node, other in reversed(visited):
+            node.count = node.end_of_word + sum(child.count for child in node.children.values())
+            if other.max_weight > node.max_weight:
+                node.max_weight = other.max_weight
+
+    def _combine(self, root: TrieNode, other_root: TrieNode, difference: bool) -> TrieNode:
+        """Return the root of new nodes holding the words below the root which
+        are also below the other root, or are not if 'difference' is set."""
+        compressed = self._compressed
+        node_class = RadixNode if compressed else TrieNode
+        share = self._copy_on_write
+        new_root = node_class()
+        visited = []
+        stack = [(root, other_root, new_root)]
+
+        # The nodes never form reference cycles, so the cyclic garbage
+        # collector is paused instead of repeatedly scanning the new nodes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while stack:
+                node, other, new_node = stack.pop()
+                visited.append(new_node)
+
+                if node.end_of_word and other.end_of_word != difference:
+                    new_node.end_of_word = True
+                    new_node.weight = node.weight if difference else max(node.weight, other.weight)
+
+                children = node.children
+                if not difference and len(other.children) < len(children):
+                    # The intersection only visits the children of the smaller node
+                    pairs = ((char, children.get(char)) for char in other.children)
+                else:
+                    pairs = children.items()
+
+                for char, child in pairs:
+                    if child is None:
+                        continue
+                    aligned = self._align(child, other.children.get(char))
+                    if aligned is None:
+                        # Keep the whole subtree missing from the other trie
+                        if difference:
+                            new_node.children[char] = child if share else self._copy_subtree(child)
+                        continue
+
+                    child, other_child = aligned
+                    new_child = node_class(child.label) if compressed else node_class()
+                    new_node.children[char] = new_child
+                    stack.append((child, other_child, new_child))
+
+            # Count the words from the bottom up, remove the subtrees left without
+            # words and merge the compressed nodes left with a single child
+            for node in reversed(visited):
+                children = node.children
+                best = node.weight if node.end_of_word else 0
+                num_words = int(node.end_of_word)
+                for char, child in list(children.items()):
+                    if not child.count:
+                        del children[char]
+                        continue
+                    num_words += child.count
+                    if child.max_weight > best:
+                        best = child.max_weight
+                node.count = num_words
+                node.max_weight = best
+
+                if (
+                    compressed and node is not new_root and
+                    not node.end_of_word and len(children) == 1
+                ):
+                    (child,) = children.values()
+                    node.label += child.label
+                    node.children = child.children
+                    node.end_of_word = child.end_of_word
+                    node.weight = child.weight
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return new_root
+
+    @staticmethod
+    def _settle(stack: list) -> None:
+        """Pop the last node of the stack of '_write_sorted', apply the pending
+        change of its count and maximum weight, and remove it if no word is
+        left in its subtree."""
+        node, char, delta, dirty = stack.pop()
+        parent = stack[-1]
+        if delta:
+            node.count += delta
+            parent[2] += delta
+
+        if not node.count:
+            del parent[0].children[char]
+            parent[3] = parent[3] or node.max_weight > 0
+        elif dirty:
+            best = node.weight if node.end_of_word else 0
+            for child in node.children.values():
+                if child.max_weight > best:
+                    best = child.max_weight
+            if best != node.max_weight:
+                node.max_weight = best
+                parent[3] = True
+
+    def _batch_keys(self, words: Iterable[str]) -> List[str]:
+        """Validate the words of a batch and convert them to lower-case."""
+        key = self._key
+        return [key(word) for word in words]
+
+    def _key(
+        self,
+        word: Union[str, bytes],
+        name: str = 'word',
+        empty: bool = False,
+        lower: bool = True
+    ) -> str:
+        """Validate the input parameter 'name' and return the string stored in
+        the trie for it, i.e. the decoded bytes of a bytes trie, converted to
+        lower-case unless 'lower' is False."""
+        if self._bytes_keys:
+            if not isinstance(word, BYTES_TYPES) or not (empty or word):
+                raise TypeError(
+                    f"The input parameter '{name}' must be a "
+                    f"{'' if empty else 'non-empty '}bytes-like object"
+                )
+            # Only the ASCII letters of the bytes are converted to lower-case
+            if lower and self._lower_case:
+                word = bytes(word).lower()
+            return str(word, 'latin-1')
+
+        if not isinstance(word, str) or not (empty or word):
+            raise TypeError(
+                f"The input parameter '{name}' must be a {'' if empty else 'non-empty '}string"
+            )
+        return word.lower() if lower and self._lower_case else word
+
+    def _word(self, key: str) -> Union[str, bytes]:
+        """Return the word of a string stored in the trie, which is encoded
+        back into bytes for a bytes trie."""
+        return key.encode('latin-1') if self._bytes_keys else key
+
+    def _words(self, keys: List[str]) -> list:
+        """Return the words of a list of strings stored in the trie."""
+        if self._bytes_keys:
+            return [key.encode('latin-1') for key in keys]
+        return keys
 
-        # Use backtracking to find all the combinations of words starting
-        # at the last character of the input string
-        cache = []
-        def dfs(node: TrieNode) -> None:
-            # Append the word to res if it is marked as the end of word
-            if node.end_of_word and cache:
-                res.append(word + ''.join(cache)) 
-
-            for child in node.children:
-                # Backtracking 
-                # Use a cache variable to store the combinations of the word
-                cache.append(child)
-                # Continue recursion on each child of the subtree
-                dfs(node.children[child])
-                # Remove the char from the cache once a combination have been added
-                cache.pop()
-
-        dfs(node)
-        # Return the list sorted by the length of each word
-        return sorted(res, key=len)
\ No newline at end of file
+    def _check_alphabet(self, word: str) -> None:
+        """Raise a ValueError if a character of the word is not in the alphabet."""
+        alphabet = self._alphabet
+        if alphabet is not None and not alphabet.issuperset(word):
+            char = next(char for char in word if char not in alphabet)
+            raise ValueError(
+                f"The character {self._word(char)!r} of the word is not in the alphabet."
+            )
+
+    def _copy_path(self, root: TrieNode, word: str) -> None:
+        """Replace the nodes on the path of the word below a copied root by
+        copies, while the other nodes stay shared."""
+        node = root
+        i = 0
+
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                break
+            child = child.copy()
+            node.children[word[i]] = child
+            node = child
+
+            if self._compressed:
+                # Stop after copying the edge where the word diverges
+                if not word.startswith(child.label, i):
+                    break
+                i += len(child.label)
+            else:
+                i += 1
+
+    def _modified(self, word: str, inserted: bool) -> None:
+        """Start a new generation after the word is inserted or deleted."""
+        self._generation += 1
+        if self._cache is not None and self._cache.scoped:
+            self._cache.invalidate(word)
+        if self._infix_index is not None:
+            if inserted:
+                self._infix_index.add(word)
+            else:
+                self._infix_index.remove(word)
+
+    def _raise_max_weight(self, path: List[TrieNode], weight: float) -> None:
+        """Raise the maximum weights on the path to at least the weight."""
+        for node in reversed(path):
+            # The ancestors already have a greater maximum weight
+            if node.max_weight >= weight:
+                break
+            node.max_weight = weight
+
+    def _refresh_max_weight(self, path: List[TrieNode]) -> None:
+        """Recompute the maximum weights on the path bottom-up after a weight
+        decreased or a word was deleted."""
+        for node in reversed(path):
+            best = node.weight if node.end_of_word else 0
+            for child in node.children.values():
+                if child.max_weight > best:
+                    best = child.max_weight
+
+            # The ancestors do not change if the maximum weight is unchanged
+            if best == node.max_weight:
+                break
+            node.max_weight = best
+
+    def _edges(self, node: TrieNode) -> Iterable[Tuple[str, TrieNode]]:
+        """Return the (label, child) pairs of the children of the node."""
+        if self._compressed:
+            return [(child.label, child) for child in node.children.values()]
+        return node.children.items()
+
+    def _locate(self, word: str) -> Tuple[TrieNode, str]:
+        """Return the node reached by following the word from the root, and the
+        rest of its label if the word ends in the middle of an edge.
+        Return (None, '') if no word in the trie starts with the word."""
+        node = self._root
+
+        if not self._compressed:
+            for char in word:
+                node = node.children.get(char)
+                if node is None:
+                    return None, ''
+            return node, ''
+
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                return None, ''
+
+            # Compare the label with the next characters of the word
+            label = child.label
+            part = word[i:i + len(label)]
+            if not label.startswith(part):
+                return None, ''
+            if len(part) < len(label):
+                return child, label[len(part):]
+            i += len(label)
+            node = child
+
+        return node, ''
+
+    def _insert_radix(self, root: RadixNode, word: str) -> List[RadixNode]:
+        """Insert the path of the word below the root of a compressed trie and
+        return the nodes on the path from the root."""
+        node = root
+        path = [node]
+        i = 0
+
+        while i < len(word):
+            child = node.children.get(word[i])
+
+            # Create a leaf holding the rest of the word if no edge matches
+            if child is None:
+                child = RadixNode(word[i:])
+                node.children[word[i]] = child
+                path.append(child)
+                return path
+
+            # Count the characters shared by the label and the rest of the word
+            label = child.label
+            j = 1
+            while j < len(label) and i + j < len(word) and label[j] == word[i + j]:
+                j += 1
+
+            # Split the edge where the word diverges from the label
+            if j < len(label):
+                middle = RadixNode(label[:j])
+                middle.max_weight = child.max_weight
+                middle.count = child.count
+                child.label = label[j:]
+                middle.children[label[j]] = child
+                node.children[word[i]] = middle
+                child = middle
+
+            node = child
+            path.append(node)
+            i += j
+
+        return path
+
+    def _delete_radix(self, root: RadixNode, word: str) -> bool:
+        """Delete the word below the root of a compressed trie, re-merge the
+        edges and return False if the word is not present."""
+        # Record the path from the root to the node storing the word
+        path = [root]
+        i = 0
+        while i < len(word):
+            child = path[-1].children.get(word[i])
+            if child is None or not word.startswith(child.label, i):
+                return False
+            path.append(child)
+            i += len(child.label)
+        if not path[-1].end_of_word:
+            return False
+
+        # Uncount the word in every subtree on its path
+        for parent in path:
+            parent.count -= 1
+
+        node = path[-1]
+        node.end_of_word = False
+        node.weight = 0
+        path.pop()
+
+        # Remove the node if it is a leaf, then its parent may have
+        # only one child left
+        if not node.children:
+            del path[-1].children[node.label[0]]
+            node = path[-1]
+
+        # Merge a node which does not store a word with its only child
+        if node is not root and not node.end_of_word and len(node.children) == 1:
+            (child,) = node.children.values()
+            node.label += child.label
+            node.children = child.children
+            node.end_of_word = child.end_of_word
+            node.weight = child.weight
+            node.count = child.count
+
+        # Remove the weight of the word from the maximum weights on its path
+        if node is not path[-1]:
+            path.append(node)
+        self._refresh_max_weight(path)
+
+        return True
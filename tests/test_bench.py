@@ -0,0 +1,70 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from py_trie.bench import compare, flatten, main, make_corpus, measure, percentiles
+
+
+class TestBench(unittest.TestCase):
+    """Test the benchmark suite."""
+
+    def test_make_corpus(self):
+        self.assertRaises(ValueError, make_corpus, 10, '')
+        self.assertRaises(ValueError, make_corpus, 10, 'ab', 5, 4)
+        self.assertRaises(ValueError, make_corpus, 10, 'ab', 1, 4, 'zipf')
+
+        for distribution in ('uniform', 'normal'):
+            words = make_corpus(500, 'xyz', 2, 6, distribution, seed=3)
+            self.assertEqual(len(words), 500)
+            self.assertListEqual(words, make_corpus(500, 'xyz', 2, 6, distribution, seed=3))
+            self.assertSetEqual(set(''.join(words)), set('xyz'))
+            self.assertTrue(all(2 <= len(w) <= 6 for w in words))
+
+    def test_percentiles(self):
+        self.assertDictEqual(percentiles(range(1, 101)), {'p50': 50, 'p90': 90, 'p99': 99})
+        self.assertDictEqual(percentiles([3.0]), {'p50': 3.0, 'p90': 3.0, 'p99': 3.0})
+
+    def test_measure(self):
+        result = measure(300, num_queries=20, num_fuzzy_queries=2, compressed=True)
+        self.assertLessEqual(result['num_keys'], 300)
+        self.assertGreater(result['build_s'], 0)
+        self.assertEqual(len(result['fuzzy_search_ms']), 8)
+        self.assertLessEqual(result['find_us']['p50'], result['find_us']['p99'])
+
+    def test_compare(self):
+        baseline = {'version': 1, 'results': {'10': {'num_keys': 10, 'build_s': 1.0,
+                                                     'find_us': {'p50': 2.0}}}}
+        results = {'version': 1, 'results': {'10': {'num_keys': 20, 'build_s': 1.1,
+                                                    'find_us': {'p50': 3.0}},
+                                             '20': {'build_s': 9.0}}}
+        self.assertDictEqual(
+            flatten(results), {'10/num_keys': 20, '10/build_s': 1.1, '10/find_us/p50': 3.0,
+                               '20/build_s': 9.0}
+        )
+        self.assertListEqual(compare(results, baseline), ['10/find_us/p50: 2 -> 3 (+50%)'])
+        self.assertListEqual(compare(results, baseline, 0.6), [])
+        self.assertRaises(ValueError, compare, results, {'version': 0, 'results': {}})
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            args = ['--sizes', '200', '--queries', '10', '--fuzzy-queries', '1']
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(args + ['--output', path]), 0)
+                with open(path, 'r') as f:
+                    self.assertListEqual(list(json.load(f)['results']), ['200'])
+
+                # The build time regresses against a baseline of no cost
+                with open(path, 'r') as f:
+                    baseline = json.load(f)
+                baseline['results']['200']['build_s'] = 0.0
+                with open(path, 'w') as f:
+                    json.dump(baseline, f)
+                self.assertEqual(main(args + ['--baseline', path]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
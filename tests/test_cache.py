@@ -0,0 +1,78 @@
+import time
+import unittest
+
+from py_trie.cache import QueryCache
+from py_trie.fuzzy_trie import FuzzyTrie
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test the cache of the query results."""
+
+    def setUp(self):
+        self.words = ['apple', 'app', 'apply', 'apps', 'banana', 'band']
+        self.trie = FuzzyTrie.from_list(self.words)
+
+    def test_init(self):
+        self.assertIsNone(self.trie.cache)
+        self.assertRaises(ValueError, QueryCache, 0)
+        self.assertRaises(ValueError, QueryCache, 10, -1)
+        self.assertRaises(TypeError, QueryCache, 10, None, 1)
+        cache = self.trie.enable_cache(max_size=10)
+        self.assertIs(self.trie.cache, cache)
+        self.trie.disable_cache()
+        self.assertIsNone(self.trie.cache)
+
+    def test_hits(self):
+        cache = self.trie.enable_cache()
+        res = self.trie.complete('app')
+        res.append('mutated')
+        self.assertListEqual(self.trie.complete('app'), ['apps', 'apple', 'apply'])
+        self.assertListEqual(
+            self.trie.fuzzy_search('aple', 1, engine='row'),
+            self.trie.fuzzy_search('aple', 1, engine='bitparallel')
+        )
+        self.assertEqual(self.trie.fuzzy_search('APLE', 1, case_insensitive=True), ['apple'])
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 3, 3))
+
+    def test_invalidation(self):
+        cache = self.trie.enable_cache()
+        self.trie.complete('app')
+        self.trie.fuzzy_search('band', 1)
+        self.trie.insert('apple')
+        self.assertEqual(cache.invalidations, 0)
+        self.trie.insert('bandana')
+        self.assertNotIn('bandana', self.trie.complete('app'))
+        self.assertEqual(cache.invalidations, 1)
+
+        scoped = self.trie.enable_cache(scoped=True)
+        self.trie.complete('app')
+        self.trie.complete('ban')
+        self.trie.fuzzy_search('band', 1)
+        self.trie.insert('appeal')
+        self.assertIn('appeal', self.trie.complete('app'))
+        self.assertListEqual(self.trie.fuzzy_search('band', 1), ['band'])
+        self.trie.complete('ban')
+        self.assertEqual((scoped.hits, scoped.invalidations), (2, 1))
+        self.trie.delete('band')
+        self.assertListEqual(self.trie.fuzzy_search('band', 1), [])
+        self.assertEqual(scoped.invalidations, 3)
+
+    def test_eviction(self):
+        cache = self.trie.enable_cache(max_size=2)
+        self.trie.complete('a')
+        self.trie.complete('b')
+        self.trie.complete('a')
+        self.trie.complete('ap')
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        self.trie.complete('a')
+        self.assertEqual(cache.hits, 2)
+
+        cache = self.trie.enable_cache(ttl=0.01)
+        self.trie.complete('a')
+        time.sleep(0.02)
+        self.trie.complete('a')
+        self.assertEqual((cache.hits, cache.evictions), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+
+from py_trie.frozen import FrozenFuzzyTrie, FrozenTrie
+from py_trie.fuzzy_trie import FuzzyTrie
+from py_trie.trie import Trie
+
+
+class TestFrozenTrie(unittest.TestCase):
+    """Test the FrozenTrie and FrozenFuzzyTrie properties."""
+
+    def setUp(self):
+        self.words = ['apple', 'abple', 'apples', 'apps', 'app', 'maple', 'ample']
+        self.trie = FuzzyTrie.from_list(self.words)
+        self.frozen = self.trie.freeze()
+
+    def test_freeze(self):
+        self.assertIsInstance(Trie.from_list(self.words).freeze(), FrozenTrie)
+        self.assertIsInstance(self.frozen, FrozenFuzzyTrie)
+        self.assertIs(self.frozen.freeze(), self.frozen)
+        self.assertEqual(len(self.frozen), len(self.words))
+        self.assertRaises(TypeError, FrozenTrie.from_trie, self.words)
+        self.assertRaises(TypeError, self.frozen.insert, 'apply')
+        self.assertRaises(TypeError, self.frozen.delete, 'apple')
+        self.assertRaises(TypeError, self.frozen.insert_many, ['apply'])
+        self.assertRaises(TypeError, self.frozen.delete_many, ['apple'])
+        self.assertIs(self.frozen.snapshot(), self.frozen)
+
+        # The common suffix 'ple' is shared by 'apple', 'abple', 'maple' and 'ample'
+        self.assertLess(self.frozen.num_nodes, 16)
+
+    def test_find(self):
+        self.assertRaises(TypeError, self.frozen.find, '')
+        for w in self.words:
+            self.assertTrue(self.frozen.find(w))
+            self.assertIn(w, self.frozen)
+        self.assertFalse(self.frozen.find('ap'))
+        self.assertFalse(self.frozen.find('applez'))
+        self.assertFalse(self.frozen.find('Apple'))
+        self.assertListEqual(
+            self.frozen.find_many(['ap', 'apple', 'applez', 'maple', 'ap']),
+            [False, True, False, True, False]
+        )
+
+        frozen = Trie.from_list(self.words, lower_case=True).freeze()
+        self.assertTrue(frozen.find('ApPle'))
+
+    def test_complete(self):
+        for prefix in ['', 'a', 'app', 'apples', 'm', 'x']:
+            self.assertListEqual(
+                sorted(self.frozen.complete(prefix)), sorted(self.trie.complete(prefix))
+            )
+        self.assertListEqual(self.frozen.complete('app'), ['apps', 'apple', 'apples'])
+
+    def test_fuzzy_search(self):
+        for engine in ['row', 'bitparallel']:
+            for threshold in range(3):
+                self.assertListEqual(
+                    sorted(self.frozen.fuzzy_search('aple', threshold, engine=engine)),
+                    sorted(self.trie.fuzzy_search('aple', threshold, engine=engine))
+                )
+            self.assertListEqual(
+                self.frozen.fuzzy_top_k('apps', 2, engine=engine), ['apps', 'app']
+            )
+
+        # The frozen trie searches depth-first in lexicographic order
+        self.assertListEqual(
+            self.frozen.fuzzy_search('aple', 2), sorted(self.trie.fuzzy_search('aple', 2))
+        )
+        sorted_trie = FuzzyTrie.from_list(sorted(self.words))
+        for target in ['aple', 'app', 'mple']:
+            for num_return in [None, 1, 2, 3]:
+                for sort_by_distance in [False, True]:
+                    self.assertListEqual(
+                        self.frozen.fuzzy_search(target, 2, num_return, sort_by_distance),
+                        sorted_trie.fuzzy_search(target, 2, num_return, sort_by_distance)
+                    )
+
+    def test_compressed(self):
+        trie = FuzzyTrie.from_list(self.words, compressed=True)
+        frozen = trie.freeze()
+        self.assertEqual(frozen.num_nodes, self.frozen.num_nodes)
+        self.assertListEqual(sorted(frozen.complete('')), sorted(self.words))
+
+    def test_freeze_copy_on_write(self):
+        class WrittenTrie(Trie):
+            """Insert a word once the traversal of 'freeze' has started."""
+            written = False
+
+            def _edges(self, node):
+                if not self.written:
+                    self.written = True
+                    self.insert('zebra')
+                return super()._edges(node)
+
+        for compressed in (False, True):
+            trie = WrittenTrie.from_list(self.words, compressed=compressed, copy_on_write=True)
+            frozen = trie.freeze()
+            self.assertTrue(trie.find('zebra'))
+            self.assertFalse(frozen.find('zebra'))
+            self.assertEqual(len(frozen), len(self.words))
+            self.assertListEqual(sorted(frozen.complete('')), sorted(self.words))
+
+    def test_alphabet(self):
+        # The characters of the edges are coded in one byte
+        self.assertEqual(self.frozen.alphabet, 'abelmps')
+        self.assertEqual(self.frozen._chars.itemsize, 1)
+        self.assertFalse(self.frozen.find('apple\u20ac'))
+
+        trie = FuzzyTrie.from_list([chr(0x4e00 + i) for i in range(300)])
+        self.assertEqual(trie.freeze()._chars.itemsize, 2)
+        bytes_trie = Trie(alphabet=b'abc')
+        bytes_trie.insert(b'cab')
+        self.assertEqual(bytes_trie.freeze().alphabet, b'abc')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for i, trie in enumerate([trie, bytes_trie]):
+                path = os.path.join(directory, f'{i}.trie')
+                trie.save(path)
+                frozen = trie.freeze()
+                empty = trie.select(0)[:0]
+                for mmap in [True, False]:
+                    loaded = Trie.load(path, mmap=mmap)
+                    self.assertEqual(loaded.alphabet, frozen.alphabet)
+                    self.assertListEqual(loaded.complete(empty), frozen.complete(empty))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'words.trie')
+            self.trie.save(path)
+            self.assertRaises(TypeError, self.trie.save, None)
+            self.assertRaises(FileNotFoundError, FuzzyTrie.load, path + 'x')
+
+            for mmap in [True, False]:
+                loaded = FuzzyTrie.load(path, mmap=mmap)
+                self.assertIsInstance(loaded, FrozenFuzzyTrie)
+                self.assertEqual(len(loaded), len(self.words))
+                self.assertTrue(loaded.find('apps'))
+                self.assertListEqual(loaded.complete('app'), self.frozen.complete('app'))
+                self.assertEqual(loaded.count_prefix('app'), self.frozen.count_prefix('app'))
+                self.assertEqual(loaded.select(1), self.frozen.select(1))
+                self.assertListEqual(
+                    loaded.fuzzy_search('aple', 1, engine='bitparallel'),
+                    self.frozen.fuzzy_search('aple', 1, engine='bitparallel')
+                )
+            self.assertIsInstance(Trie.load(path), FrozenTrie)
+
+            lower_path = os.path.join(directory, 'lower.trie')
+            Trie.from_list(self.words, lower_case=True).save(lower_path)
+            self.assertTrue(Trie.load(lower_path).find('APPLE'))
+
+            # Corrupt the last byte of the file
+            with open(path, 'rb') as f:
+                data = bytearray(f.read())
+            data[-1] ^= 1
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.assertRaises(ValueError, FuzzyTrie.load, path)
+            self.assertIsInstance(FuzzyTrie.load(path, verify=False), FrozenFuzzyTrie)
+
+            with open(path, 'wb') as f:
+                f.write(b'not a trie')
+            self.assertRaises(ValueError, FuzzyTrie.load, path)
+            self.assertRaises(ValueError, FuzzyTrie.load, path, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 from py_trie.fuzzy_trie import FuzzyTrie
@@ -29,6 +30,240 @@ class TestFuzzyTrie(unittest.TestCase):
         self.assertEqual(
             2, len(self.trie.fuzzy_search('apPp', 1, case_insensitive=True))
         )
+        self.assertEqual(len(self.trie.fuzzy_search('apple', 2, num_return=2)), 2)
+
+    def test_fuzzy_top_k(self):
+        self.assertRaises(TypeError, self.trie.fuzzy_top_k, None, 1)
+        self.assertRaises(ValueError, self.trie.fuzzy_top_k, 'a', 0)
+        self.assertRaises(ValueError, self.trie.fuzzy_top_k, 'a', 1, -1)
+
+        # The depth-first search meets 'app' before the exact match 'apps'
+        self.assertListEqual(
+            self.trie.fuzzy_search('apps', 2, num_return=1, sort_by_distance=True),
+            ['apps']
+        )
+        for engine in ['row', 'bitparallel']:
+            self.assertListEqual(
+                self.trie.fuzzy_top_k('apps', 2, engine=engine), ['apps', 'app']
+            )
+            self.assertListEqual(
+                self.trie.fuzzy_top_k('apple', 3, threshold=1, engine=engine)[0:1],
+                ['apple']
+            )
+            self.assertEqual(len(self.trie.fuzzy_top_k('xyz', 10, engine=engine)), 5)
+            self.assertListEqual(self.trie.fuzzy_top_k('xyz', 10, threshold=2), [])
+
+            # A word above the threshold whose row is still alive deepens the search
+            short = FuzzyTrie.from_list(['a'])
+            self.assertListEqual(short.fuzzy_top_k('aab', 3, engine=engine), ['a'])
+
+    def test_compressed(self):
+        trie = FuzzyTrie.from_list(self.words, compressed=True)
+        for engine in ['row', 'bitparallel']:
+            for threshold in range(3):
+                self.assertListEqual(
+                    sorted(trie.fuzzy_search('aple', threshold, engine=engine)),
+                    sorted(self.trie.fuzzy_search('aple', threshold, engine=engine))
+                )
+            self.assertListEqual(trie.fuzzy_top_k('apps', 2, engine=engine), ['apps', 'app'])
+
+    def test_fuzzy_search_engines(self):
+        self.assertRaises(ValueError, self.trie.fuzzy_search, 'a', 1, engine='dp')
+
+        for target in ['', 'a', 'apPle', 'aple', 'applesauce']:
+            for threshold in range(4):
+                for case_insensitive in [False, True]:
+                    self.assertListEqual(
+                        self.trie.fuzzy_search(
+                            target, threshold,
+                            sort_by_distance=True,
+                            case_insensitive=case_insensitive
+                        ),
+                        self.trie.fuzzy_search(
+                            target, threshold,
+                            sort_by_distance=True,
+                            case_insensitive=case_insensitive,
+                            engine='bitparallel'
+                        )
+                    )
+
+    def test_long_keys(self):
+        long = 'ab' * 50000
+        trie = FuzzyTrie.from_list([long, long[:-1] + 'c', 'abc'], compressed=True)
+        self.assertListEqual(
+            trie.fuzzy_search(long[:-1] + 'x', 1, engine='bitparallel'),
+            [long, long[:-1] + 'c']
+        )
+        self.assertListEqual(trie.fuzzy_search('abd', 1), ['abc'])
+
+    def test_bytes_keys(self):
+        trie = FuzzyTrie.from_list(
+            [word.encode() for word in self.words], alphabet=bytes(range(256))
+        )
+        self.assertRaises(TypeError, trie.fuzzy_search, 'apple', 1)
+        self.assertListEqual(
+            trie.fuzzy_search(b'apple', 1),
+            [word.encode() for word in self.trie.fuzzy_search('apple', 1)]
+        )
+        self.assertListEqual(trie.fuzzy_top_k(memoryview(b'apps'), 2), [b'apps', b'app'])
+        self.assertDictEqual(
+            trie.fuzzy_search_many([bytearray(b'apps'), b'xyz'], 1),
+            {b'apps': [b'app', b'apps'], b'xyz': []}
+        )
+
+        session = trie.fuzzy_session(1)
+        session.append(b'app')
+        self.assertEqual(session.target, b'app')
+        self.assertListEqual(session.results(), trie.fuzzy_search(b'app', 1))
+
+    def test_fuzzy_search_many(self):
+        self.assertRaises(TypeError, self.trie.fuzzy_search_many, 'aple', 1)
+        self.assertRaises(TypeError, self.trie.fuzzy_search_many, ['aple', None], 1)
+        self.assertRaises(ValueError, self.trie.fuzzy_search_many, ['aple'], -1)
+        self.assertDictEqual(self.trie.fuzzy_search_many([], 1), {})
+
+        targets = ['', 'aple', 'APPS', 'apps', 'aple', 'applesauce']
+        for grouped in [False, True]:
+            for case_insensitive in [False, True]:
+                for num_return in [None, 2]:
+                    results = self.trie.fuzzy_search_many(
+                        targets, 2, num_return,
+                        case_insensitive=case_insensitive, grouped=grouped
+                    )
+                    self.assertListEqual(sorted(results), sorted(set(targets)))
+                    for target in targets:
+                        self.assertListEqual(
+                            results[target],
+                            self.trie.fuzzy_search(
+                                target, 2, num_return, case_insensitive=case_insensitive
+                            )
+                        )
+
+        # The words of equal distance are truncated in depth-first order
+        trie = FuzzyTrie.from_list(['ab', 'b', 'ba', 'a'])
+        targets = ['bb', 'a', 'ab', 'aa']
+        for grouped in [False, True]:
+            for num_return in range(1, 5):
+                results = trie.fuzzy_search_many(targets, 2, num_return, True, grouped=grouped)
+                for target in targets:
+                    self.assertListEqual(
+                        results[target], trie.fuzzy_search(target, 2, num_return, True)
+                    )
+
+    def test_symdelete_index(self):
+        self.assertRaises(ValueError, FuzzyTrie, index='bktree')
+        trie = FuzzyTrie.from_list(self.words, index='symdelete', max_distance=2)
+        self.assertEqual(len(trie.index), len(self.words))
+
+        for target in ['', 'a', 'apPle', 'aple', 'applesauce']:
+            for threshold in range(4):
+                for case_insensitive in [False, True]:
+                    self.assertListEqual(
+                        trie.fuzzy_search(target, threshold, None, False, case_insensitive),
+                        self.trie.fuzzy_search(target, threshold, None, False, case_insensitive)
+                    )
+
+        # The words of equal distance are kept in depth-first order by both
+        words = ['ab', 'b', 'ba', 'a']
+        plain = FuzzyTrie.from_list(words)
+        indexed = FuzzyTrie.from_list(words, index='symdelete')
+        self.assertListEqual(plain.fuzzy_search('bb', 2, 1, True), ['ab'])
+        for target in ['bb', 'a', 'ab', 'aa']:
+            for num_return in range(1, 5):
+                for sort_by_distance in [False, True]:
+                    self.assertListEqual(
+                        indexed.fuzzy_search(target, 2, num_return, sort_by_distance),
+                        plain.fuzzy_search(target, 2, num_return, sort_by_distance)
+                    )
+
+        trie.insert('appel')
+        trie.delete('apple')
+        self.assertIn('appel', trie.fuzzy_search('apple', 2))
+        self.assertNotIn('apple', trie.fuzzy_search('apple', 1))
+        self.assertEqual(len(trie.index), len(trie))
+
+        frozen = self.trie.freeze()
+        self.assertIsNone(frozen.index)
+        frozen.build_index(max_distance=1)
+        self.assertListEqual(
+            frozen.fuzzy_search('aple', 1), self.trie.freeze().fuzzy_search('aple', 1)
+        )
+        frozen.drop_index()
+        self.assertIsNone(frozen.index)
+
+    def test_stats(self):
+        self.assertRaises(TypeError, self.trie.enable_stats, 1)
+        self.trie.fuzzy_search('apple', 1)
+        self.assertIsNone(self.trie.last_stats)
+
+        reported = []
+        self.trie.enable_stats(hook=reported.append)
+        self.assertListEqual(self.trie.fuzzy_search('apple', 1), ['apple', 'apples', 'abple'])
+        stats = self.trie.last_stats
+        self.assertEqual((stats.target, stats.threshold, stats.strategy), ('apple', 1, 'dfs'))
+        self.assertEqual((stats.num_results, stats.max_depth), (3, 6))
+        self.assertGreaterEqual(stats.rows_computed, stats.nodes_visited)
+        self.assertListEqual(reported, [stats])
+
+        # The branches of 'ab' and 'appl' exceed the threshold
+        self.trie.fuzzy_search('apps', 0)
+        self.assertEqual(self.trie.last_stats.branches_pruned, 2)
+
+        self.trie.fuzzy_search('apps', 2, 1, True)
+        self.assertEqual(self.trie.last_stats.strategy, 'best_first')
+        self.trie.enable_cache()
+        self.trie.fuzzy_search('app', 0)
+        self.trie.fuzzy_search('app', 0)
+        self.assertEqual(self.trie.last_stats.strategy, 'cache')
+        self.assertEqual(self.trie.last_stats.rows_computed, 0)
+
+        # The compressed trie visits fewer nodes for the same rows
+        trie = FuzzyTrie.from_list(self.words, compressed=True)
+        trie.enable_stats()
+        trie.fuzzy_search('apple', 1)
+        self.assertEqual(trie.last_stats.rows_computed, stats.rows_computed)
+        self.assertLess(trie.last_stats.nodes_visited, stats.nodes_visited)
+
+        trie = FuzzyTrie.from_list(self.words, index='symdelete', max_distance=1)
+        trie.enable_stats()
+        self.assertListEqual(trie.fuzzy_search('apple', 1), ['apple', 'apples', 'abple'])
+        self.assertEqual(trie.last_stats.strategy, 'index')
+        trie.disable_stats()
+        trie.fuzzy_search('apple', 1)
+        self.assertIsNone(trie.last_stats)
+        self.assertEqual(len(reported), 5)
+
+    def test_afuzzy_search(self):
+        search = self.trie.afuzzy_search
+        self.assertRaises(ValueError, asyncio.run, search('apple', 1, max_nodes=0))
+        self.assertRaises(ValueError, asyncio.run, search('apple', 1, deadline=-1))
+        for args in [(1,), (2, 2), (2, 2, True), (2, None, True)]:
+            self.assertEqual(
+                asyncio.run(search('apple', *args, chunk_size=1)),
+                (self.trie.fuzzy_search('apple', *args), False)
+            )
+
+        # The best-first search finds the nearest words first
+        self.assertEqual(
+            asyncio.run(search('apps', 2, 3, True, max_nodes=6)), (['apps', 'app'], True)
+        )
+        self.assertEqual(asyncio.run(search('apple', 2, deadline=0, chunk_size=1)), ([], True))
+
+        async def cancel():
+            task = asyncio.create_task(search('apple', 2, chunk_size=1))
+            await asyncio.sleep(0)
+            task.cancel()
+            await task
+
+        self.assertRaises(asyncio.CancelledError, asyncio.run, cancel())
+
+        async def modify():
+            task = asyncio.create_task(search('apple', 2, chunk_size=1))
+            await asyncio.sleep(0)
+            self.trie.insert('applet')
+            await task
+
+        self.assertRaises(RuntimeError, asyncio.run, modify())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,48 @@
+import unittest
+
+from py_trie.infix import InfixIndex, contains
+from py_trie.levenshtein import make_matcher
+
+
+class TestInfixIndex(unittest.TestCase):
+    """Test the index of the suffixes."""
+
+    def setUp(self):
+        self.index = InfixIndex()
+        self.index.extend(['iphone', 'phones', 'headphone', 'banana'])
+
+    def test_contains(self):
+        self.assertTrue(contains('headphone', make_matcher('dpho', 0)))
+        self.assertFalse(contains('headphone', make_matcher('fone', 0)))
+        self.assertTrue(contains('headphone', make_matcher('fone', 1)))
+        self.assertTrue(contains('ab', make_matcher('xy', 2)))
+        self.assertFalse(contains('', make_matcher('a', 0)))
+
+    def test_search(self):
+        self.assertSetEqual(self.index.search('phone'), {'iphone', 'phones', 'headphone'})
+        self.assertSetEqual(self.index.search('nan'), {'banana'})
+        self.assertSetEqual(self.index.search(''), {'iphone', 'phones', 'headphone', 'banana'})
+        self.assertSetEqual(self.index.search('phonez'), set())
+
+    def test_fuzzy_search(self):
+        self.assertSetEqual(
+            self.index.fuzzy_search(make_matcher('fone', 1)), {'iphone', 'phones', 'headphone'}
+        )
+        self.assertSetEqual(self.index.fuzzy_search(make_matcher('bnan', 1)), {'banana'})
+        self.assertSetEqual(self.index.fuzzy_search(make_matcher('xyz', 1)), set())
+        self.assertEqual(len(self.index.fuzzy_search(make_matcher('xy', 2))), 4)
+
+    def test_remove(self):
+        entries = self.index.num_entries
+        self.index.add('phonetic')
+        self.index.remove('phonetic')
+        self.assertEqual(self.index.num_entries, entries)
+        self.index.remove('iphone')
+        self.assertEqual(len(self.index), 3)
+        self.assertLess(self.index.num_entries, entries)
+        self.assertSetEqual(self.index.search('phone'), {'phones', 'headphone'})
+        self.assertGreater(self.index.build_time, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
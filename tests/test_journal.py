@@ -0,0 +1,180 @@
+import os
+import tempfile
+import unittest
+
+from py_trie.frozen import FrozenTrie
+from py_trie.fuzzy_trie import FuzzyTrie
+from py_trie.journal import OP_DELETE, OP_INSERT, OP_INSERT_WEIGHTED, Journal, write_snapshot
+from py_trie.trie import Trie
+
+
+class TestJournal(unittest.TestCase):
+    """Test the journal of the modifications and the recovery of the tries."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.directory.name, 'words.snapshot')
+        self.journal = os.path.join(self.directory.name, 'words.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_and_replay(self):
+        with Journal(self.journal, self.snapshot, sync_every=3, sync_interval=None) as journal:
+            self.assertEqual((journal.lsn, journal.base_lsn), (0, 0))
+            self.assertEqual(journal.append('apple', True), 1)
+            self.assertEqual(journal.append('app', True, 2.5), 2)
+            self.assertEqual(journal.num_pending, 2)
+            self.assertEqual(journal.append('apple', False), 3)
+            self.assertEqual(journal.num_pending, 0)
+            self.assertEqual(list(journal.replay(1)), [
+                (2, OP_INSERT_WEIGHTED, 'app', 2.5), (3, OP_DELETE, 'apple', None)
+            ])
+
+        with Journal(self.journal, self.snapshot) as journal:
+            self.assertEqual(journal.lsn, 3)
+            self.assertEqual(list(journal.replay())[0], (1, OP_INSERT, 'apple', None))
+
+        with self.assertRaises(ValueError):
+            Journal(self.journal, self.snapshot, sync_every=0)
+        with self.assertRaises(ValueError):
+            Journal(self.journal, self.snapshot, sync_interval=-1)
+        with self.assertRaises(TypeError):
+            Journal(1, self.snapshot)
+
+    def test_torn_record(self):
+        with Journal(self.journal, self.snapshot) as journal:
+            journal.append('apple', True)
+            journal.append('banana', True)
+        size = os.path.getsize(self.journal)
+
+        # A crash in the middle of writing the last record
+        os.truncate(self.journal, size - 3)
+        with Journal(self.journal, self.snapshot) as journal:
+            self.assertEqual(journal.lsn, 1)
+            journal.append('cherry', True)
+            self.assertEqual([r[2] for r in journal.replay()], ['apple', 'cherry'])
+
+        with open(self.journal, 'ab') as f:
+            f.write(b'\x00garbage')
+        with Journal(self.journal, self.snapshot) as journal:
+            self.assertEqual(journal.lsn, 2)
+
+        with open(self.journal, 'wb') as f:
+            f.write(b'not a journal file')
+        with self.assertRaises(ValueError):
+            Journal(self.journal, self.snapshot)
+
+    def test_recover(self):
+        for kwargs in ({}, {'compressed': True}, {'copy_on_write': True}):
+            trie = FuzzyTrie.from_list(['apple', 'app', 'bat'], **kwargs)
+            self.assertIsNone(trie.journal)
+            trie.enable_journal(self.snapshot, self.journal)
+            trie.insert('banana', 3)
+            trie.insert('apple', 5)
+            trie.delete('app')
+            trie.delete('cat')
+            trie.insert_many(['zoo', 'bat'])
+            self.assertEqual(trie.journal.lsn, 4)
+            trie.disable_journal()
+            self.assertIsNone(trie.journal)
+
+            recovered = FuzzyTrie.recover(self.snapshot, self.journal, **kwargs)
+            self.assertEqual(sorted(recovered.complete('')), ['apple', 'banana', 'bat', 'zoo'])
+            self.assertEqual(len(recovered), 4)
+            self.assertEqual(recovered.top_k_complete('', 2), ['apple', 'banana'])
+            self.assertEqual(recovered.fuzzy_search('bant', 1), ['bat'])
+
+            # The recovered trie keeps recording into the journal
+            recovered.insert('cat')
+            recovered.disable_journal()
+            recovered = FuzzyTrie.recover(self.snapshot, self.journal, **kwargs)
+            self.assertTrue(recovered.find('cat'))
+            recovered.disable_journal()
+            os.remove(self.snapshot)
+            os.remove(self.journal)
+
+    def test_recover_bytes(self):
+        alphabet = bytes(range(256))
+        trie = Trie(alphabet=alphabet)
+        trie.insert(b'\xff\x00a', 2)
+        trie.enable_journal(self.snapshot, self.journal)
+        trie.insert(b'\x80')
+        trie.disable_journal()
+
+        recovered = Trie.recover(self.snapshot, self.journal, alphabet=alphabet)
+        self.assertEqual(sorted(recovered.complete(b'')), [b'\x80', b'\xff\x00a'])
+        self.assertEqual(recovered.top_k_complete(b'', 1), [b'\xff\x00a'])
+        recovered.disable_journal()
+
+    def test_compact(self):
+        trie = Trie.from_list(['apple'])
+        trie.enable_journal(self.snapshot, self.journal)
+        for i in range(100):
+            trie.insert(f'word{i}')
+        trie.journal.sync()
+        size = os.path.getsize(self.journal)
+
+        self.assertEqual(trie.compact().result(), 101)
+        self.assertLess(os.path.getsize(self.journal), size)
+        self.assertEqual((trie.journal.base_lsn, trie.journal.lsn), (100, 100))
+        trie.delete('apple')
+        self.assertEqual(trie.journal.lsn, 101)
+        trie.disable_journal()
+
+        recovered = Trie.recover(self.snapshot, self.journal)
+        self.assertEqual(len(recovered), 100)
+        self.assertFalse(recovered.find('apple'))
+        recovered.disable_journal()
+
+        with self.assertRaises(TypeError):
+            recovered.compact()
+
+    def test_compact_copy_on_write(self):
+        trie = FuzzyTrie.from_list(['apple', 'app'], copy_on_write=True)
+        trie.enable_journal(self.snapshot, self.journal)
+        trie.insert('bat')
+        future = trie.compact()
+
+        # The writers continue during the compaction
+        trie.insert('cat')
+        self.assertEqual(future.result(), 3)
+        trie.disable_journal()
+
+        recovered = FuzzyTrie.recover(self.snapshot, self.journal, copy_on_write=True)
+        self.assertEqual(sorted(recovered.complete('')), ['app', 'apple', 'bat', 'cat'])
+        self.assertIsNone(recovered.snapshot().journal)
+        recovered.disable_journal()
+
+    def test_crash_during_compaction(self):
+        trie = Trie.from_list(['apple'])
+        trie.enable_journal(self.snapshot, self.journal)
+        trie.insert('bat')
+        trie.insert('cat')
+        trie.journal.sync()
+
+        # The snapshot was replaced before the journal was truncated
+        write_snapshot(self.snapshot, [('apple', 0), ('bat', 0)], 1)
+        trie.disable_journal()
+
+        recovered = Trie.recover(self.snapshot, self.journal)
+        self.assertEqual(sorted(recovered.complete('')), ['apple', 'bat', 'cat'])
+        self.assertEqual(recovered.journal.lsn, 2)
+        recovered.disable_journal()
+
+        # The records after the snapshot are missing
+        write_snapshot(self.snapshot, [('apple', 0)], 0)
+        with open(self.journal, 'r+b') as f:
+            f.seek(12)
+            f.write((5).to_bytes(8, 'little'))
+        with self.assertRaises(ValueError):
+            Trie.recover(self.snapshot, self.journal)
+
+    def test_frozen(self):
+        frozen = FrozenTrie.from_list(['apple'])
+        with self.assertRaises(TypeError):
+            frozen.enable_journal(self.snapshot, self.journal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from py_trie.levenshtein import BitParallelMatcher, RowMatcher, make_matcher
+
+
+class TestLevenshtein(unittest.TestCase):
+    """Test the matchers of the fuzzy search engines."""
+
+    def run_matcher(self, matcher, word):
+        state = matcher.initial()
+        for char in word:
+            state = matcher.step(state, char)
+        return state
+
+    def test_make_matcher(self):
+        self.assertIsInstance(make_matcher('a', 1), RowMatcher)
+        self.assertIsInstance(make_matcher('a', 1, engine='bitparallel'), BitParallelMatcher)
+        self.assertRaises(ValueError, make_matcher, 'a', 1, False, 'dp')
+
+    def test_distance(self):
+        pairs = [
+            ('kitten', 'sitting', 3), ('', 'abc', 3), ('abc', '', 3),
+            ('flaw', 'lawn', 2), ('apple', 'apple', 0), ('Apple', 'aPPle', 3),
+        ]
+        for target, word, expected in pairs:
+            row = RowMatcher(target, 3)
+            bit = BitParallelMatcher(target, 3)
+            self.assertEqual(row.distance(self.run_matcher(row, word)), expected)
+            self.assertEqual(bit.distance(self.run_matcher(bit, word)), expected)
+
+        # Distances over the threshold are capped by the bit-parallel engine
+        bit = BitParallelMatcher('kitten', 1)
+        self.assertEqual(bit.distance(self.run_matcher(bit, 'sitting')), 2)
+        self.assertFalse(bit.alive(self.run_matcher(bit, 'sitting')))
+
+        bit = BitParallelMatcher('Apple', 0, case_insensitive=True)
+        self.assertEqual(bit.distance(self.run_matcher(bit, 'aPPle')), 0)
+
+    def test_row_min(self):
+        row = RowMatcher('apple', 2)
+        bit = BitParallelMatcher('apple', 2)
+        for prefix in ['a', 'ab', 'abc', 'xyz', 'xyzw']:
+            expected = min(row.row_min(self.run_matcher(row, prefix)), 3)
+            self.assertEqual(bit.row_min(self.run_matcher(bit, prefix)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from py_trie.fuzzy_trie import FuzzyTrie
+
+
+class TestFuzzySession(unittest.TestCase):
+    """Test the incremental fuzzy search."""
+
+    def setUp(self):
+        self.words = ['apple', 'abple', 'apples', 'apps', 'app', 'Apply']
+        self.trie = FuzzyTrie.from_list(self.words)
+
+    def test_init(self):
+        self.assertRaises(ValueError, self.trie.fuzzy_session, -1)
+        self.assertRaises(TypeError, self.trie.fuzzy_session, 1, None)
+        session = self.trie.fuzzy_session(1)
+        self.assertEqual(session.target, '')
+        self.assertListEqual(session.results(), [])
+        self.assertRaises(TypeError, session.append, '')
+        self.assertRaises(ValueError, session.backspace, 0)
+        self.assertRaises(ValueError, session.results, 0)
+
+    def test_keystrokes(self):
+        for trie in [self.trie, FuzzyTrie.from_list(self.words, compressed=True), self.trie.freeze()]:
+            for case_insensitive in [False, True]:
+                session = trie.fuzzy_session(2, case_insensitive)
+                for char in 'aplpy':
+                    session.append(char)
+                    self.assertListEqual(
+                        session.results(),
+                        trie.fuzzy_search(session.target, 2, case_insensitive=case_insensitive)
+                    )
+                session.backspace(2)
+                self.assertEqual(session.target, 'apl')
+                self.assertListEqual(
+                    session.results(sort_by_distance=True),
+                    trie.fuzzy_search('apl', 2, None, True, case_insensitive)
+                )
+                session.backspace(10)
+                self.assertEqual(session.target, '')
+
+    def test_num_return(self):
+        # The words of equal distance are truncated in depth-first order
+        for trie in [FuzzyTrie.from_list(['ab', 'b', 'ba', 'a']), self.trie]:
+            for target in ['bb', 'apl']:
+                session = trie.fuzzy_session(2)
+                session.append(target)
+                for num_return in range(1, 5):
+                    for sort_by_distance in [False, True]:
+                        self.assertListEqual(
+                            session.results(num_return, sort_by_distance),
+                            trie.fuzzy_search(target, 2, num_return, sort_by_distance)
+                        )
+
+    def test_modification(self):
+        session = self.trie.fuzzy_session(1)
+        session.append('aple')
+        frontier = session.frontier_size
+        self.trie.insert('aplex')
+        self.assertIn('aplex', session.results())
+        self.assertGreater(session.frontier_size, frontier)
+        self.trie.delete('apple')
+        self.assertListEqual(session.results(), self.trie.fuzzy_search('aple', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
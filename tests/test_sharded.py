@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from py_trie.fuzzy_trie import FuzzyTrie
+from py_trie.sharded import ShardedFuzzyTrie
+
+
+class TestShardedFuzzyTrie(unittest.TestCase):
+    """Test the ShardedFuzzyTrie properties."""
+
+    def setUp(self):
+        self.words = ['apple', 'abple', 'apples', 'apps', 'app', 'banana', 'band', 'can']
+        self.frozen = FuzzyTrie.from_list(self.words).freeze()
+        self.trie = ShardedFuzzyTrie.from_list(self.words, workers=2, num_shards=3)
+
+    def tearDown(self):
+        self.trie.close()
+
+    def test_build(self):
+        self.assertRaises(TypeError, ShardedFuzzyTrie.from_list, 'apple')
+        self.assertRaises(ValueError, ShardedFuzzyTrie.from_list, self.words, workers=0)
+        self.assertEqual(self.trie.num_shards, 3)
+        self.assertEqual(len(self.trie), len(self.words))
+        self.assertTrue(self.trie.find('band'))
+        self.assertNotIn('ban', self.trie)
+        self.assertNotIn('dog', self.trie)
+
+        path = os.path.dirname(__file__) + '/example.txt'
+        with tempfile.TemporaryDirectory() as directory:
+            with ShardedFuzzyTrie.from_txt(path, workers=2, directory=directory) as trie:
+                self.assertEqual(len(trie), len(FuzzyTrie.from_txt(path)))
+            with ShardedFuzzyTrie.load(directory, workers=1) as trie:
+                self.assertEqual(trie.complete(''), FuzzyTrie.from_txt(path).freeze().complete(''))
+
+    def test_complete(self):
+        self.assertRaises(TypeError, self.trie.complete, None)
+        self.assertRaises(ValueError, self.trie.complete, 'a', 0)
+        for order in ['length', 'lex', 'none']:
+            for prefix in ['', 'app', 'b', 'dog']:
+                self.assertListEqual(
+                    self.trie.complete(prefix, None, order),
+                    self.frozen.complete(prefix, None, order)
+                )
+            self.assertListEqual(
+                self.trie.complete('', 3, order, 2), self.frozen.complete('', 3, order, 2)
+            )
+
+    def test_fuzzy_search(self):
+        self.assertRaises(TypeError, self.trie.fuzzy_search, None, 1)
+        self.assertRaises(ValueError, self.trie.fuzzy_search, 'a', -1)
+        for target in ['aple', 'bann', 'Can', 'xyz']:
+            for num_return in [None, 2]:
+                for sort_by_distance in [False, True]:
+                    self.assertListEqual(
+                        self.trie.fuzzy_search(target, 2, num_return, sort_by_distance, True),
+                        self.frozen.fuzzy_search(target, 2, None, sort_by_distance, True)[:num_return]
+                    )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from py_trie.levenshtein import make_matcher
+from py_trie.stats import CountingMatcher, SearchStats
+
+
+class TestSearchStats(unittest.TestCase):
+    """Test the counters of the fuzzy searches."""
+
+    def test_counting_matcher(self):
+        for engine in ('row', 'bitparallel'):
+            matcher = make_matcher('abc', 1, engine=engine)
+            stats = SearchStats('abc', 1)
+            counted = CountingMatcher(matcher, stats)
+            self.assertEqual((counted.target, counted.threshold), ('abc', 1))
+
+            row = counted.initial()
+            for char in 'abd':
+                row = counted.step(row, char)
+            self.assertTrue(counted.alive(row))
+            self.assertEqual(counted.distance(row), 1)
+            self.assertEqual(counted.row_min(row), matcher.row_min(row[1]))
+            for char in 'xyz':
+                row = counted.step(row, char)
+            self.assertFalse(counted.alive(row))
+            self.assertEqual(
+                (stats.rows_computed, stats.max_depth, stats.branches_pruned), (6, 6, 1)
+            )
+
+    def test_visits(self):
+        def steps():
+            yield None
+            yield 'app', 0
+            yield None
+            return True
+
+        stats = SearchStats('app', 0)
+        visits = stats.visits(steps())
+        self.assertEqual(next(visits), ('app', 0))
+        with self.assertRaises(StopIteration) as stop:
+            next(visits)
+        self.assertTrue(stop.exception.value)
+        self.assertEqual(stats.nodes_visited, 2)
+        self.assertEqual(stats.as_dict()['nodes_visited'], 2)
+        self.assertIn('nodes_visited=2', repr(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from py_trie.symdelete import SymDeleteIndex, deletes, fold
+
+
+class TestSymDeleteIndex(unittest.TestCase):
+    """Test the symmetric-delete index."""
+
+    def setUp(self):
+        self.index = SymDeleteIndex(max_distance=2)
+        self.index.extend(['apple', 'apply', 'Banana', 'band'])
+
+    def test_deletes(self):
+        self.assertSetEqual(deletes('abc', 1), {'abc', 'bc', 'ac', 'ab'})
+        self.assertIn('', deletes('ab', 2))
+        self.assertEqual(fold('ApPLE'), 'apple')
+        self.assertEqual(len(fold('İ')), 1)
+
+    def test_candidates(self):
+        self.assertRaises(ValueError, SymDeleteIndex, -1)
+        self.assertRaises(ValueError, self.index.candidates, 'apple', 3)
+        self.assertSetEqual(self.index.candidates('aple', 1), {'apple', 'apply'})
+        self.assertSetEqual(self.index.candidates('banan', 1), {'Banana'})
+        self.assertSetEqual(self.index.candidates('xyz', 2), set())
+
+    def test_remove(self):
+        entries = self.index.num_entries
+        self.index.add('applet')
+        self.index.remove('applet')
+        self.index.remove('apply')
+        self.assertEqual(len(self.index), 3)
+        self.assertLess(self.index.num_entries, entries)
+        self.assertSetEqual(self.index.candidates('aple', 1), {'apple'})
+        self.assertGreater(self.index.memory_usage(), 0)
+        self.assertGreater(self.index.build_time, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import asyncio
 import os
+import threading
 import unittest
 
+from py_trie.fuzzy_trie import FuzzyTrie
 from py_trie.trie import Trie
 
 
@@ -37,6 +40,356 @@ class TestTrie(unittest.TestCase):
         self.assertIn('apple', self.lower_case_trie.complete('aPp'))
         self.assertIn('apple', self.lower_case_trie.complete('app'))
         
+    def test_delete(self):
+        self.test_insert()
+        self.assertRaises(TypeError, self.trie.delete, '')
+        self.assertFalse(self.trie.delete('app'))
+        self.assertTrue(self.trie.delete('apple'))
+        self.assertFalse(self.trie.find('apple'))
+        self.assertEqual(len(self.trie), 0)
+
+    def test_compressed(self):
+        words = ['apple', 'app', 'apply', 'apps', 'banana', 'band']
+        trie = Trie.from_list(words, compressed=True)
+        self.assertTrue(trie.compressed)
+        self.assertListEqual(sorted(trie.root.children), ['a', 'b'])
+        self.assertEqual(trie.root.children['b'].label, 'ban')
+
+        for w in words:
+            self.assertTrue(trie.find(w))
+        self.assertFalse(trie.find('ap'))
+        self.assertFalse(trie.find('bananas'))
+        self.assertListEqual(sorted(trie.complete('ap')), sorted(words[:4]))
+        self.assertListEqual(sorted(trie.complete('bana')), ['banana'])
+        self.assertListEqual(trie.complete('c'), [])
+
+        # Deleting 'band' merges the edges 'ban' and 'ana' back into one
+        self.assertTrue(trie.delete('band'))
+        self.assertFalse(trie.delete('ban'))
+        self.assertEqual(trie.root.children['b'].label, 'banana')
+        self.assertTrue(trie.delete('app'))
+        self.assertListEqual(sorted(trie.complete('')), ['apple', 'apply', 'apps', 'banana'])
+        self.assertEqual(len(trie), 4)
+
+    def test_iter_complete(self):
+        words = ['apple', 'app', 'apply', 'apps', 'ape', 'banana']
+        trie = Trie.from_list(words)
+        self.assertRaises(TypeError, trie.iter_complete, None)
+        self.assertRaises(ValueError, trie.iter_complete, 'a', 0)
+        self.assertRaises(ValueError, trie.iter_complete, 'a', None, 'size')
+
+        self.assertListEqual(
+            list(trie.iter_complete('a', order='lex')),
+            ['ape', 'app', 'apple', 'apply', 'apps']
+        )
+        self.assertListEqual(
+            [len(w) for w in trie.iter_complete('ap')], [3, 3, 4, 5, 5]
+        )
+        self.assertListEqual(
+            sorted(trie.iter_complete('ap', order='none')), sorted(words[:5])
+        )
+        self.assertListEqual(trie.complete('app', limit=1), ['apps'])
+        self.assertListEqual(trie.complete('', limit=2, order='lex'), ['ape', 'app'])
+        self.assertListEqual(list(trie.iter_complete('c')), [])
+
+        compressed = Trie.from_list(words, compressed=True)
+        self.assertListEqual(
+            [len(w) for w in compressed.iter_complete('a')], [3, 3, 4, 5, 5]
+        )
+        self.assertListEqual(compressed.complete('appl', order='lex'), ['apple', 'apply'])
+
+    def test_top_k_complete(self):
+        weights = {'apple': 5, 'app': 9, 'apply': 2, 'apps': 7, 'ape': 1, 'banana': 8}
+        for compressed in (False, True):
+            trie = Trie(compressed=compressed)
+            for w, weight in weights.items():
+                trie.insert(w, weight)
+            self.assertRaises(ValueError, trie.insert, 'apple', -1)
+            self.assertRaises(ValueError, trie.insert, 'apple', '5')
+            self.assertRaises(TypeError, trie.top_k_complete, None, 1)
+            self.assertRaises(ValueError, trie.top_k_complete, 'a', 0)
+
+            self.assertListEqual(trie.top_k_complete('', 3), ['app', 'banana', 'apps'])
+            self.assertListEqual(trie.top_k_complete('app', 2), ['apps', 'apple'])
+            self.assertListEqual(trie.top_k_complete('c', 2), [])
+
+            # Re-inserting without a weight keeps the weight of the word
+            trie.insert('apply')
+            trie.insert('apply', 6)
+            trie.insert('apps', 3)
+            self.assertListEqual(trie.top_k_complete('app', 2), ['apply', 'apple'])
+            trie.delete('app')
+            trie.delete('banana')
+            self.assertEqual(trie.root.max_weight, 6)
+            self.assertListEqual(trie.top_k_complete('', 2), ['apply', 'apple'])
+
+    def test_counts(self):
+        words = ['apple', 'app', 'apply', 'apps', 'ape', 'banana']
+        for compressed in (False, True):
+            trie = Trie.from_list(words, compressed=compressed)
+            trie.insert('apple')
+            self.assertEqual(len(trie), 6)
+            self.assertRaises(TypeError, trie.count_prefix, None)
+            self.assertEqual(trie.count_prefix(''), 6)
+            self.assertEqual(trie.count_prefix('app'), 4)
+            self.assertEqual(trie.count_prefix('appl'), 2)
+            self.assertEqual(trie.count_prefix('c'), 0)
+
+            self.assertRaises(TypeError, trie.rank, None)
+            self.assertEqual(trie.rank('ape'), 0)
+            self.assertEqual(trie.rank('apps'), 4)
+            self.assertEqual(trie.rank('applz'), 4)
+            self.assertEqual(trie.rank('zebra'), 6)
+
+            self.assertRaises(ValueError, trie.select, '1')
+            self.assertRaises(IndexError, trie.select, 6)
+            self.assertEqual(trie.select(0), 'ape')
+            self.assertEqual(trie.select(3), 'apply')
+            self.assertEqual(trie.select(-1), 'banana')
+
+            self.assertRaises(ValueError, trie.complete, 'a', None, 'lex', -1)
+            self.assertListEqual(trie.complete('ap', 2, 'lex', 1), ['app', 'apple'])
+            self.assertListEqual(trie.complete('', None, 'lex', 4), ['apps', 'banana'])
+            self.assertListEqual(trie.complete('ap', 1, 'length', 4), ['apply'])
+
+            trie.delete('app')
+            self.assertEqual(trie.count_prefix('app'), 3)
+            self.assertEqual(trie.select(1), 'apple')
+
+    def test_acomplete(self):
+        words = ['apps', 'apple', 'apply', 'app', 'bat']
+        trie = Trie.from_list(words)
+        self.assertRaises(ValueError, asyncio.run, trie.acomplete('a', chunk_size=0))
+        self.assertRaises(TypeError, asyncio.run, trie.acomplete(None))
+        for order in ['length', 'lex', 'none']:
+            for offset in range(3):
+                self.assertEqual(
+                    asyncio.run(trie.acomplete('a', 2, order, offset, chunk_size=1)),
+                    (trie.complete('a', 2, order, offset), False)
+                )
+        self.assertEqual(asyncio.run(trie.acomplete('', max_nodes=4)), (['app'], True))
+        self.assertEqual(asyncio.run(trie.acomplete('', deadline=0, chunk_size=1)), ([], True))
+
+    def test_bulk_operations(self):
+        self.assertRaises(TypeError, self.trie.insert_many, ['app', ''])
+        self.assertRaises(TypeError, self.trie.find_many, [None])
+        for compressed in (False, True):
+            for copy_on_write in (False, True):
+                trie = Trie(lower_case=True, compressed=compressed, copy_on_write=copy_on_write)
+                trie.insert('apple', weight=5)
+                self.assertListEqual(
+                    trie.insert_many(['Apps', 'app', 'apple', 'APP', 'bat']),
+                    [True, True, False, False, True]
+                )
+                self.assertEqual((len(trie), trie.count_prefix('app')), (4, 3))
+                self.assertListEqual(
+                    trie.find_many(['APPLE', 'ap', 'bat', 'apple']), [True, False, True, True]
+                )
+                self.assertListEqual(
+                    trie.delete_many(['apple', 'ap', 'Apple', 'bat']), [True, False, False, True]
+                )
+                self.assertListEqual(trie.complete('', order='lex'), ['app', 'apps'])
+                self.assertEqual((len(trie), trie.count_prefix('')), (2, 2))
+                self.assertListEqual(trie.top_k_complete('', 1), ['app'])
+
+    def test_long_keys(self):
+        # Keys far deeper than the recursion limit
+        long = 'ab' * 50000
+        words = [long[:-1] + 'c', long, 'abc']
+        for compressed in (False, True):
+            trie = Trie(compressed=compressed)
+            for word in words:
+                trie.insert(word)
+            self.assertTrue(trie.find(long))
+            self.assertFalse(trie.find(long[:-1]))
+            for order in ('lex', 'none', 'length'):
+                self.assertListEqual(sorted(trie.complete('ab', order=order)), sorted(words))
+            self.assertListEqual(trie.complete(long[:-2], order='lex'), [long, words[0]])
+            self.assertEqual((trie.rank(words[0]), trie.select(0)), (1, long))
+            self.assertEqual(trie.freeze().complete('abab', order='lex'), [long, words[0]])
+
+            self.assertTrue(trie.delete(long))
+            self.assertEqual(trie.count_prefix(long[:-2]), 1)
+            self.assertTrue(trie.delete(words[0]))
+            self.assertListEqual(trie.complete('a'), ['abc'])
+
+        # Deleting a word removes the nodes only on its path
+        trie = Trie.from_list(['ab', 'ac', 'acde'])
+        trie.delete('acde')
+        self.assertListEqual(list(trie.root.children['a'].children['c'].children), [])
+
+    def test_alphabet(self):
+        self.assertRaises(TypeError, Trie, alphabet=1)
+        trie = Trie(lower_case=True, alphabet='cba')
+        self.assertEqual(trie.alphabet, 'abc')
+        self.assertRaises(ValueError, trie.insert, 'abd')
+        self.assertRaises(ValueError, trie.insert_many, ['ab', 'ad'])
+        self.assertRaises(ValueError, Trie.from_iterable, ['ab', 'ad'], True, alphabet='abc')
+        self.assertTrue(trie.insert('ABC'))
+        self.assertFalse(trie.find('abd'))
+        self.assertListEqual(trie.complete('d'), [])
+        self.assertIsNone(self.trie.alphabet)
+
+    def test_bytes_keys(self):
+        for compressed in (False, True):
+            trie = Trie(lower_case=True, compressed=compressed, alphabet=bytes(range(256)))
+            self.assertRaises(TypeError, trie.insert, 'apple')
+            self.assertRaises(TypeError, trie.insert, b'')
+            self.assertRaises(TypeError, trie.complete, 'app')
+            self.assertTrue(trie.insert(b'Apple'))
+            self.assertTrue(trie.insert(bytearray(b'app\xc9')))
+            self.assertTrue(trie.insert(memoryview(b'apps')))
+            self.assertListEqual(trie.insert_many([b'bat', b'APPS']), [True, False])
+
+            # Only the ASCII letters are converted to lower-case
+            self.assertTrue(trie.find(b'APPLE'))
+            self.assertTrue(trie.find(b'app\xc9'))
+            self.assertFalse(trie.find(b'app\xe9'))
+            self.assertListEqual(
+                trie.complete(b'app', order='lex'), [b'apple', b'apps', b'app\xc9']
+            )
+            self.assertListEqual(list(trie.iter_complete(memoryview(b'ba'))), [b'bat'])
+            self.assertEqual(asyncio.run(trie.acomplete(b'b')), ([b'bat'], False))
+            self.assertEqual((trie.rank(b'apps'), trie.select(-1)), (1, b'bat'))
+            self.assertEqual(trie.count_prefix(b'app'), 3)
+            self.assertTrue(trie.delete(bytearray(b'bat')))
+            self.assertEqual(
+                trie.freeze().complete(b'app', order='lex'), [b'apple', b'apps', b'app\xc9']
+            )
+
+        path = os.path.dirname(__file__) + '/example.txt'
+        trie = Trie.from_txt(path, alphabet=bytes(range(256)))
+        self.assertListEqual(sorted(trie.complete(b'app')), [b'apple', b'apples', b'apply', b'apps'])
+
+    def test_contains_search(self):
+        words = ['iphone', 'Phones', 'headphone', 'banana', 'phonetic']
+        for compressed in (False, True):
+            trie = Trie.from_list(words, lower_case=True, compressed=compressed)
+            self.assertRaises(TypeError, trie.contains_search, None)
+            self.assertRaises(ValueError, trie.contains_search, 'a', 0)
+            self.assertRaises(ValueError, trie.contains_search, 'a', None, -1)
+
+            for index in (False, True):
+                if index:
+                    self.assertEqual(trie.build_infix_index().num_words, 5)
+                self.assertListEqual(
+                    trie.contains_search('PHONE'),
+                    ['headphone', 'iphone', 'phones', 'phonetic']
+                )
+                self.assertListEqual(trie.contains_search('phone', 2), ['headphone', 'iphone'])
+                self.assertListEqual(trie.contains_search('nan'), ['banana'])
+                self.assertListEqual(
+                    trie.contains_search('fone', threshold=1),
+                    ['headphone', 'iphone', 'phones', 'phonetic']
+                )
+                self.assertListEqual(trie.contains_search('xyz', threshold=1), [])
+                self.assertListEqual(trie.contains_search(''), sorted(w.lower() for w in words))
+
+            # The index follows the insertions and deletions
+            trie.insert('smartphone')
+            trie.delete('iphone')
+            self.assertListEqual(trie.contains_search('tpho'), ['smartphone'])
+            self.assertListEqual(
+                trie.contains_search('phone', threshold=1),
+                ['headphone', 'phones', 'phonetic', 'smartphone']
+            )
+            self.assertEqual(len(trie.infix_index), len(trie))
+            trie.drop_infix_index()
+            self.assertIsNone(trie.infix_index)
+
+        frozen = Trie.from_list(words, lower_case=True).freeze()
+        self.assertListEqual(frozen.contains_search('nan'), ['banana'])
+        frozen.build_infix_index()
+        self.assertListEqual(frozen.contains_search('honet'), ['phonetic'])
+
+        trie = Trie.from_list([w.encode() for w in words], alphabet=bytes(range(256)))
+        trie.build_infix_index()
+        self.assertRaises(TypeError, trie.contains_search, 'phone')
+        self.assertListEqual(trie.contains_search(b'dph'), [b'headphone'])
+
+    def test_structure_stats(self):
+        words = ['app', 'apple', 'apply', 'bat']
+        stats = Trie.from_list(words).structure_stats()
+        self.assertEqual((stats['num_nodes'], stats['num_words']), (10, 4))
+        self.assertDictEqual(stats['fan_out'], {0: 3, 1: 5, 2: 2})
+        self.assertDictEqual(stats['depths'], {0: 1, 1: 2, 2: 2, 3: 2, 4: 1, 5: 2})
+        self.assertGreater(stats['estimated_bytes'], 0)
+
+        compressed = Trie.from_list(words, compressed=True).structure_stats()
+        self.assertEqual(compressed['num_nodes'], 6)
+        self.assertDictEqual(compressed['depths'], {0: 1, 3: 2, 4: 1, 5: 2})
+        self.assertLess(compressed['estimated_bytes'], stats['estimated_bytes'])
+
+        frozen = Trie.from_list(words).freeze().structure_stats()
+        self.assertDictEqual(frozen['fan_out'], stats['fan_out'])
+        self.assertLess(frozen['estimated_bytes'], stats['estimated_bytes'])
+
+    def test_merge(self):
+        left = ['app', 'apple', 'bat', 'banana']
+        right = ['apply', 'apple', 'band', 'cat', 'ba']
+        for compressed in (False, True):
+            for copy_on_write in (False, True):
+                trie = Trie(compressed=compressed, copy_on_write=copy_on_write)
+                trie.insert_many(left)
+                trie.insert('apple', 2)
+                other = Trie.from_list(right, compressed=compressed, copy_on_write=copy_on_write)
+                other.insert('apple', 1)
+                other.insert('cat', 5)
+
+                self.assertEqual(trie.merge(other), 4)
+                self.assertEqual(len(trie), 8)
+                self.assertListEqual(trie.complete('', order='lex'), sorted(set(left + right)))
+                self.assertListEqual(trie.top_k_complete('', 2), ['cat', 'apple'])
+                self.assertEqual(trie.count_prefix('ba'), 4)
+                self.assertEqual(trie.merge(other), 0)
+
+                # The attached subtrees are not shared by the modifications
+                trie.delete('cat')
+                trie.delete('band')
+                self.assertListEqual(other.complete('', order='lex'), sorted(right))
+                self.assertEqual(len(other), 5)
+
+        lower_case_trie = Trie(lower_case=True)
+        self.assertEqual(lower_case_trie.merge(Trie.from_list(['App', 'APP']).freeze()), 1)
+        self.assertTrue(lower_case_trie.find('app'))
+        self.assertRaises(TypeError, self.trie.merge, ['app'])
+        self.assertRaises(TypeError, self.trie.merge, Trie(alphabet=b'ab'))
+        self.assertRaises(ValueError, Trie(alphabet='ab').merge, Trie.from_list(['abc']))
+        self.assertRaises(TypeError, Trie.from_list(['app']).freeze().merge, self.trie)
+
+    def test_set_operations(self):
+        left = ['app', 'apple', 'apply', 'bat', 'banana']
+        right = ['apple', 'apps', 'ban', 'banana', 'cat']
+        for compressed in (False, True):
+            trie = FuzzyTrie.from_list(left, compressed=compressed)
+            trie.insert('apple', 3)
+            other = Trie.from_list(right, compressed=compressed)
+
+            union = trie.union(other)
+            self.assertIsInstance(union, FuzzyTrie)
+            self.assertListEqual(union.complete('', order='lex'), sorted(set(left + right)))
+            self.assertEqual(len(union), 8)
+
+            intersection = trie.intersection(other)
+            self.assertListEqual(intersection.complete('', order='lex'), ['apple', 'banana'])
+            self.assertEqual((len(intersection), intersection.count_prefix('ap')), (2, 1))
+            self.assertListEqual(intersection.top_k_complete('', 1), ['apple'])
+
+            difference = trie.difference(other)
+            self.assertListEqual(difference.complete('', order='lex'), ['app', 'apply', 'bat'])
+            self.assertEqual(len(difference), 3)
+            self.assertListEqual(difference.fuzzy_search('bet', 1), ['bat'])
+
+            # The operands are left unchanged
+            self.assertEqual((len(trie), len(other)), (5, 5))
+            difference.insert('apps')
+            self.assertFalse(trie.find('apps'))
+
+            if compressed:
+                self.assertEqual(intersection.structure_stats()['num_nodes'], 3)
+
+        self.assertEqual(len(self.trie.intersection(Trie.from_list(['app']))), 0)
+
     def test_from_list(self):
         words = ['apps', 'apple', 'apply']
         self.trie = self.trie.from_list(words)
@@ -45,6 +398,24 @@ class TestTrie(unittest.TestCase):
         invalid_list = words + [1]
         self.assertRaises(TypeError, self.trie.from_list, invalid_list)
 
+    def test_from_iterable(self):
+        words = ['apps', 'apple', 'apply', 'app', 'apple']
+        trie = Trie.from_iterable(w for w in words)
+        self.assertListEqual(sorted(trie.complete('')), sorted(set(words)))
+        self.assertRaises(TypeError, Trie.from_iterable, iter(['app', None]))
+
+        trie = Trie.from_iterable(sorted(words), sorted_input=True)
+        self.assertEqual(len(trie), 4)
+        self.assertListEqual(sorted(trie.complete('')), sorted(set(words)))
+        self.assertRaises(ValueError, Trie.from_iterable, words, True)
+        self.assertRaises(TypeError, Trie.from_iterable, ['app', ''], True)
+
+        trie = Trie.from_iterable(['APP', 'apple'], sorted_input=True, lower_case=True)
+        self.assertTrue(trie.find('App'))
+        self.assertRaises(
+            ValueError, Trie.from_iterable, ['b', 'A'], sorted_input=True, lower_case=True
+        )
+
     def test_from_txt(self):
         words = ['apps', 'apple', 'apples', 'apply']
         path = os.path.dirname(__file__) + '/example.txt'
@@ -53,6 +424,64 @@ class TestTrie(unittest.TestCase):
         self.trie = self.trie.from_txt(path)
         self.assertEqual(len(self.trie), 4)
         self.assertListEqual(sorted(self.trie.complete('app')), sorted(words))
+        self.assertRaises(ValueError, self.trie.from_txt, path, True)
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    """Test the lock-free readers of a copy-on-write trie."""
+
+    def test_snapshot(self):
+        self.assertRaises(TypeError, Trie().snapshot)
+        for compressed in (False, True):
+            trie = FuzzyTrie.from_list(
+                ['apple', 'app', 'apply'], compressed=compressed, copy_on_write=True
+            )
+            self.assertRaises(TypeError, trie.enable_cache)
+            self.assertRaises(TypeError, trie.build_index)
+            self.assertRaises(TypeError, trie.build_infix_index)
+            snapshot = trie.snapshot()
+            trie.insert('apps')
+            trie.delete('apple')
+            self.assertListEqual(snapshot.complete('app', order='lex'), ['apple', 'apply'])
+            self.assertEqual((len(snapshot), snapshot.count_prefix('')), (3, 3))
+            self.assertListEqual(trie.complete('app', order='lex'), ['apply', 'apps'])
+            snapshot.insert('applet')
+            self.assertFalse(trie.find('applet'))
+            self.assertListEqual(snapshot.fuzzy_search('apple', 1), ['apple', 'applet', 'apply'])
+
+    def test_concurrent_readers(self):
+        words = [a + b + c for a in 'abcd' for b in 'abcd' for c in 'abcd']
+        trie = FuzzyTrie.from_list(words[::2], copy_on_write=True)
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            try:
+                while not stop.is_set():
+                    trie.complete('a')
+                    trie.fuzzy_search('abc', 1)
+                    # The words of a snapshot are consistent with its size
+                    snapshot = trie.snapshot()
+                    res = snapshot.complete('', order='lex')
+                    self.assertEqual(len(res), len(snapshot))
+                    self.assertEqual(snapshot.select(-1), res[-1])
+            except Exception as exc:
+                errors.append(exc)
+
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for _ in range(20):
+            for word in words[1::2]:
+                trie.insert(word)
+            for word in words[1::2]:
+                trie.delete(word)
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertListEqual(errors, [])
+        self.assertListEqual(trie.complete('', order='lex'), words[::2])
 
 
 if __name__ == '__main__':